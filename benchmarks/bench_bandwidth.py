@@ -0,0 +1,110 @@
+"""Bandwidth limits under contention: who gets how much of the uplink
+
+Runs a few scenarios against one engine. In each, clients with their own
+IPs (sent as X-Forwarded-For) download for a fixed time, one of them over
+several parallel connections, as a download manager would. Reports the
+rate each client and each connection got and Jain's fairness index
+(1.0 = perfectly even).
+
+    python benchmarks/bench_bandwidth.py [--rate-mb 16] [--seconds 5] [--engine pool]
+"""
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as burnbin
+
+
+def timed_download(port, path, client_ip, deadline, received, index):
+    with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+        sock.sendall(
+            f"GET {path} HTTP/1.1\r\nHost: x\r\nX-Forwarded-For: {client_ip}\r\n"
+            f"Connection: close\r\n\r\n".encode()
+        )
+        buf = bytearray(256 * 1024)
+        sock.settimeout(0.2)
+        while time.monotonic() < deadline:
+            try:
+                n = sock.recv_into(buf)
+            except socket.timeout:
+                continue
+            if not n:
+                break
+            received[index] += n
+
+
+def jain(values):
+    total = sum(values)
+    squares = sum(value * value for value in values)
+    return total * total / (len(values) * squares) if squares else 0.0
+
+
+def run_scenario(title, server, engine, connections, limits, seconds):
+    """connections: [(client_ip, file_id)], one entry per parallel download"""
+    server.bandwidth.configure(**limits)
+    received = [0] * len(connections)
+    deadline = time.monotonic() + seconds
+    workers = [
+        threading.Thread(target=timed_download, args=(engine.port, f'/download/{file_id}', ip, deadline, received, i))
+        for i, (ip, file_id) in enumerate(connections)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    mb = 1024 * 1024
+    per_client = {}
+    for (ip, _), count in zip(connections, received):
+        per_client[ip] = per_client.get(ip, 0) + count
+    described = ", ".join(f"{key} {value / mb:g} MB/s" for key, value in limits.items() if value) or "no limits"
+    print(f"\n{title} ({described})")
+    for ip, count in per_client.items():
+        streams = [received[i] / mb / seconds for i, (other, _) in enumerate(connections) if other == ip]
+        print(f"  {ip:>10}: {count / mb / seconds:7.2f} MB/s over {len(streams)} connection(s) "
+              f"({', '.join(f'{rate:.2f}' for rate in streams)})")
+    print(f"  total {sum(received) / mb / seconds:.2f} MB/s, fairness per client {jain(list(per_client.values())):.3f}, "
+          f"per connection {jain(received):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rate-mb', type=float, default=16, help="global cap in MB/s")
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--engine', choices=sorted(burnbin.SERVER_ENGINES), default='pool')
+    args = parser.parse_args()
+    rate = int(args.rate_mb * 1024 * 1024)
+
+    with tempfile.TemporaryDirectory() as base:
+        # Sparse files: reading them costs no disk, only the limits slow us down
+        for name in ('a.bin', 'b.bin'):
+            with open(os.path.join(base, name), 'wb') as f:
+                f.truncate(max(rate, 64 * 1024 * 1024) * int(args.seconds + 2))
+        server = burnbin.BurnBinServer(base_path=base)
+        file_ids = [server.share_path(os.path.join(base, name)) for name in ('a.bin', 'b.bin')]
+        engine = burnbin.SERVER_ENGINES[args.engine](server.flask_app, '127.0.0.1', 0, threads=32)
+        threading.Thread(target=engine.serve_forever, daemon=True).start()
+
+        # One greedy client with 4 connections, three polite ones with 1 each
+        crowd = [('10.0.0.1', file_ids[0])] * 4 + [(f'10.0.0.{i}', file_ids[0]) for i in (2, 3, 4)]
+        run_scenario("Global cap, fair share per connection", server, engine, crowd,
+                     {'rate': rate, 'client_rate': 0, 'share_rate': 0}, args.seconds)
+        run_scenario("Global cap plus per-client cap, the greedy client is held to its share", server, engine, crowd,
+                     {'rate': rate, 'client_rate': rate // 4, 'share_rate': 0}, args.seconds)
+        # Two shares, one popular: the per-share cap keeps it from taking the whole uplink
+        popular = [(f'10.0.1.{i}', file_ids[0]) for i in range(1, 7)] + [('10.0.2.1', file_ids[1])]
+        run_scenario("Global cap plus per-share cap, one share with 6 downloaders", server, engine, popular,
+                     {'rate': rate, 'client_rate': 0, 'share_rate': rate // 2}, args.seconds)
+
+        engine.shutdown()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Concurrent downloads against each serving engine
+
+Starts every engine in SERVER_ENGINES on a local port, fires N parallel
+downloads of the same file and reports aggregate throughput, per-download
+completion times (p50/p95/p99) and failures. Peak RSS is sampled while
+the downloads run. The clients share the server's process, so it counts
+their receive buffers too.
+
+    python benchmarks/bench_concurrency.py [--clients 128] [--size-mb 32]
+"""
+import argparse
+import math
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as burnbin
+
+
+def download(port, path, timeout):
+    with socket.create_connection(('127.0.0.1', port), timeout=timeout) as sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode())
+        buf = bytearray(256 * 1024)
+        received = 0
+        while True:
+            n = sock.recv_into(buf)
+            if not n:
+                return received
+            received += n
+
+
+def run_engine(name, server, file_id, file_size, clients, timeout, engine_options):
+    engine = burnbin.SERVER_ENGINES[name](server.flask_app, '127.0.0.1', 0, **engine_options)
+    threading.Thread(target=engine.serve_forever, daemon=True).start()
+
+    durations, failures = [], []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(clients + 1)
+
+    def client():
+        start_gate.wait()
+        t0 = time.perf_counter()
+        try:
+            received = download(engine.port, f'/download/{file_id}', timeout)
+            ok = received >= file_size
+        except OSError as e:
+            ok, received = False, e
+        with lock:
+            if ok:
+                durations.append(time.perf_counter() - t0)
+            else:
+                failures.append(received)
+
+    peak_rss = [burnbin.process_rss() or 0]
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(0.05):
+            peak_rss[0] = max(peak_rss[0], burnbin.process_rss() or 0)
+
+    workers = [threading.Thread(target=client) for _ in range(clients)]
+    for worker in workers:
+        worker.start()
+    threading.Thread(target=sample_rss, daemon=True).start()
+    start_gate.wait()
+    t0 = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - t0
+    done.set()
+    engine.shutdown()
+
+    total_mb = len(durations) * file_size / (1024 ** 2)
+    line = f"{name:>9}: {total_mb / wall:8.1f} MB/s aggregate, {len(failures)} failed"
+    if durations:
+        durations.sort()
+        p95, p99 = (durations[max(0, math.ceil(q * len(durations)) - 1)] for q in (0.95, 0.99))
+        line += f", completion p50 {statistics.median(durations):.2f}s p95 {p95:.2f}s p99 {p99:.2f}s"
+    if peak_rss[0]:
+        line += f", peak RSS {peak_rss[0] / (1024 ** 2):.0f} MB"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=128)
+    parser.add_argument('--size-mb', type=int, default=32)
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--threads', type=int, default=32, help="pool engine worker threads")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base:
+        file_path = os.path.join(base, 'payload.bin')
+        with open(file_path, 'wb') as f:
+            f.write(os.urandom(args.size_mb * 1024 * 1024))
+
+        server = burnbin.BurnBinServer(base_path=base)
+        file_id = server.share_path(file_path)
+        file_size = os.path.getsize(file_path)
+
+        print(f"{args.clients} concurrent downloads of {args.size_mb} MB")
+        for name in burnbin.SERVER_ENGINES:
+            run_engine(name, server, file_id, file_size, args.clients, args.timeout,
+                       {'threads': args.threads, 'backlog': max(128, args.clients)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Download throughput and server CPU per GB: sendfile vs chunked reads
+
+Shares a temporary file, serves it on a local port and downloads it over
+a plain socket. Server CPU is the process CPU time minus the client
+thread's own CPU time.
+
+    python benchmarks/bench_download.py [--size-mb 512] [--runs 3]
+"""
+import argparse
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+
+import main as burnbin
+
+
+def download(port, path, bufsize=1024 * 1024):
+    """GET a URL and discard the body, returns the number of body bytes"""
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode())
+        buf = bytearray(bufsize)
+        view = memoryview(buf)
+        received = 0
+        while True:
+            n = sock.recv_into(view)
+            if not n:
+                break
+            received += n
+        return received
+
+
+def measure(port, path, file_size):
+    wall0, cpu0, thread0 = time.perf_counter(), time.process_time(), time.thread_time()
+    received = download(port, path)
+    wall = time.perf_counter() - wall0
+    server_cpu = (time.process_time() - cpu0) - (time.thread_time() - thread0)
+    assert received >= file_size, f"short read: {received} < {file_size}"
+    gb = file_size / (1024 ** 3)
+    return file_size / wall / (1024 ** 2), server_cpu / gb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=512)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base:
+        file_path = os.path.join(base, 'payload.bin')
+        with open(file_path, 'wb') as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(block)
+        file_size = os.path.getsize(file_path)
+
+        server = burnbin.BurnBinServer(base_path=base)
+        file_id = server.share_path(file_path)
+        httpd = make_server('127.0.0.1', 0, server.flask_app, threaded=True)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        port = httpd.server_port
+
+        # Warm the page cache so both modes read from memory
+        download(port, f'/download/{file_id}')
+
+        print(f"{args.size_mb} MB file, {args.runs} run(s) per mode")
+        for mode, use_sendfile in (('generator', False), ('sendfile', True)):
+            server.use_sendfile = use_sendfile
+            results = [measure(port, f'/download/{file_id}', file_size) for _ in range(args.runs)]
+            throughput = statistics.median(r[0] for r in results)
+            cpu_per_gb = statistics.median(r[1] for r in results)
+            print(f"{mode:>10}: {throughput:8.1f} MB/s, {cpu_per_gb:6.3f} CPU s/GB")
+
+        httpd.shutdown()
+
+
+if __name__ == '__main__':
+    main()
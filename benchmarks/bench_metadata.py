@@ -0,0 +1,95 @@
+"""Metadata store scaling: startup, lookups and counter updates at 1k-100k shares
+
+For each registry size the SQLite store is filled with shares of one real
+file, then we time a cold BurnBinServer startup, name lookups through the
+index, and download counter updates. The cost of the old approach, rewriting
+shared_files.json on every download, is shown next to it.
+
+    python benchmarks/bench_metadata.py [--sizes 1000,10000,100000]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as burnbin
+
+
+def fill(store, file_path, count):
+    file_size = os.path.getsize(file_path)
+    rows = [
+        (str(uuid.uuid4()), file_path, f'file-{i:07d}.bin', file_size, f'2024-01-01 00:00:{i % 60:02d}', 0)
+        for i in range(count)
+    ]
+    store._write([(
+        "INSERT INTO shares (id, path, name, size, upload_time, downloads) VALUES (?, ?, ?, ?, ?, ?)",
+        rows
+    )])
+    return [row[0] for row in rows]
+
+
+def run_size(count, updates):
+    with tempfile.TemporaryDirectory() as base:
+        file_path = os.path.join(base, 'payload.bin')
+        with open(file_path, 'wb') as f:
+            f.write(b'x' * 1024)
+
+        store = burnbin.MetadataStore(os.path.join(base, 'burnbin.db'))
+        t0 = time.perf_counter()
+        file_ids = fill(store, file_path, count)
+        insert = time.perf_counter() - t0
+        store.close()
+
+        t0 = time.perf_counter()
+        server = burnbin.BurnBinServer(base_path=base)
+        startup = time.perf_counter() - t0
+        assert len(server.shared_files) == count
+
+        names = [f'file-{i:07d}.bin' for i in range(0, count, max(1, count // 1000))]
+        t0 = time.perf_counter()
+        for name in names:
+            assert server.store.find_shares(name)
+        lookup = (time.perf_counter() - t0) / len(names)
+
+        t0 = time.perf_counter()
+        for i in range(updates):
+            server.store.record_download(file_ids[i % count])
+        server.save_shared_files()
+        counter = (time.perf_counter() - t0) / updates
+        server.stop()
+
+        # What every download used to cost: rewrite the whole JSON registry
+        json_path = os.path.join(base, 'legacy.json')
+        samples = []
+        for _ in range(3):
+            t0 = time.perf_counter()
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(server.shared_files, f, indent=2)
+            samples.append(time.perf_counter() - t0)
+        legacy = statistics.median(samples)
+
+    print(
+        f"{count:>7} shares: insert {count / insert:9.0f}/s, startup {startup * 1000:7.1f} ms, "
+        f"name lookup {lookup * 1e6:6.1f} us, download count {counter * 1e6:5.2f} us "
+        f"(JSON rewrite {legacy * 1000:7.1f} ms)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--updates', type=int, default=100000)
+    args = parser.parse_args()
+
+    for count in args.sizes.split(','):
+        run_size(int(count), args.updates)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""Load test of the HTTP routes: throughput and latency percentiles, with baselines
+
+Runs `main.py --headless` in a child process (tunnel stubbed out) on a
+local port, against a data directory prepared up front: downloads of
+several sizes plus 10,000 more shares for the listing. Each scenario is
+loaded by concurrent keep-alive clients for a fixed time after a short
+warm-up, and reports requests/s, MB/s and p50/p95/p99 latency (request
+sent to last body byte). File contents come from a fixed seed, so runs
+are repeatable.
+
+--save writes the results as a JSON baseline, --compare checks a run
+against one and exits with status 1 when a scenario's throughput drops,
+or its p95 latency rises, by more than --threshold. Options this script
+doesn't know are passed on to main.py, e.g. --threads 64.
+
+    python benchmarks/bench_routes.py [--engine pool] [--clients 16] [--seconds 5]
+    python benchmarks/bench_routes.py --save baseline.json
+    python benchmarks/bench_routes.py --compare baseline.json [--threshold 0.15]
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import main as burnbin
+
+CHILD = r"""
+import sys
+sys.path.insert(0, {repo!r})
+import main
+main.BurnBinServer.start_cloudflare_tunnel = lambda self: None
+main.main({argv!r})
+"""
+
+SEED = 20240601
+DOWNLOAD_SIZES = {'4k': 4 * 1024, '1m': 1024 * 1024, '32m': 32 * 1024 * 1024}
+UPLOAD_SIZE = 64 * 1024
+LISTED_FILES = 10000
+
+
+def prepare(base):
+    """Share the payloads and the listing files, returns {download size name: file_id}"""
+    rng = random.Random(SEED)
+    payloads = os.path.join(base, 'payloads')
+    os.makedirs(os.path.join(payloads, 'listing'))
+    server = burnbin.BurnBinServer(base_path=base)
+    file_ids = {}
+    for name, size in DOWNLOAD_SIZES.items():
+        path = os.path.join(payloads, f'payload-{name}.bin')
+        with open(path, 'wb') as f:
+            f.write(rng.randbytes(size))
+        file_ids[name] = server.share_path(path)
+    for i in range(LISTED_FILES):
+        path = os.path.join(payloads, 'listing', f'file-{i:05d}.txt')
+        with open(path, 'wb') as f:
+            f.write(b'x' * (i % 1000))
+        server.share_path(path)
+    server.stop()
+    return file_ids
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(base, port, engine, extra):
+    argv = ['--headless', '--port', str(port), '--engine', engine] + extra
+    child = subprocess.Popen(
+        [sys.executable, '-c', CHILD.format(repo=REPO_DIR, argv=argv)],
+        cwd=base, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if child.poll() is not None:
+            sys.exit(f"server exited with status {child.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return child
+        except OSError:
+            time.sleep(0.1)
+    child.kill()
+    sys.exit("server did not start within 30s")
+
+
+def multipart_upload(index, payload):
+    boundary = 'benchroutes'
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="upload-{index}.bin"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode() + index.to_bytes(8, 'big') + payload + f'\r\n--{boundary}--\r\n'.encode()
+    return body, {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+
+
+def scenarios(port, file_ids):
+    """[(name, request factory)], a factory returns (method, path, body, headers)"""
+    payload = random.Random(SEED + 1).randbytes(UPLOAD_SIZE - 8)
+    counter = iter(range(10 ** 12))
+
+    # A finished download leaves a session behind to poll
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.request('GET', f"/download/{file_ids['4k']}")
+    response = conn.getresponse()
+    response.read()
+    session_id = response.getheader('X-Session-Id')
+    conn.close()
+
+    def upload():
+        body, headers = multipart_upload(next(counter), payload)
+        return 'POST', '/api/upload', body, headers
+
+    listed = [(f'download-{name}', lambda path=f'/download/{file_id}': ('GET', path, None, {}))
+              for name, file_id in file_ids.items()]
+    return listed + [
+        ('upload-64k', upload),
+        ('files-10k', lambda: ('GET', '/api/files', None, {})),
+        ('download-progress', lambda: ('GET', f'/api/download-progress/{session_id}', None, {})),
+        ('page', lambda: ('GET', '/', None, {}))
+    ]
+
+
+def client(port, make_request, stop_at, record_from, latencies, counts):
+    """One keep-alive connection issuing requests back to back until stop_at"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    buf = bytearray(256 * 1024)
+    while True:
+        t0 = time.perf_counter()
+        if t0 >= stop_at:
+            break
+        method, path, body, headers = make_request()
+        received = len(body) if body else 0  # MB/s counts both directions
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            while True:
+                n = response.readinto(buf)
+                if not n:
+                    break
+                received += n
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            ok = False
+        if t0 < record_from:
+            continue  # Warm-up
+        if ok:
+            latencies.append(time.perf_counter() - t0)
+            counts['bytes'] += received
+        else:
+            counts['errors'] += 1
+    conn.close()
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_scenario(port, make_request, clients, seconds, warmup):
+    latencies = []
+    counts = {'bytes': 0, 'errors': 0}
+    record_from = time.perf_counter() + warmup
+    stop_at = record_from + seconds
+    # Each client appends to its own list, merged at the end
+    per_client = [([], {'bytes': 0, 'errors': 0}) for _ in range(clients)]
+    workers = [
+        threading.Thread(target=client, args=(port, make_request, stop_at, record_from, samples, tally))
+        for samples, tally in per_client
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    for samples, tally in per_client:
+        latencies.extend(samples)
+        counts['bytes'] += tally['bytes']
+        counts['errors'] += tally['errors']
+
+    latencies.sort()
+    ms = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        'requests': len(latencies),
+        'errors': counts['errors'],
+        'rps': round(len(latencies) / seconds, 1),
+        'mbps': round(counts['bytes'] / seconds / (1024 * 1024), 2),
+        'p50_ms': ms(percentile(latencies, 0.50)),
+        'p95_ms': ms(percentile(latencies, 0.95)),
+        'p99_ms': ms(percentile(latencies, 0.99))
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print changes against a baseline, returns the regressed scenario names"""
+    for key in ('engine', 'clients', 'seconds', 'server_args'):
+        if baseline['meta'].get(key) != results['meta'].get(key):
+            print(f"note: baseline ran with {key}={baseline['meta'].get(key)!r}, "
+                  f"this run with {results['meta'].get(key)!r}")
+    regressed = []
+    print(f"\nAgainst baseline (commit {baseline['meta'].get('commit')}, threshold {threshold:.0%}):")
+    for name, now in results['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            print(f"  {name:<18} new, no baseline")
+            continue
+        problems = []
+        rps_change = now['rps'] / before['rps'] - 1 if before['rps'] else 0.0
+        if rps_change < -threshold:
+            problems.append(f"throughput {rps_change:+.0%}")
+        p95_change = None
+        if before['p95_ms'] and now['p95_ms'] is not None:
+            p95_change = now['p95_ms'] / before['p95_ms'] - 1
+            if p95_change > threshold:
+                problems.append(f"p95 {p95_change:+.0%}")
+        if now['errors'] > before['errors']:
+            problems.append(f"errors {before['errors']} -> {now['errors']}")
+        p95_text = f"{p95_change:+.0%}" if p95_change is not None else "n/a"
+        line = f"  {name:<18} req/s {rps_change:+.0%}, p95 {p95_text}"
+        if problems:
+            regressed.append(name)
+            line += "  REGRESSION: " + ", ".join(problems)
+        print(line)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--engine', choices=sorted(burnbin.SERVER_ENGINES), default='pool')
+    parser.add_argument('--clients', type=int, default=16, help="concurrent connections per scenario")
+    parser.add_argument('--seconds', type=float, default=5, help="measured time per scenario")
+    parser.add_argument('--warmup', type=float, default=1, help="unmeasured time before each scenario")
+    parser.add_argument('--only', action='append', metavar='SCENARIO', help="run only these scenarios (repeatable)")
+    parser.add_argument('--save', metavar='FILE', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', help="flag regressions against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="relative throughput drop or p95 rise that counts as a regression (default: 0.15)")
+    args, server_args = parser.parse_known_args()
+
+    with tempfile.TemporaryDirectory() as base:
+        print(f"Preparing {len(DOWNLOAD_SIZES)} downloads and {LISTED_FILES} listed files...")
+        file_ids = prepare(base)
+        port = free_port()
+        child = start_server(base, port, args.engine, server_args)
+        try:
+            results = {
+                'meta': {
+                    'engine': args.engine,
+                    'clients': args.clients,
+                    'seconds': args.seconds,
+                    'server_args': server_args,
+                    'commit': git_commit(),
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'cpus': os.cpu_count(),
+                    'date': time.strftime('%Y-%m-%d %H:%M:%S')
+                },
+                'scenarios': {}
+            }
+            print(f"{args.engine} engine, {args.clients} clients, {args.seconds:g}s per scenario\n")
+            print(f"  {'scenario':<18} {'req/s':>9} {'MB/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+            for name, make_request in scenarios(port, file_ids):
+                if args.only and name not in args.only:
+                    continue
+                result = run_scenario(port, make_request, args.clients, args.seconds, args.warmup)
+                results['scenarios'][name] = result
+                cells = [f"{result[key]:>9}" if result[key] is not None else f"{'-':>9}"
+                         for key in ('rps', 'mbps', 'p50_ms', 'p95_ms', 'p99_ms')]
+                print(f"  {name:<18} {' '.join(cells)} {result['errors']:>7}", flush=True)
+        finally:
+            child.terminate()
+            child.wait()
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} scenario(s) regressed: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
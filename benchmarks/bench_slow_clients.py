@@ -0,0 +1,101 @@
+"""Slow and idle clients: how many can each engine hold while staying responsive
+
+Opens N connections per engine. Half of them start a download and then
+stop reading, the other half sit idle on keep-alive. A fresh client then
+polls /api/files, and we report its latency and the server's thread count.
+
+    python benchmarks/bench_slow_clients.py [--clients 1000] [--engines asyncio,pool]
+"""
+import argparse
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as burnbin
+
+
+def open_client(port, request):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # A tiny receive window keeps kernel buffers small for stalled readers
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(('127.0.0.1', port))
+    sock.sendall(request)
+    return sock
+
+
+def timed_get(port, path, timeout):
+    t0 = time.perf_counter()
+    with socket.create_connection(('127.0.0.1', port), timeout=timeout) as sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n".encode())
+        while sock.recv(65536):
+            pass
+    return time.perf_counter() - t0
+
+
+def run_engine(name, server, file_id, clients, probes, timeout):
+    engine = burnbin.SERVER_ENGINES[name](
+        server.flask_app, '127.0.0.1', 0, backlog=2048, max_connections=max(512, clients * 2)
+    )
+    server_thread = threading.Thread(target=engine.serve_forever, daemon=True)
+    server_thread.start()
+    baseline_threads = threading.active_count()
+
+    sockets = []
+    try:
+        for i in range(clients):
+            if i % 2:
+                request = f"GET /download/{file_id} HTTP/1.1\r\nHost: x\r\n\r\n"
+            else:
+                request = "GET /api/files HTTP/1.1\r\nHost: x\r\n\r\n"
+            sockets.append(open_client(engine.port, request.encode()))
+        time.sleep(1.0)  # Let the server pick all of them up
+
+        latencies = []
+        for _ in range(probes):
+            try:
+                latencies.append(timed_get(engine.port, '/api/files', timeout))
+            except OSError:
+                latencies.append(float('inf'))
+        threads = threading.active_count() - baseline_threads + 1
+    finally:
+        for sock in sockets:
+            sock.close()
+        engine.shutdown()
+        server_thread.join()
+        time.sleep(0.5)  # Let workers that were mid-request notice the closed sockets
+
+    ok = [l for l in latencies if l != float('inf')]
+    line = f"{name:>9}: {clients} held, {threads} server threads"
+    if ok:
+        line += f", probe latency p50 {statistics.median(ok) * 1000:.1f} ms"
+    line += f", {len(latencies) - len(ok)}/{probes} probes timed out"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--probes', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=5)
+    parser.add_argument('--engines', default='asyncio,pool')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base:
+        file_path = os.path.join(base, 'payload.bin')
+        with open(file_path, 'wb') as f:
+            f.write(os.urandom(16 * 1024 * 1024))
+        server = burnbin.BurnBinServer(base_path=base)
+        file_id = server.share_path(file_path)
+
+        for name in args.engines.split(','):
+            run_engine(name, server, file_id, args.clients, args.probes, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
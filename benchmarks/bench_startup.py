@@ -0,0 +1,78 @@
+"""Startup time and memory: headless BurnBinServer vs the Tk FileShareApp
+
+Each mode runs in a fresh interpreter so import costs are counted. The
+local server/tunnel start is stubbed out, we only measure the time and
+memory needed to get the app constructed and ready.
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import sys, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, {repo!r})
+import main
+main.BurnBinServer.start_local_server = lambda self: None
+if {mode!r} == 'gui':
+    root = main.tk.Tk()
+    root.withdraw()
+    app = main.FileShareApp(root, main.BurnBinServer(base_path={base!r}))
+    root.update_idletasks()
+else:
+    server = main.BurnBinServer(base_path={base!r})
+elapsed = time.perf_counter() - t0
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss_kb //= 1024
+except ImportError:
+    rss_kb = None
+print(json.dumps({{'seconds': elapsed, 'max_rss_kb': rss_kb}}))
+"""
+
+
+def run_once(mode, base):
+    code = CHILD.format(repo=REPO_DIR, mode=mode, base=base)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1] if result.stderr else 'failed'
+    return json.loads(result.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base:
+        for mode in ('headless', 'gui'):
+            samples = []
+            for _ in range(args.runs):
+                sample, error = run_once(mode, base)
+                if error:
+                    print(f"{mode:>8}: skipped ({error})")
+                    break
+                samples.append(sample)
+            if not samples:
+                continue
+
+            seconds = [s['seconds'] for s in samples]
+            rss = [s['max_rss_kb'] for s in samples if s['max_rss_kb'] is not None]
+            line = f"{mode:>8}: startup median {statistics.median(seconds) * 1000:.1f} ms"
+            if rss:
+                line += f", peak RSS {statistics.median(rss) / 1024:.1f} MB"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Disk bytes written per uploaded byte: streaming multipart vs spooled form parsing
+
+Uploads a file to /api/upload, which parses the multipart body as it
+arrives and writes the file part straight into uploads/, and to a copy of
+the old handler that lets Werkzeug spool the form to a temp file before
+file.save(). The client runs in a subprocess, so the server's write
+counter (wchar in /proc/self/io, Linux only) minus the client's own
+counter leaves the server's writes.
+
+    python benchmarks/bench_upload.py [--size-mb 256] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import main as burnbin
+
+CLIENT = r'''
+import os, socket, sys
+port, path, file_path = int(sys.argv[1]), sys.argv[2], sys.argv[3]
+boundary = 'benchboundary'
+head = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="payload.bin"\r\n'
+        'Content-Type: application/octet-stream\r\n\r\n').encode()
+tail = f'\r\n--{boundary}--\r\n'.encode()
+length = len(head) + os.path.getsize(file_path) + len(tail)
+with socket.create_connection(('127.0.0.1', port)) as sock:
+    sock.sendall((f'POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n'
+                  f'Content-Type: multipart/form-data; boundary={boundary}\r\n'
+                  f'Content-Length: {length}\r\n\r\n').encode() + head)
+    with open(file_path, 'rb') as f:
+        sock.sendfile(f)
+    sock.sendall(tail)
+    response = b''
+    while chunk := sock.recv(65536):
+        response += chunk
+# Reaped children count towards the parent's counters, report ours to subtract them
+with open('/proc/self/io') as f:
+    print(next(line.split()[1] for line in f if line.startswith('wchar:')))
+sys.exit(0 if response.startswith(b'HTTP/1.1 200') else 1)
+'''
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def written_bytes():
+    with open('/proc/self/io') as f:
+        for line in f:
+            if line.startswith('wchar:'):
+                return int(line.split()[1])
+    raise RuntimeError("no wchar in /proc/self/io")
+
+
+def spooled_app(uploads_dir):
+    """The upload handler as it was: Werkzeug parses (and spools) the form, then file.save()"""
+    app = Flask(__name__)
+
+    @app.route('/api/upload', methods=['POST'])
+    def upload_file():
+        file = request.files['file']
+        file_path = os.path.join(uploads_dir, f"{uuid.uuid4()}_{file.filename}")
+        file.save(file_path)
+        os.path.getsize(file_path)
+        return jsonify({'status': 'success'})
+
+    return app
+
+
+def measure(port, file_path, file_size):
+    wall0, written0 = time.perf_counter(), written_bytes()
+    client = subprocess.run(
+        [sys.executable, '-c', CLIENT, str(port), '/api/upload', file_path],
+        check=True, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - wall0
+    written = written_bytes() - written0 - int(client.stdout)
+    return written / file_size, file_size / wall / (1024 ** 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base:
+        file_path = os.path.join(base, 'payload.bin')
+        with open(file_path, 'wb') as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(block)
+        file_size = os.path.getsize(file_path)
+
+        server = burnbin.BurnBinServer(base_path=base)
+        engines = {
+            'spooled': make_server('127.0.0.1', 0, spooled_app(server.uploads_dir), threaded=True,
+                                   request_handler=QuietHandler),
+            'streaming': burnbin.PooledWSGIServer(server.flask_app, '127.0.0.1', 0)
+        }
+
+        print(f"{args.size_mb} MB upload, {args.runs} run(s) per mode")
+        for mode, engine in engines.items():
+            threading.Thread(target=engine.serve_forever, daemon=True).start()
+            port = getattr(engine, 'port', None) or engine.server_port
+            results = [measure(port, file_path, file_size) for _ in range(args.runs)]
+            ratio = statistics.median(r[0] for r in results)
+            throughput = statistics.median(r[1] for r in results)
+            print(f"{mode:>10}: {ratio:5.2f} bytes written per uploaded byte, {throughput:8.1f} MB/s")
+            engine.shutdown()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+try:
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
+except ImportError:
+    # Headless builds of Python ship without Tk; the server still works
+    tk = None
 import threading
 import subprocess
 import os
@@ -7,618 +11,3475 @@ import sys
 import time
 import uuid
 import json
+import argparse
+import asyncio
+import shutil
+import signal
+import socket
+import selectors
+import sqlite3
+import queue
+import traceback
+import gzip
+import zlib
+import lzma
+import mimetypes
+import hashlib
+import bisect
+import cProfile
+import pstats
+import struct
+import stat
+import errno
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_to_bytes
 from datetime import datetime
 from flask import Flask, send_file, request, jsonify, Response
 from werkzeug.utils import secure_filename
+from werkzeug.http import http_date, parse_date, parse_options_header
+from werkzeug.serving import make_server, DechunkedInput
+try:
+    import brotli
+except ImportError:
+    # Optional; gzip alone covers every browser
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    # Optional; compressed downloads fall back to gzip
+    zstandard = None
 
-class FileShareApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("BurnBin - Share Files Online")
-        self.root.geometry("1000x700")
-        self.root.minsize(900, 600)
-        self.root.resizable(True, True)
-        
-        # Dark theme with orange highlights
-        self.colors = {
-            'bg_main': '#1a1a1a',
-            'bg_header': '#2d2d2d',
-            'bg_card': '#252525',
-            'bg_button_primary': '#ff6b35',
-            'bg_button_primary_hover': '#ff8555',
-            'bg_button_success': '#ff6b35',
-            'bg_button_success_hover': '#ff8555',
-            'bg_button_danger': '#ff4444',
-            'bg_button_danger_hover': '#ff6666',
-            'text_primary': '#ffffff',
-            'text_secondary': '#b0b0b0',
-            'text_light': '#808080',
-            'border': '#404040',
-            'accent': '#ff6b35',
-            'success': '#ff6b35',
-            'warning': '#ffaa00',
-            'error': '#ff4444'
-        }
+class FileRangeStream:
+    """WSGI body that streams byte ranges of a file and reports progress
+    
+    When the server exposes its raw socket (werkzeug.socket) the ranges are
+    pushed with socket.sendfile(), straight from the page cache to the
+    socket, otherwise it falls back to reading 128KB chunks. Servers that
+    set burnbin.offload_file take over the streaming entirely.
+    """
+    chunk_size = 131072  # 128KB chunks for better performance
+    sendfile_slice = 4 * 1024 * 1024  # Progress granularity on the sendfile path
+    
+    def __init__(self, file_path, parts, closing=b'', environ=None, use_sendfile=True,
+                 on_progress=None, on_complete=None, on_abort=None, throttle=None):
+        self.file_path = file_path
+        self.parts = parts  # [(part_header, start, end)]
+        self.closing = closing
+        self.throttle = throttle  # Paces the body under bandwidth limits
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.on_abort = on_abort
+        self.started = False
+        self.completed = False
+        self.socket = None
+        if use_sendfile and environ is not None and hasattr(os, 'sendfile'):
+            self.socket = environ.get('werkzeug.socket')
+        self.file = None
         
-        # Initialize Flask app
-        self.flask_app = Flask(__name__)
-        self.setup_flask_routes()
+        # Async engines stream the ranges themselves instead of iterating us
+        if environ is not None and 'burnbin.offload_file' in environ:
+            environ['burnbin.offload_file'](self)
+    
+    def __iter__(self):
+        self.started = True
+        self.file = open(self.file_path, 'rb')
+        if self.socket is not None:
+            yield from self._iter_sendfile()
+        else:
+            yield from self._iter_read()
+        self.complete()
+    
+    def complete(self):
+        self.completed = True
+        if self.on_complete:
+            self.on_complete()
+    
+    def _iter_read(self):
+        f = self.file
+        for part_header, start, end in self.parts:
+            if part_header:
+                yield part_header
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                if self.throttle is not None:
+                    self.throttle.pace(len(chunk))
+                if self.on_progress:
+                    self.on_progress(len(chunk))
+                yield chunk
+        if self.closing:
+            yield self.closing
+    
+    def _iter_sendfile(self):
+        # An empty write makes the server flush the status line and headers,
+        # after that we own the socket until the body is done
+        yield b''
+        sock = self.socket
+        for part_header, start, end in self.parts:
+            if part_header:
+                sock.sendall(part_header)
+            offset = start
+            while offset < end:
+                count = min(self.sendfile_slice, end - offset)
+                if self.throttle is not None:
+                    count = self.throttle.clamp(count)
+                    self.throttle.pace(count)
+                sent = sock.sendfile(self.file, offset, count)
+                if not sent:
+                    return
+                offset += sent
+                if self.on_progress:
+                    self.on_progress(sent)
+        if self.closing:
+            sock.sendall(self.closing)
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        # Every server closes the body, finished or not, so this is where a
+        # client that went away mid-download shows up (HEAD never starts)
+        if self.started and not self.completed and self.on_abort:
+            self.on_abort()
+            self.on_abort = None
+
+class CompressedStream:
+    """WSGI body that compresses a file on the fly in a worker pool
+    
+    The request thread only relays what a worker produces through a small
+    queue, so at most as many files as the pool has workers are compressed
+    at once and a slow client holds back its worker instead of piling up
+    output. With a VariantCache the output is also written to disk and
+    published there once the whole file went through, later downloads are
+    served from that copy.
+    """
+    chunk_size = 262144  # Raw bytes per compress() call
+    depth = 16  # Compressed chunks buffered ahead of the client
+    
+    def __init__(self, file_path, coding, executor, cache=None, cache_key=None,
+                 on_progress=None, on_complete=None, on_abort=None, throttle=None):
+        self.file_path = file_path
+        self.coding = coding  # Key into STREAM_CODECS
+        self.executor = executor
+        self.cache = cache
+        self.cache_key = cache_key
+        self.on_progress = on_progress  # Called with raw (uncompressed) byte counts
+        self.on_complete = on_complete
+        self.on_abort = on_abort
+        self.throttle = throttle  # Paces the compressed bytes
+        self.started = False
+        self.completed = False
+        self.queue = queue.Queue(self.depth)
+        self.cancelled = threading.Event()
+    
+    def __iter__(self):
+        self.started = True
+        self.executor.submit(self._compress)
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            data, consumed = item
+            if self.throttle is not None and data:
+                self.throttle.pace(len(data))
+            if self.on_progress:
+                self.on_progress(consumed)
+            if data:
+                yield data
+        self.complete()
+    
+    def complete(self):
+        self.completed = True
+        if self.on_complete:
+            self.on_complete()
+    
+    def _put(self, item):
+        # Give up once the client is gone, nobody will take it
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def _compress(self):
+        """Worker side: read, compress, hand over and maybe cache"""
+        temp_path = None
+        if self.cache is not None:
+            temp_path = self.cache.reserve(self.cache_key)  # None while another request writes it
+        cache_file = None
+        finished = False
+        try:
+            if temp_path is not None:
+                cache_file = open(temp_path, 'wb')
+            compressor = STREAM_CODECS[self.coding]()
+            with open(self.file_path, 'rb') as f:
+                while not self.cancelled.is_set():
+                    raw = f.read(self.chunk_size)
+                    data = compressor.compress(raw) if raw else compressor.flush()
+                    if cache_file is not None and data:
+                        cache_file.write(data)
+                    if not self._put((data, len(raw))):
+                        break
+                    if not raw:
+                        finished = True
+                        break
+            if finished:
+                self._put(None)
+        except Exception as e:
+            finished = False
+            self._put(e)
+        finally:
+            if cache_file is not None:
+                cache_file.close()
+            if temp_path is not None:
+                if finished:
+                    self.cache.commit(self.cache_key, temp_path)
+                else:
+                    self.cache.discard(self.cache_key, temp_path)
+    
+    def close(self):
+        self.cancelled.set()
+        if self.started and not self.completed and self.on_abort:
+            self.on_abort()
+            self.on_abort = None
+
+class ZipStream:
+    """WSGI body that writes files into a ZIP archive as it is sent
+    
+    Entries carry data descriptors, so CRCs and sizes follow the data and
+    nothing is read ahead or spooled; memory is one chunk plus the central
+    directory. ZIP64 records are used only where a size or offset needs
+    them. Each entry is read up to the size it was listed with. When no
+    entry is deflated the exact length is known before the first byte.
+    With throttles, each entry is paced by its own, so files bundled
+    together still book against their own shares' limits.
+    """
+    chunk_size = 131072
+    flags = 0x0808  # Data descriptor, UTF-8 names
+    deflate_zip64 = 0xF0000000  # Deflated entries this large get ZIP64 headers, deflate may grow them
+    
+    def __init__(self, entries, deflate=None, on_progress=None, on_complete=None, on_abort=None,
+                 throttle=None, throttles=None):
+        self.entries = entries  # [(arcname, path, size, mtime)]
+        self.deflate = deflate  # arcname -> whether to deflate it, None stores everything
+        self.throttle = throttle  # Paces the archive under bandwidth limits
+        self.throttles = throttles  # [Throttle] parallel to entries, replaces throttle entry by entry
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.on_abort = on_abort
+        self.started = False
+        self.completed = False
+    
+    def _deflated(self, name):
+        return self.deflate is not None and self.deflate(name)
+    
+    def _local_header(self, name, method, mtime, zip64):
+        extra = struct.pack('<2H2Q', 1, 16, 0, 0) if zip64 else b''
+        size = 0xFFFFFFFF if zip64 else 0
+        dos_time, dos_date = dos_datetime(mtime)
+        return struct.pack(
+            '<I5H3I2H', 0x04034b50, 45 if zip64 else 20, self.flags, method,
+            dos_time, dos_date, 0, size, size, len(name), len(extra)
+        ) + name + extra
+    
+    def _descriptor(self, crc, compressed, size, zip64):
+        if zip64:
+            return struct.pack('<2I2Q', 0x08074b50, crc, compressed, size)
+        return struct.pack('<4I', 0x08074b50, crc, compressed, size)
+    
+    def _central_header(self, name, method, mtime, crc, compressed, size, offset):
+        extra = b''
+        version = 20
+        if max(compressed, size, offset) >= 0xFFFFFFFF:
+            extra = struct.pack('<2H3Q', 1, 24, size, compressed, offset)
+            compressed = size = offset = 0xFFFFFFFF
+            version = 45
+        dos_time, dos_date = dos_datetime(mtime)
+        return struct.pack(
+            '<I6H3I5H2I', 0x02014b50, version, version, self.flags, method, dos_time, dos_date,
+            crc, compressed, size, len(name), len(extra), 0, 0, 0, 0, offset
+        ) + name + extra
+    
+    def _end(self, count, directory_offset, directory_size):
+        end = b''
+        if count >= 0xFFFF or max(directory_offset, directory_size) >= 0xFFFFFFFF:
+            end += struct.pack(
+                '<IQ2H2I4Q', 0x06064b50, 44, 45, 45, 0, 0,
+                count, count, directory_size, directory_offset
+            )
+            end += struct.pack('<2IQI', 0x07064b50, 0, directory_offset + directory_size, 1)
+            count = min(count, 0xFFFF)
+            directory_offset = min(directory_offset, 0xFFFFFFFF)
+            directory_size = min(directory_size, 0xFFFFFFFF)
+        return end + struct.pack(
+            '<I4H2IH', 0x06054b50, 0, 0, count, count, directory_size, directory_offset, 0
+        )
+    
+    def content_length(self):
+        """Exact size of the archive, None when entries are deflated"""
+        offset = 0
+        directory_size = 0
+        for name, _, size, mtime in self.entries:
+            if self._deflated(name):
+                return None
+            name = name.encode('utf-8')
+            zip64 = size >= 0xFFFFFFFF
+            directory_size += len(self._central_header(name, 0, mtime, 0, size, size, offset))
+            offset += len(self._local_header(name, 0, mtime, zip64)) + size
+            offset += len(self._descriptor(0, size, size, zip64))
+        return offset + directory_size + len(self._end(len(self.entries), offset, directory_size))
+    
+    def __iter__(self):
+        self.started = True
+        for data in self._archive():
+            if self.throttle is not None:
+                self.throttle.pace(len(data))
+            yield data
+        self.complete()
+    
+    def _archive(self):
+        offset = 0
+        directory = []
+        for index, (name, path, size, mtime) in enumerate(self.entries):
+            if self.throttles is not None:
+                self.throttle = self.throttles[index]
+            name = name.encode('utf-8')
+            deflated = self._deflated(name.decode('utf-8'))
+            method = 8 if deflated else 0
+            zip64 = size >= (self.deflate_zip64 if deflated else 0xFFFFFFFF)
+            header = self._local_header(name, method, mtime, zip64)
+            yield header
+            
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15) if deflated else None
+            crc = 0
+            compressed = 0
+            with open(path, 'rb') as f:
+                remaining = size
+                while remaining > 0:
+                    data = f.read(min(self.chunk_size, remaining))
+                    if not data:
+                        # The stored length can't be honoured, end the transfer
+                        raise OSError(f"{path} shrank while being sent")
+                    remaining -= len(data)
+                    crc = zlib.crc32(data, crc)
+                    if self.on_progress:
+                        self.on_progress(len(data))
+                    if compressor is not None:
+                        data = compressor.compress(data)
+                    if data:
+                        compressed += len(data)
+                        yield data
+            if compressor is not None:
+                data = compressor.flush()
+                compressed += len(data)
+                yield data
+            
+            descriptor = self._descriptor(crc, compressed, size, zip64)
+            yield descriptor
+            directory.append(self._central_header(name, method, mtime, crc, compressed, size, offset))
+            offset += len(header) + compressed + len(descriptor)
         
-        # Storage for shared files
-        self.shared_files = {}  # {file_id: {path, name, size, upload_time, downloads}}
-        self.download_sessions = {}  # {session_id: {file_id, start_time, progress, status}}
-        self.uploaded_files = {}  # {file_id: {path, name, size, upload_time, uploader_ip}}
+        directory_size = 0
+        for start in range(0, len(directory), 512):
+            batch = b''.join(directory[start:start + 512])
+            directory_size += len(batch)
+            yield batch
+        yield self._end(len(directory), offset, directory_size)
+    
+    def complete(self):
+        self.completed = True
+        if self.on_complete:
+            self.on_complete()
+    
+    def close(self):
+        if self.started and not self.completed and self.on_abort:
+            self.on_abort()
+            self.on_abort = None
+
+class EventStream:
+    """WSGI body for one page's Server-Sent Events connection
+    
+    Messages arrive already encoded from an EventChannel and wait in a
+    bounded queue. A page that falls that far behind is cut off; it
+    reconnects and gets a fresh snapshot. Servers that set
+    burnbin.offload_events wait for messages on their event loop or
+    selector thread instead of holding a thread in __iter__.
+    """
+    heartbeat = 15  # Seconds between keep-alive comments, keeps the tunnel from idling us out
+    
+    def __init__(self, channel, stream_id, backlog=256, environ=None):
+        self.channel = channel
+        self.stream_id = stream_id
+        self.backlog = backlog
+        self.pending = []
+        self.condition = threading.Condition()
+        self.closed = False
+        self.waker = None  # Called after every put, set by engines that relay the stream
         
-        # Create uploads directory
-        # When running as PyInstaller executable, use directory next to exe
-        if getattr(sys, 'frozen', False):
-            # Running as compiled executable
-            base_path = os.path.dirname(sys.executable)
+        if environ is not None and 'burnbin.offload_events' in environ:
+            environ['burnbin.offload_events'](self)
+    
+    def put(self, message):
+        with self.condition:
+            if self.closed:
+                return
+            if len(self.pending) >= self.backlog:
+                self.pending.clear()
+                self.closed = True
+            else:
+                self.pending.append(message)
+            self.condition.notify()
+            waker = self.waker
+        if waker:
+            waker()
+    
+    def take(self, timeout=None):
+        """Pop everything queued as one chunk, waiting up to timeout for it (b'' if none)"""
+        with self.condition:
+            if not self.pending and not self.closed and timeout:
+                self.condition.wait(timeout)
+            data = b''.join(self.pending)
+            self.pending.clear()
+            return data
+    
+    def __iter__(self):
+        while True:
+            data = self.take(self.heartbeat)
+            if data:
+                yield data
+            elif self.closed:
+                return
+            else:
+                yield b': ping\n\n'
+    
+    def end(self):
+        """Finish the stream once queued messages are sent"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+            waker = self.waker
+        if waker:
+            waker()
+    
+    def close(self):
+        self.end()
+        self.channel.unsubscribe(self)
+
+def parse_request_head(head):
+    """Parse an HTTP/1.x request line and headers (raises ValueError)
+    
+    Returns (method, target, version, headers) with lower-cased header names,
+    repeated headers are joined with ", ".
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, version = lines[0].split(' ')
+    if version not in ('HTTP/1.0', 'HTTP/1.1'):
+        raise ValueError(f"unsupported protocol {version}")
+    
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if not sep:
+            raise ValueError("malformed header line")
+        name = name.strip().lower()
+        value = value.strip()
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return method, target, version, headers
+
+
+def wants_keep_alive(version, headers):
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.1':
+        return 'close' not in connection
+    return 'keep-alive' in connection
+
+
+def build_wsgi_environ(method, target, version, headers, wsgi_input, server_addr, remote_addr):
+    """PEP 3333 environ for a parsed request"""
+    path, _, query = target.partition('?')
+    if path.startswith(('http://', 'https://')):
+        # Absolute-form request target
+        path = '/' + path.split('/', 3)[3] if path.count('/') >= 3 else '/'
+    
+    environ = {
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': unquote_to_bytes(path).decode('latin-1'),
+        'QUERY_STRING': query,
+        'REQUEST_URI': target,
+        'RAW_URI': target,
+        'SERVER_NAME': server_addr[0],
+        'SERVER_PORT': str(server_addr[1]),
+        'SERVER_PROTOCOL': version,
+        'REMOTE_ADDR': remote_addr[0],
+        'REMOTE_PORT': remote_addr[1],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': wsgi_input,
+        'wsgi.input_terminated': 'chunked' in headers.get('transfer-encoding', '').lower(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in headers.items():
+        key = name.upper().replace('-', '_')
+        if key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[key] = value
+        elif key != 'TRANSFER_ENCODING':
+            environ[f'HTTP_{key}'] = value
+    return environ
+
+
+def build_response_head(version, status, headers, head_request, keep_alive):
+    """Serialize a response head and pick the body framing
+    
+    Returns (head_bytes, chunked, keep_alive). Responses without a length
+    are chunked on HTTP/1.1 and close-delimited on HTTP/1.0.
+    """
+    code = int(status.split(' ', 1)[0])
+    names = {name.lower() for name, _ in headers}
+    lines = [f"{version} {status}"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    if 'date' not in names:
+        lines.append(f"Date: {http_date()}")
+    if 'server' not in names:
+        lines.append("Server: BurnBin")
+    
+    chunked = False
+    bodyless = head_request or 100 <= code < 200 or code in (204, 304)
+    if 'content-length' not in names and not bodyless:
+        if version == 'HTTP/1.1':
+            chunked = True
+            lines.append("Transfer-Encoding: chunked")
         else:
-            # Running as script
-            base_path = os.getcwd()
-        self.uploads_dir = os.path.join(base_path, "uploads")
-        os.makedirs(self.uploads_dir, exist_ok=True)
-        
-        # Persistence file path
-        self.shared_files_file = os.path.join(base_path, "shared_files.json")
+            # HTTP/1.0 without a length: the body ends when we close
+            keep_alive = False
+    if keep_alive:
+        if version == 'HTTP/1.0':
+            lines.append("Connection: keep-alive")
+    else:
+        lines.append("Connection: close")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'), chunked, keep_alive
+
+
+def simple_response(status, body=None):
+    """A complete plain-text response that closes the connection"""
+    body = (body or status).encode('utf-8')
+    return (
+        f"HTTP/1.1 {status}\r\nContent-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    ).encode('latin-1') + body
+
+def compress_variants(body, level=9):
+    """Encodings of a response body worth offering, {coding: bytes}"""
+    variants = {'identity': body}
+    gzipped = gzip.compress(body, compresslevel=level, mtime=0)
+    if len(gzipped) < len(body):
+        variants['gzip'] = gzipped
+        if brotli is not None:
+            variants['br'] = brotli.compress(body, quality=min(level + 2, 11))
+    return variants
+
+def parse_accept_encoding(accept_encoding):
+    """Accept-Encoding header as {coding: quality}"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().lower().partition(';')
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip()] = quality
+    return accepted
+
+def negotiate_encoding(accept_encoding, variants):
+    """Pick the smallest variant the Accept-Encoding header allows"""
+    accepted = parse_accept_encoding(accept_encoding)
+    best = 'identity'
+    for coding in variants:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if coding != 'identity' and quality > 0 and len(variants[coding]) < len(variants[best]):
+            best = coding
+    return best
+
+# Streaming compressors for downloads, in order of preference. Each
+# factory returns an object with compress(data) and flush()
+STREAM_CODECS = OrderedDict()
+if zstandard is not None:
+    STREAM_CODECS['zstd'] = lambda: zstandard.ZstdCompressor(level=3).compressobj()
+STREAM_CODECS['gzip'] = lambda: zlib.compressobj(6, zlib.DEFLATED, 31)
+STREAM_CODECS['xz'] = lambda: lzma.LZMACompressor(preset=1)  # Scripted clients only, browsers never ask
+
+# Text formats mimetypes doesn't know, or maps to something generic
+COMPRESSIBLE_EXTENSIONS = {
+    '.log', '.csv', '.tsv', '.jsonl', '.ndjson', '.md', '.yaml', '.yml',
+    '.ini', '.cfg', '.conf', '.toml', '.sql', '.svg', '.ps1', '.bat'
+}
+
+def is_compressible(name):
+    """Whether a file name suggests text worth compressing"""
+    if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+        return True
+    mimetype = mimetypes.guess_type(name)[0] or ''
+    return mimetype.startswith('text/') or mimetype.endswith(
+        ('/json', '+json', '/xml', '+xml', '/javascript', '/x-sh', '/sql')
+    )
+
+def choose_encoding(accept_encoding, codings):
+    """Content coding to send, None for identity
+    
+    The highest quality wins and ties go to the order of codings. An
+    explicit identity with a higher quality keeps the body as is.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    best, best_quality = None, 0.0
+    for coding in codings:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    if best is not None and accepted.get('identity', 0.0) > best_quality:
+        return None
+    return best
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def dos_datetime(timestamp):
+    """(time, date) in the MS-DOS format of ZIP headers, local time"""
+    t = time.localtime(timestamp)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1  # 1980-01-01, the earliest DOS date
+    year = min(t.tm_year, 2107) - 1980
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        (year << 9) | (t.tm_mon << 5) | t.tm_mday
+    )
+
+def folder_entries(folder):
+    """Files under a folder as ZipStream entries, named <folder>/<relative path>"""
+    base = os.path.basename(os.path.normpath(folder))
+    entries = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for file_name in sorted(files):
+            path = os.path.join(root, file_name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue  # Broken link or deleted meanwhile
+            if not stat.S_ISREG(info.st_mode):
+                continue  # FIFOs, sockets, devices
+            relative = os.path.relpath(path, folder).replace(os.sep, '/')
+            entries.append((f"{base}/{relative}", path, info.st_size, info.st_mtime))
+    return entries
+
+def unique_name(name, taken):
+    """name, or 'name (2).ext' and so on if taken already; the result is added to taken"""
+    stem, ext = os.path.splitext(name)
+    candidate = name
+    number = 1
+    while candidate.lower() in taken:
+        number += 1
+        candidate = f"{stem} ({number}){ext}"
+    taken.add(candidate.lower())
+    return candidate
+
+def metric_label(value):
+    """A label value escaped for the Prometheus text format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def metric_lines(name, kind, description, samples):
+    """One metric family in the Prometheus text format
+    
+    samples are (suffix, labels, value) with labels a tuple of
+    (name, value) pairs, suffix '' except for histogram series.
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        if labels:
+            text = ','.join(f'{key}="{metric_label(label)}"' for key, label in labels)
+            lines.append(f"{name}{suffix}{{{text}}} {value}")
+        else:
+            lines.append(f"{name}{suffix} {value}")
+    return lines
+
+def process_rss():
+    """Resident memory of this process in bytes, or None where it can't be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
         
-        # Server state
-        self.server_thread = None
-        self.cloudflare_process = None
-        self.server_running = False
-        self.public_url = None
-        self.local_port = 5000
+        class MemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (field, ctypes.c_size_t) for field in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage',
+                    'PagefileUsage', 'PeakPagefileUsage'
+                )
+            ]
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        kernel32.K32GetProcessMemoryInfo.argtypes = [
+            wintypes.HANDLE, ctypes.POINTER(MemoryCounters), wintypes.DWORD
+        ]
+        counters = MemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if kernel32.K32GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+class WerkzeugEngine:
+    """Werkzeug's development server: a thread per connection, no keep-alive"""
+    max_event_streams = 256  # Each open page holds a thread
+    max_download_waiters = 256  # So does a download waiting for a slot
+    
+    def __init__(self, app, host, port, **options):
+        self.httpd = make_server(host, port, app, threaded=True)
+        self.port = self.httpd.server_port
+    
+    def serve_forever(self):
+        self.httpd.serve_forever()
+    
+    def shutdown(self):
+        self.httpd.shutdown()
+
+
+class _Connection:
+    """A client socket plus any bytes read past the current request"""
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.buffer = bytearray()
+        self.last_active = time.monotonic()
+        self.requests = 0
+        self.relay = None  # Set when the connection turns into an event stream
+
+class _EventRelay:
+    """An EventStream the selector thread writes to its connection"""
+    def __init__(self, conn, stream, result, chunked):
+        self.conn = conn
+        self.stream = stream
+        self.result = result  # The WSGI iterable, closed when the relay ends
+        self.chunked = chunked
+        self.out = bytearray()  # Encoded bytes the socket hasn't taken yet
+        self.events = selectors.EVENT_READ
+        self.next_ping = time.monotonic() + stream.heartbeat
+        self.woken = False
+
+
+class _RequestInput:
+    """wsgi.input for a keep-alive connection, never reads past the body
+    
+    With length=None the stream is unbounded and the framing is left to a
+    DechunkedInput wrapped around it.
+    """
+    def __init__(self, conn, length):
+        self.conn = conn
+        self.remaining = length
+    
+    def _fill(self):
+        if not self.conn.buffer:
+            data = self.conn.sock.recv(65536)
+            if not data:
+                return False
+            self.conn.buffer += data
+        return True
+    
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.remaining if self.remaining is not None else sys.maxsize
+        elif self.remaining is not None:
+            size = min(size, self.remaining)
         
-        # Load persisted shared files
-        self.load_shared_files()
+        out = bytearray()
+        buf = self.conn.buffer
+        while len(out) < size and self._fill():
+            take = min(size - len(out), len(buf))
+            out += buf[:take]
+            del buf[:take]
+        if self.remaining is not None:
+            self.remaining -= len(out)
+        return bytes(out)
+    
+    def readline(self, limit=-1):
+        if limit is None or limit < 0:
+            limit = sys.maxsize
+        if self.remaining is not None:
+            limit = min(limit, self.remaining)
         
-        # Set root background
-        self.root.configure(bg=self.colors['bg_main'])
+        buf = self.conn.buffer
+        while True:
+            newline = buf.find(b'\n', 0, limit)
+            if newline >= 0:
+                return self.read(newline + 1)
+            if len(buf) >= limit or not self._fill_more():
+                return self.read(min(limit, len(buf)))
+    
+    def _fill_more(self):
+        data = self.conn.sock.recv(65536)
+        if not data:
+            return False
+        self.conn.buffer += data
+        return True
+    
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+class PooledWSGIServer:
+    """HTTP/1.1 WSGI server with keep-alive and a bounded worker pool
+    
+    A selector thread accepts connections and parks idle keep-alive
+    connections. A request is only handed to a worker once its first bytes
+    arrive, so idle clients don't tie up threads. Past max_connections the
+    server stops accepting and new clients wait in the listen backlog.
+    Event streams go back to the selector thread once their headers are
+    sent, which writes messages as they are published, so open pages
+    don't hold workers either.
+    """
+    max_header_size = 65536
+    max_drain = 1024 * 1024  # Unread request body we discard to keep a connection
+    max_relay_buffer = 1024 * 1024  # Unsent event bytes before a page that stopped reading is cut off
+    
+    def __init__(self, app, host, port, threads=32, max_connections=512, backlog=128,
+                 keepalive_timeout=15, io_timeout=60, max_requests=1000, **options):
+        self.app = app
+        self.threads = threads
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.io_timeout = io_timeout
+        self.max_requests = max_requests
+        # Queued downloads are the only requests that hold a worker without
+        # doing work (event streams are relayed by the selector thread), so
+        # they get half the pool and the rest stays free for pages, polls
+        # and transfers. A pool too small to spare one queues nothing
+        self.max_event_streams = max(1, max_connections // 2)
+        self.max_download_waiters = threads // 2
         
-        # Setup UI
-        self.setup_ui()
+        self.socket = socket.create_server((host, port), backlog=backlog)
+        self.socket.setblocking(False)
+        self.host, self.port = self.socket.getsockname()[:2]
         
-        # Populate treeview with loaded shared files
-        self.populate_files_treeview()
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='burnbin-http')
+        self.selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._events = queue.SimpleQueue()  # ('park', conn) or ('closed', None) from workers
+        self._parked = {}  # {sock: conn}
+        self._busy = set()  # Connections handed to a worker
+        self._relays = {}  # {sock: _EventRelay}
+        self._next_ping_check = 0
+        self._accepting = False
+        self._running = False
+        self.active_connections = 0
+    
+    def serve_forever(self):
+        self._running = True
+        self.selector.register(self._wake_r, selectors.EVENT_READ, 'wake')
+        self._set_accepting(True)
+        try:
+            while self._running:
+                for key, mask in self.selector.select(timeout=1.0):
+                    if key.data == 'accept':
+                        self._accept()
+                    elif key.data == 'wake':
+                        self._drain_events()
+                    elif isinstance(key.data, _EventRelay):
+                        self._relay_io(key.data, mask)
+                    else:
+                        # Request bytes arrived on a parked connection
+                        self.selector.unregister(key.fileobj)
+                        conn = self._parked.pop(key.fileobj)
+                        self.pool.submit(self._handle, conn)
+                self._expire_idle()
+                self._ping_relays()
+        finally:
+            for conn in list(self._parked.values()):
+                self._close(conn)
+            self._parked.clear()
+            for relay in list(self._relays.values()):
+                self._end_relay(relay)
+            # Unblock workers stuck on slow clients so the process can exit
+            for conn in list(self._busy):
+                try:
+                    conn.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self.selector.close()
+            self.socket.close()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+    
+    def shutdown(self):
+        self._running = False
+        self._wake()
+    
+    def _wake(self):
+        try:
+            self._wake_w.send(b'\0')
+        except OSError:
+            pass
+    
+    def _set_accepting(self, accepting):
+        if accepting and not self._accepting:
+            self.selector.register(self.socket, selectors.EVENT_READ, 'accept')
+        elif not accepting and self._accepting:
+            self.selector.unregister(self.socket)
+        self._accepting = accepting
+    
+    def _accept(self):
+        try:
+            sock, addr = self.socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        sock.setblocking(True)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.active_connections += 1
+        if self.active_connections >= self.max_connections:
+            # Leave further clients in the kernel backlog until a slot frees
+            self._set_accepting(False)
+        self._park(_Connection(sock, addr))
+    
+    def _park(self, conn):
+        conn.last_active = time.monotonic()
+        self._parked[conn.sock] = conn
+        self.selector.register(conn.sock, selectors.EVENT_READ, conn)
+    
+    def _drain_events(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        while True:
+            try:
+                kind, conn = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'events':
+                if conn.conn.sock in self._relays:
+                    self._pump(conn)
+            elif kind == 'relay':
+                self._start_relay(conn)
+            elif kind == 'park' and self._running:
+                self._park(conn)
+            else:
+                if kind == 'park':
+                    self._close(conn)
+                self.active_connections -= 1
+                if self.active_connections < self.max_connections:
+                    self._set_accepting(True)
+    
+    def _expire_idle(self):
+        deadline = time.monotonic() - self.keepalive_timeout
+        for sock, conn in list(self._parked.items()):
+            if conn.last_active < deadline:
+                self.selector.unregister(sock)
+                del self._parked[sock]
+                self._close(conn)
+                self.active_connections -= 1
+        if self.active_connections < self.max_connections:
+            self._set_accepting(True)
+    
+    def _close(self, conn):
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+    
+    def _start_relay(self, relay):
+        """Take over an event stream whose headers a worker has sent"""
+        if not self._running:
+            self._end_relay(relay)
+            return
+        sock = relay.conn.sock
+        sock.setblocking(False)
+        self._relays[sock] = relay
+        self.selector.register(sock, relay.events, relay)
         
-        # Start local server
-        self.start_local_server()
+        def wake():
+            # One queued wake-up per batch of messages, not one per message
+            if not relay.woken:
+                relay.woken = True
+                self._events.put(('events', relay))
+                self._wake()
+        relay.stream.waker = wake
+        self._pump(relay)
     
-    def setup_ui(self):
+    def _pump(self, relay):
+        """Move an event stream's queued messages to its socket"""
+        relay.woken = False
+        data = relay.stream.take()
+        if data:
+            self._send_relay(relay, data)
+        elif relay.stream.closed:
+            self._end_relay(relay)
+    
+    def _send_relay(self, relay, data):
+        relay.out += b'%x\r\n%s\r\n' % (len(data), data) if relay.chunked else data
+        relay.next_ping = time.monotonic() + relay.stream.heartbeat
+        self._flush_relay(relay)
+    
+    def _flush_relay(self, relay):
+        sock = relay.conn.sock
+        try:
+            sent = sock.send(relay.out) if relay.out else 0
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._end_relay(relay, flush=False)
+            return
+        del relay.out[:sent]
+        if len(relay.out) > self.max_relay_buffer:
+            self._end_relay(relay, flush=False)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if relay.out else 0)
+        if events != relay.events:
+            relay.events = events
+            self.selector.modify(sock, events, relay)
+    
+    def _relay_io(self, relay, mask):
+        if mask & selectors.EVENT_READ:
+            try:
+                data = relay.conn.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                data = None
+            except OSError:
+                data = b''
+            if data == b'':
+                self._end_relay(relay, flush=False)  # The page went away
+                return
+            # Anything else a client sends on an event stream is ignored
+        if mask & selectors.EVENT_WRITE:
+            self._flush_relay(relay)
+    
+    def _ping_relays(self):
+        """Send heartbeats on quiet streams, checked about once a second"""
+        now = time.monotonic()
+        if now < self._next_ping_check:
+            return
+        self._next_ping_check = now + 1
+        for relay in list(self._relays.values()):
+            if now >= relay.next_ping and relay.conn.sock in self._relays:
+                self._send_relay(relay, b': ping\n\n')
+    
+    def _end_relay(self, relay, flush=True):
+        sock = relay.conn.sock
+        if self._relays.pop(sock, None) is not None:
+            self.selector.unregister(sock)
+        relay.stream.waker = None
+        if flush:
+            # Best effort, the page reconnects either way
+            try:
+                sock.send(relay.out + (b'0\r\n\r\n' if relay.chunked else b''))
+            except OSError:
+                pass
+        if hasattr(relay.result, 'close'):
+            relay.result.close()  # Unsubscribes the stream
+        self._close(relay.conn)
+        self.active_connections -= 1
+        if self.active_connections < self.max_connections and self._running:
+            self._set_accepting(True)
+    
+    def _handle(self, conn):
+        if not self._running:
+            self._close(conn)
+            return
+        self._busy.add(conn)
+        conn.sock.settimeout(self.io_timeout)
+        keep_alive = False
+        try:
+            keep_alive = self._serve_request(conn)
+            # Serve pipelined requests that were read along with this one
+            while keep_alive and conn.buffer and self._running:
+                keep_alive = self._serve_request(conn)
+        except Exception:
+            keep_alive = False
+        self._busy.discard(conn)
         
-        # Modern header with gradient effect
-        header_frame = tk.Frame(self.root, bg=self.colors['bg_header'], height=120)
-        header_frame.pack(fill=tk.X)
-        header_frame.pack_propagate(False)
+        if conn.relay is not None:
+            self._events.put(('relay', conn.relay))
+        elif keep_alive:
+            self._events.put(('park', conn))
+        else:
+            self._close(conn)
+            self._events.put(('closed', None))
+        self._wake()
+    
+    def _serve_request(self, conn):
+        """Read and answer one request, returns True to keep the connection"""
+        buf = conn.buffer
+        while True:
+            end = buf.find(b'\r\n\r\n')
+            if end >= 0:
+                break
+            if len(buf) > self.max_header_size:
+                conn.sock.sendall(simple_response('431 Request Header Fields Too Large'))
+                return False
+            data = conn.sock.recv(65536)
+            if not data:
+                return False
+            buf += data
         
-        # Header content container
-        header_content = tk.Frame(header_frame, bg=self.colors['bg_header'])
-        header_content.pack(fill=tk.BOTH, expand=True, padx=30, pady=18)
+        head = bytes(buf[:end])
+        del buf[:end + 4]
+        try:
+            method, target, version, headers = parse_request_head(head)
+            if 'chunked' in headers.get('transfer-encoding', '').lower():
+                body = _RequestInput(conn, None)
+                wsgi_input = DechunkedInput(body)
+            else:
+                length = int(headers.get('content-length') or 0)
+                if length < 0:
+                    raise ValueError("negative Content-Length")
+                body = wsgi_input = _RequestInput(conn, length)
+        except ValueError:
+            conn.sock.sendall(simple_response('400 Bad Request'))
+            return False
         
-        # Title with icon emoji
-        title_container = tk.Frame(header_content, bg=self.colors['bg_header'])
-        title_container.pack(anchor=tk.W)
+        keep_alive = wants_keep_alive(version, headers)
+        conn.requests += 1
+        if conn.requests >= self.max_requests:
+            keep_alive = False
         
-        title_label = tk.Label(
-            title_container,
-            text="🔥 BurnBin",
-            font=("Segoe UI", 28, "bold"),
-            bg=self.colors['bg_header'],
-            fg="#ff6b35"
+        environ = build_wsgi_environ(
+            method, target, version, headers, wsgi_input, (self.host, self.port), conn.addr
         )
-        title_label.pack(side=tk.LEFT)
+        environ['werkzeug.socket'] = conn.sock  # Lets FileRangeStream use sendfile
         
-        subtitle_label = tk.Label(
-            header_content,
-            text="Share files instantly with secure public links • PyroSoft Productions",
-            font=("Segoe UI", 10),
-            bg=self.colors['bg_header'],
-            fg="#b0b0b0"
-        )
-        subtitle_label.pack(anchor=tk.W, pady=(5, 0))
+        if headers.get('expect', '').lower() == '100-continue':
+            conn.sock.sendall(b"HTTP/1.1 100 Continue\r\n\r\n")
         
-        # Website link
-        website_label = tk.Label(
-            header_content,
-            text="https://pyrosoft.pro/",
-            font=("Segoe UI", 9),
-            bg=self.colors['bg_header'],
-            fg="#ff6b35",
-            cursor="hand2"
-        )
-        website_label.pack(anchor=tk.W, pady=(2, 0))
-        website_label.bind("<Button-1>", lambda e: self.open_website())
+        keep_alive = self._run_app(conn, environ, version, keep_alive)
         
-        # Main container with tabs
-        main_container = tk.Frame(self.root, bg=self.colors['bg_main'])
-        main_container.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
+        # Discard whatever the app didn't read of the request body
+        if keep_alive:
+            if body.remaining is None or body.remaining > self.max_drain:
+                return False
+            while body.remaining:
+                if not body.read(65536):
+                    return False
+        return keep_alive
+    
+    def _run_app(self, conn, environ, version, keep_alive):
+        """Run the WSGI app and write its response, returns keep-alive state"""
+        state = {'status': None, 'headers': None, 'sent': False, 'chunked': False}
+        sock = conn.sock
+        head_request = environ['REQUEST_METHOD'] == 'HEAD'
+        offloaded = []
+        environ['burnbin.offload_events'] = offloaded.append
         
-        # Create notebook (tabs)
-        style = ttk.Style()
-        style.theme_use("clam")
+        def start_response(status, response_headers, exc_info=None):
+            if exc_info:
+                try:
+                    if state['sent']:
+                        raise exc_info[1].with_traceback(exc_info[2])
+                finally:
+                    exc_info = None
+            state['status'] = status
+            state['headers'] = response_headers
+            return write
         
-        # Configure tab style for dark theme
-        style.configure("TNotebook", background=self.colors['bg_main'], borderwidth=0)
-        style.configure("TNotebook.Tab", 
-                       padding=[20, 10],
-                       font=("Segoe UI", 11, "bold"),
-                       background='#2d2d2d',
-                       foreground=self.colors['text_secondary'])
-        # Configure selected tab with larger padding
-        style.configure("TNotebook.Tab",
-                       padding=[20, 10])
-        style.map("TNotebook.Tab",
-                 background=[("selected", self.colors['bg_card'])],
-                 foreground=[("selected", self.colors['accent'])],
-                 padding=[("selected", [24, 12]), ("!selected", [18, 8])])
-        
-        self.notebook = ttk.Notebook(main_container)
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
-        
-        # Tab 1: Share (Add files + Status)
-        self.share_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
-        self.notebook.add(self.share_tab, text="🔥 Share")
-        self.setup_share_tab()
+        def write(data):
+            nonlocal keep_alive
+            if not state['sent']:
+                head, state['chunked'], keep_alive = build_response_head(
+                    version, state['status'], state['headers'], head_request, keep_alive
+                )
+                sock.sendall(head)
+                state['sent'] = True
+            if data and not head_request:
+                if state['chunked']:
+                    sock.sendall(b'%x\r\n%s\r\n' % (len(data), data))
+                else:
+                    sock.sendall(data)
         
-        # Tab 2: Files (Shared files list)
-        self.files_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
-        self.notebook.add(self.files_tab, text="🔥 Files")
-        self.setup_files_tab()
+        try:
+            result = self.app(environ, start_response)
+            if offloaded and not head_request:
+                # Send the headers, the selector thread relays the events
+                try:
+                    write(b'')
+                except BaseException:
+                    result.close()
+                    raise
+                conn.relay = _EventRelay(conn, offloaded[0], result, state['chunked'])
+                return False
+            try:
+                for data in result:
+                    write(data)
+                if not state['sent']:
+                    write(b'')
+                if state['chunked']:
+                    sock.sendall(b'0\r\n\r\n')
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        except (ConnectionError, socket.timeout):
+            return False
+        except Exception:
+            traceback.print_exc()
+            if not state['sent']:
+                sock.sendall(simple_response('500 Internal Server Error'))
+            return False
+        return keep_alive
+
+
+class _StreamInput:
+    """wsgi.input for an AsyncioEngine request, read from an executor thread
+    
+    Each refill hops onto the event loop and waits for the next piece of
+    the body there, so the app sees the body as it arrives and can stop
+    early. Never reads past the body; with length=None the stream is
+    unbounded and the framing is left to a DechunkedInput wrapped around it.
+    """
+    def __init__(self, loop, reader, length, timeout):
+        self.loop = loop
+        self.reader = reader
+        self.remaining = length  # Body bytes the app hasn't read, buffered ones included
+        self.timeout = timeout
+        self.buffer = bytearray()
+    
+    async def _receive(self):
+        size = 65536 if self.remaining is None else min(65536, self.remaining - len(self.buffer))
+        if size <= 0:
+            return b''
+        return await asyncio.wait_for(self.reader.read(size), self.timeout)
+    
+    async def preload(self):
+        """Buffer the rest of the body on the loop, for bodies too small to stream"""
+        while self.remaining - len(self.buffer) > 0:
+            data = await self._receive()
+            if not data:
+                raise asyncio.IncompleteReadError(bytes(self.buffer), self.remaining)
+            self.buffer += data
+    
+    async def discard(self):
+        """Skip what the app left unread, so the connection can be reused"""
+        await asyncio.wait_for(self.reader.readexactly(self.remaining - len(self.buffer)), self.timeout)
+        self.buffer.clear()
+        self.remaining = 0
+    
+    def _fill(self):
+        data = asyncio.run_coroutine_threadsafe(self._receive(), self.loop).result()
+        if not data:
+            return False
+        self.buffer += data
+        return True
+    
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.remaining if self.remaining is not None else sys.maxsize
+        elif self.remaining is not None:
+            size = min(size, self.remaining)
         
-        # Tab 3: Uploads (Files uploaded by users)
-        self.uploads_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
-        self.notebook.add(self.uploads_tab, text="🔥 Uploads")
-        self.setup_uploads_tab()
+        out = bytearray()
+        buf = self.buffer
+        while len(out) < size and (buf or self._fill()):
+            take = min(size - len(out), len(buf))
+            out += buf[:take]
+            del buf[:take]
+        if self.remaining is not None:
+            self.remaining -= len(out)
+        return bytes(out)
+    
+    def readline(self, limit=-1):
+        if limit is None or limit < 0:
+            limit = sys.maxsize
+        if self.remaining is not None:
+            limit = min(limit, self.remaining)
         
-        # Tab 4: Activity (Download activity log)
-        self.activity_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
-        self.notebook.add(self.activity_tab, text="🔥 Activity")
-        self.setup_activity_tab()
+        buf = self.buffer
+        while True:
+            newline = buf.find(b'\n', 0, limit)
+            if newline >= 0:
+                return self.read(newline + 1)
+            if len(buf) >= limit or not self._fill():
+                return self.read(min(limit, len(buf)))
+    
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+class AsyncioEngine:
+    """Single-threaded asyncio HTTP/1.1 server for many slow or idle clients
+    
+    Connections are coroutines, so thousands of them cost no threads. The
+    Flask app still produces every response, on a small executor, but when
+    it answers with a FileRangeStream the body is handed back to the event
+    loop and streamed with loop.sendfile() without holding a thread. Event
+    streams for open pages are relayed from the loop the same way.
+    
+    Small request bodies are read on the loop before the app runs. Larger
+    and chunked ones stream to the app as it reads them, so an upload it
+    refuses early is never received in full.
+    """
+    max_header_size = 65536
+    buffer_size = 65536  # Request bodies up to this are read before the app runs
+    max_drain = 1024 * 1024  # Unread request body we discard to keep a connection
+    batch_size = 256 * 1024  # Response bytes pulled per executor hop
+    
+    def __init__(self, app, host, port, threads=8, max_connections=10000, backlog=1024,
+                 keepalive_timeout=15, io_timeout=60, **options):
+        self.app = app
+        self.max_connections = max_connections
+        self.max_event_streams = max_connections // 2
+        self.max_download_waiters = threads // 2  # Queued downloads wait on the executor, streams don't
+        self.keepalive_timeout = keepalive_timeout
+        self.io_timeout = io_timeout
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='burnbin-async')
         
-        # Start update loop
-        self.update_status()
+        # Bind up front so port errors surface in start_local_server
+        self.socket = socket.create_server((host, port), backlog=backlog)
+        self.host, self.port = self.socket.getsockname()[:2]
+        self.backlog = backlog
+        self.loop = None
+        self._stopped = None
+        self._slots = None
+        self._connections = set()  # Tasks of the open connections, cancelled on shutdown
+        self.active_connections = 0
     
-    def setup_share_tab(self):
-        """Setup the Share tab with file upload and status"""
-        # Add file section - Modern card design
-        add_file_card = tk.Frame(
-            self.share_tab,
-            bg=self.colors['bg_card'],
-            relief=tk.FLAT,
-            highlightbackground=self.colors['border'],
-            highlightthickness=1
+    def serve_forever(self):
+        asyncio.run(self._serve())
+    
+    def shutdown(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._stopped.set)
+    
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_connections)
+        server = await asyncio.start_server(
+            self._handle, sock=self.socket, backlog=self.backlog, limit=self.max_header_size
         )
-        add_file_card.pack(fill=tk.X, pady=(0, 20))
+        async with server:
+            await self._stopped.wait()
+            server.close()
+            # End open connections while the loop still runs. A wait_for
+            # that completes as it is cancelled swallows the cancel, so
+            # whatever is still open gets cancelled again
+            while self._connections:
+                for task in self._connections:
+                    task.cancel()
+                await asyncio.wait(list(self._connections), timeout=0.1)
+            # App threads reading a request body need the loop to see it end
+            await asyncio.to_thread(self.pool.shutdown, cancel_futures=True)
+    
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            async with self._slots:
+                self.active_connections += 1
+                sock = writer.get_extra_info('socket')
+                if sock is not None:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                try:
+                    while await self._serve_request(reader, writer):
+                        pass
+                except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError):
+                    pass
+                except Exception:
+                    traceback.print_exc()
+                finally:
+                    self.active_connections -= 1
+        except asyncio.CancelledError:
+            pass  # Shutting down
+        finally:
+            self._connections.discard(task)
+            writer.close()
+    
+    async def _serve_request(self, reader, writer):
+        """Read and answer one request, returns True to keep the connection"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keepalive_timeout)
+        except asyncio.IncompleteReadError:
+            return False
+        except asyncio.LimitOverrunError:
+            writer.write(simple_response('431 Request Header Fields Too Large'))
+            return False
         
-        # Card header
-        card_header = tk.Frame(add_file_card, bg=self.colors['bg_card'])
-        card_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        try:
+            method, target, version, headers = parse_request_head(head[:-4])
+            body = await self._open_body(reader, writer, headers)
+        except ValueError:
+            writer.write(simple_response('400 Bad Request'))
+            return False
         
-        card_title = tk.Label(
-            card_header,
-            text="🔥 Add File to Share",
-            font=("Segoe UI", 14, "bold"),
-            bg=self.colors['bg_card'],
-            fg=self.colors['text_primary']
+        keep_alive = wants_keep_alive(version, headers)
+        environ = build_wsgi_environ(
+            method, target, version, headers, body if body.remaining is not None else DechunkedInput(body),
+            (self.host, self.port), writer.get_extra_info('peername') or ('', 0)
         )
-        card_title.pack(anchor=tk.W)
-        
-        # File selection area
-        file_selection_frame = tk.Frame(add_file_card, bg=self.colors['bg_card'])
-        file_selection_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
-        
-        # File path input with modern styling
-        input_container = tk.Frame(file_selection_frame, bg=self.colors['bg_card'])
-        input_container.pack(fill=tk.X, pady=(0, 12))
+        offloaded = []
+        environ['burnbin.offload_file'] = offloaded.append
+        environ['burnbin.offload_events'] = offloaded.append
         
-        self.file_path_var = tk.StringVar()
-        file_entry = tk.Entry(
-            input_container,
-            textvariable=self.file_path_var,
-            font=("Segoe UI", 11),
-            state="readonly",
-            relief=tk.FLAT,
-            highlightbackground=self.colors['border'],
-            highlightthickness=1,
-            highlightcolor=self.colors['accent'],
-            bg='#1a1a1a',
-            fg=self.colors['text_primary'],
-            insertbackground=self.colors['text_primary']
+        # Build the response on the executor, Flask code may block on disk
+        status, response_headers, result, chunks, exhausted = await self.loop.run_in_executor(
+            self.pool, self._start_app, environ, offloaded
         )
-        file_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 12), ipady=10)
-        
-        # Modern browse button
-        browse_btn = tk.Button(
-            input_container,
-            text="🔥 Browse",
-            command=self.browse_file,
-            bg=self.colors['bg_button_primary'],
-            fg="white",
-            font=("Segoe UI", 10, "bold"),
-            padx=24,
-            pady=10,
-            relief=tk.FLAT,
-            cursor="hand2",
-            activebackground=self.colors['bg_button_primary_hover'],
-            activeforeground="white",
-            borderwidth=0
+        head_request = method == 'HEAD'
+        response_head, chunked, keep_alive = build_response_head(
+            version, status, response_headers, head_request, keep_alive
         )
-        browse_btn.pack(side=tk.RIGHT)
+        writer.write(response_head)
         
-        # Share button - prominent CTA
-        share_btn = tk.Button(
-            file_selection_frame,
-            text="🔥 Share File",
-            command=self.share_file,
-            bg=self.colors['bg_button_success'],
-            fg="white",
-            font=("Segoe UI", 12, "bold"),
-            padx=40,
-            pady=12,
-            relief=tk.FLAT,
-            cursor="hand2",
-            activebackground=self.colors['bg_button_success_hover'],
-            activeforeground="white",
-            borderwidth=0
-        )
-        share_btn.pack(fill=tk.X)
+        try:
+            if offloaded and not head_request:
+                if isinstance(offloaded[0], EventStream):
+                    await self._send_events(writer, offloaded[0], chunked)
+                else:
+                    await self._send_file(writer, offloaded[0])
+            elif not head_request:
+                while True:
+                    for data in chunks:
+                        if data:
+                            writer.write(b'%x\r\n%s\r\n' % (len(data), data) if chunked else data)
+                    await asyncio.wait_for(writer.drain(), self.io_timeout)
+                    if exhausted:
+                        break
+                    chunks, exhausted = await self.loop.run_in_executor(
+                        self.pool, self._pull_chunks, result
+                    )
+                if chunked:
+                    writer.write(b'0\r\n\r\n')
+            await asyncio.wait_for(writer.drain(), self.io_timeout)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
         
-        # Status section - Modern card with status indicators
-        status_card = tk.Frame(
-            self.share_tab,
-            bg=self.colors['bg_card'],
-            relief=tk.FLAT,
-            highlightbackground=self.colors['border'],
-            highlightthickness=1
-        )
-        status_card.pack(fill=tk.X)
+        # Discard whatever the app didn't read of the request body
+        if keep_alive and body.remaining != 0:
+            if body.remaining is None or body.remaining > self.max_drain:
+                return False
+            await body.discard()
+        return keep_alive
+    
+    async def _open_body(self, reader, writer, headers):
+        """wsgi.input for the request, bodies up to buffer_size already read"""
+        if headers.get('expect', '').lower() == '100-continue':
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            return _StreamInput(self.loop, reader, None, self.io_timeout)
+        length = int(headers.get('content-length') or 0)
+        if length < 0:
+            raise ValueError("negative Content-Length")
+        body = _StreamInput(self.loop, reader, length, self.io_timeout)
+        if length <= self.buffer_size:
+            await body.preload()
+        return body
+    
+    def _start_app(self, environ, offloaded):
+        state = {}
         
-        status_header = tk.Frame(status_card, bg=self.colors['bg_card'])
-        status_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        def start_response(status, response_headers, exc_info=None):
+            if exc_info:
+                exc_info = None
+            state['status'] = status
+            state['headers'] = response_headers
+            return lambda data: state.setdefault('written', []).append(data)
         
-        status_title = tk.Label(
-            status_header,
-            text="🔥 Connection Status",
-            font=("Segoe UI", 14, "bold"),
-            bg=self.colors['bg_card'],
-            fg=self.colors['text_primary']
-        )
-        status_title.pack(anchor=tk.W)
+        try:
+            result = self.app(environ, start_response)
+            if offloaded:
+                # The event loop streams this one, don't touch the iterable
+                return state['status'], state['headers'], result, [], True
+            chunks, exhausted = self._pull_chunks(result)
+            chunks = state.pop('written', []) + chunks
+        except Exception:
+            traceback.print_exc()
+            body = b'Internal Server Error'
+            return ('500 Internal Server Error',
+                    [('Content-Type', 'text/plain'), ('Content-Length', str(len(body)))],
+                    None, [body], True)
+        return state['status'], state['headers'], result, chunks, exhausted
+    
+    def _pull_chunks(self, result):
+        """Pull up to batch_size bytes from a WSGI iterable"""
+        if not hasattr(result, '__next__'):
+            result = iter(result)
+        chunks, size = [], 0
+        for data in result:
+            chunks.append(data)
+            size += len(data)
+            if size >= self.batch_size:
+                return chunks, False
+        return chunks, True
+    
+    async def _send_file(self, writer, stream):
+        """Stream a FileRangeStream's ranges from the event loop"""
+        stream.started = True
+        await writer.drain()
+        transport = writer.transport
+        with open(stream.file_path, 'rb') as f:
+            for part_header, start, end in stream.parts:
+                if part_header:
+                    writer.write(part_header)
+                    await writer.drain()
+                offset = start
+                while offset < end:
+                    count = min(stream.sendfile_slice, end - offset)
+                    if stream.throttle is not None:
+                        count = stream.throttle.clamp(count)
+                        delay = stream.throttle.reserve(count)
+                        if delay:
+                            await asyncio.sleep(delay)
+                    try:
+                        sent = await asyncio.wait_for(
+                            self.loop.sendfile(transport, f, offset, count), self.io_timeout
+                        )
+                    except RuntimeError:
+                        # sendfile refuses a transport the client already reset
+                        if not transport.is_closing():
+                            raise
+                        raise ConnectionError("client went away") from None
+                    if not sent:
+                        raise ConnectionError("client went away")
+                    offset += sent
+                    if stream.on_progress:
+                        stream.on_progress(sent)
+            if stream.closing:
+                writer.write(stream.closing)
+        stream.complete()
+    
+    async def _send_events(self, writer, stream, chunked):
+        """Relay an EventStream from the event loop, idle pages cost no thread"""
+        ready = asyncio.Event()
+        stream.waker = lambda: self.loop.call_soon_threadsafe(ready.set)
+        while True:
+            ready.clear()
+            data = stream.take()
+            if not data:
+                if stream.closed:
+                    break
+                try:
+                    await asyncio.wait_for(ready.wait(), stream.heartbeat)
+                    continue
+                except asyncio.TimeoutError:
+                    data = b': ping\n\n'
+            writer.write(b'%x\r\n%s\r\n' % (len(data), data) if chunked else data)
+            await asyncio.wait_for(writer.drain(), self.io_timeout)
+        if chunked:
+            writer.write(b'0\r\n\r\n')
+
+
+# Serving engines selectable with --engine
+SERVER_ENGINES = {
+    'pool': PooledWSGIServer,
+    'asyncio': AsyncioEngine,
+    'werkzeug': WerkzeugEngine,
+}
+
+class SessionStore:
+    """Bounded registry of download sessions
+    
+    Sessions expire ttl seconds after their last activity (a lookup or bytes
+    sent) and at most max_sessions are kept, evicting the least recently
+    used first, so clients can't grow memory without limit. Counts evicted
+    and aborted sessions for the stats endpoint.
+    """
+    def __init__(self, max_sessions=10000, ttl=3600, sweep_interval=30):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.sessions = OrderedDict()  # {session_id: session}, least recently used first
+        self.lock = threading.Lock()
+        self.last_sweep = time.monotonic()
+        self.evicted = 0
+        self.aborted = 0
+    
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+    
+    def __len__(self):
+        return len(self.sessions)
+    
+    def get(self, session_id):
+        """Look up a live session and mark it recently used, or None"""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            if time.monotonic() - session['last_active'] > self.ttl:
+                del self.sessions[session_id]
+                self.evicted += 1
+                return None
+            self.sessions.move_to_end(session_id)
+            session['last_active'] = time.monotonic()
+            return session
+    
+    def add(self, session_id, session):
+        session['last_active'] = time.monotonic()
+        with self.lock:
+            self.sessions[session_id] = session
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+                self.evicted += 1
+            if session['last_active'] - self.last_sweep > self.sweep_interval:
+                self._expire(session['last_active'])
+        return session
+    
+    def touch(self, session):
+        """Record activity without reordering, cheap enough for every chunk sent"""
+        session['last_active'] = time.monotonic()
+    
+    def mark_aborted(self, session):
+        session['status'] = 'aborted'
+        session['end_time'] = datetime.now()
+        with self.lock:
+            self.aborted += 1
+    
+    def _expire(self, now):
+        # Progress only refreshes last_active, so expired sessions can sit
+        # anywhere in the order and the whole table has to be checked
+        self.last_sweep = now
+        expired = [
+            session_id for session_id, session in self.sessions.items()
+            if now - session['last_active'] > self.ttl
+        ]
+        for session_id in expired:
+            del self.sessions[session_id]
+        self.evicted += len(expired)
+    
+    def stats(self):
+        with self.lock:
+            return {'live': len(self.sessions), 'evicted': self.evicted, 'aborted': self.aborted}
+
+class EventChannel:
+    """Fan-out of Server-Sent Events to the pages that are open
+    
+    Each event is encoded once and queued on every EventStream, or on one
+    stream for events only its page cares about (download progress). At
+    most max_streams pages are connected, the rest are told to poll.
+    """
+    def __init__(self, max_streams=256, backlog=256, retry=5000):
+        self.max_streams = max_streams
+        self.backlog = backlog
+        self.retry = retry  # Milliseconds browsers wait before reconnecting
+        self.streams = {}  # {stream_id: EventStream}
+        self.lock = threading.Lock()
+    
+    def encode(self, event, data):
+        return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode('utf-8')
+    
+    def subscribe(self, environ=None, snapshot=()):
+        """Open a stream that starts with snapshot [(event, data)], or None when full"""
+        with self.lock:
+            if len(self.streams) >= self.max_streams:
+                return None
+            stream_id = str(uuid.uuid4())
+            stream = EventStream(self, stream_id, self.backlog, environ)
+            self.streams[stream_id] = stream
+        stream.put(f"retry: {self.retry}\n\n".encode('ascii'))
+        stream.put(self.encode('hello', {'stream': stream_id}))
+        for event, data in snapshot:
+            stream.put(self.encode(event, data))
+        return stream
+    
+    def unsubscribe(self, stream):
+        with self.lock:
+            self.streams.pop(stream.stream_id, None)
+    
+    def publish(self, event, data):
+        """Send an event to every connected page"""
+        if not self.streams:
+            return
+        message = self.encode(event, data)
+        with self.lock:
+            streams = list(self.streams.values())
+        for stream in streams:
+            stream.put(message)
+    
+    def send(self, stream_id, event, data):
+        """Send an event to one page, returns False if it's gone"""
+        stream = self.streams.get(stream_id)
+        if stream is None:
+            return False
+        stream.put(self.encode(event, data))
+        return True
+    
+    def close(self):
+        with self.lock:
+            streams = list(self.streams.values())
+        for stream in streams:
+            stream.end()
+    
+    def stats(self):
+        return {'streams': len(self.streams), 'max_streams': self.max_streams}
+
+class TokenBucket:
+    """Byte rate limit shared by the downloads that book against it
+    
+    reserve() books bytes at the bucket's rate and returns how long to wait
+    before sending them (GCRA). Bookings line up behind each other, so
+    downloads sharing a bucket take turns slice by slice and split the rate
+    evenly. Unused time is not saved up beyond `burst`. A rate of 0 means
+    no limit.
+    """
+    burst = 0.1  # Seconds of traffic allowed ahead of the rate
+    
+    def __init__(self, rate=0):
+        self.rate = rate  # Bytes per second
+        self.ready = 0.0  # Monotonic time by which everything booked has gone out
+        self.lock = threading.Lock()
+    
+    def reserve(self, size):
+        rate = self.rate
+        if not rate:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            start = max(self.ready, now)
+            self.ready = start + size / rate
+        return max(0.0, start - now - self.burst)
+    
+    def idle(self, now):
+        return self.ready < now
+
+class Throttle:
+    """One download's view of the scheduler: the buckets it books against"""
+    def __init__(self, scheduler, buckets):
+        self.scheduler = scheduler
+        self.buckets = buckets
+    
+    def clamp(self, size):
+        """Largest piece to send at once, smaller while a limit applies"""
+        return min(size, self.scheduler.slice_size) if self.scheduler.limited() else size
+    
+    def reserve(self, size):
+        """Book size bytes in every bucket, returns seconds to wait"""
+        return max(bucket.reserve(size) for bucket in self.buckets)
+    
+    def pace(self, size):
+        """Book size bytes and wait for them (blocking senders)"""
+        delay = self.reserve(size)
+        if delay:
+            time.sleep(delay)
+
+class BandwidthScheduler:
+    """Global, per-client and per-share download rate limits
+    
+    Each download books its bytes against the global bucket, its client
+    IP's bucket and its share's bucket, and waits for the slowest. Rates
+    are bytes per second, 0 for no limit, and configure() applies to
+    downloads already running from their next slice on.
+    """
+    slice_size = 65536  # Bytes booked at a time while a limit applies
+    max_buckets = 4096  # Idle per-client/per-share buckets are dropped past this
+    
+    def __init__(self, rate=0, client_rate=0, share_rate=0):
+        self.total = TokenBucket(rate)
+        self.client_rate = client_rate
+        self.share_rate = share_rate
+        self.clients = {}  # {client_ip: TokenBucket}
+        self.shares = {}  # {file_id: TokenBucket}
+        self.lock = threading.Lock()
+    
+    def limited(self):
+        return bool(self.total.rate or self.client_rate or self.share_rate)
+    
+    def configure(self, rate=None, client_rate=None, share_rate=None):
+        """Change limits, None leaves one as it is"""
+        with self.lock:
+            if rate is not None:
+                self.total.rate = rate
+            if client_rate is not None:
+                self.client_rate = client_rate
+                for bucket in self.clients.values():
+                    bucket.rate = client_rate
+            if share_rate is not None:
+                self.share_rate = share_rate
+                for bucket in self.shares.values():
+                    bucket.rate = share_rate
+    
+    def limits(self):
+        return {'rate': self.total.rate, 'client_rate': self.client_rate, 'share_rate': self.share_rate}
+    
+    def _bucket(self, buckets, key, rate):
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= self.max_buckets:
+                now = time.monotonic()
+                for idle_key in [k for k, b in buckets.items() if b.idle(now)]:
+                    del buckets[idle_key]
+            bucket = buckets[key] = TokenBucket(rate)
+        return bucket
+    
+    def throttle(self, client_ip, file_id):
+        with self.lock:
+            return Throttle(self, (
+                self.total,
+                self._bucket(self.clients, client_ip, self.client_rate),
+                self._bucket(self.shares, file_id, self.share_rate)
+            ))
+
+class AdmissionControl:
+    """Limits how many downloads stream at once, in total and per file
+    
+    A download over a limit waits in a short FIFO queue. When a slot frees
+    up it goes to the first waiter whose files are all under their limit,
+    so one busy file doesn't hold up the rest. An archive of several files
+    takes one download slot and a slot of each of its files at once. A full queue, or a wait past
+    max_wait, turns the request away (503 with Retry-After). Limits of 0
+    mean none and can be changed while downloads run.
+    """
+    retry_after = 10  # Seconds refused clients are asked to wait
+    
+    def __init__(self, max_active=0, per_file=0, max_queued=32, max_wait=30):
+        self.max_active = max_active
+        self.per_file = per_file
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self.active = 0
+        self.active_files = {}  # {file key: downloads streaming}
+        self.waiting = []  # [(ticket, keys)] in arrival order
+        self.refused = 0
+        self.condition = threading.Condition()
+    
+    def _free(self, keys):
+        return ((not self.max_active or self.active < self.max_active)
+                and (not self.per_file or all(self.active_files.get(key, 0) < self.per_file for key in keys)))
+    
+    def _next(self):
+        """Ticket of the first waiter that could start now"""
+        for ticket, keys in self.waiting:
+            if self._free(keys):
+                return ticket
+        return None
+    
+    def _take(self, keys):
+        self.active += 1
+        for key in keys:
+            self.active_files[key] = self.active_files.get(key, 0) + 1
+        released = []
         
-        status_content = tk.Frame(status_card, bg=self.colors['bg_card'])
-        status_content.pack(fill=tk.X, padx=20, pady=(0, 20))
+        def release():
+            with self.condition:
+                if released:
+                    return
+                released.append(True)
+                self.active -= 1
+                for key in keys:
+                    if self.active_files[key] <= 1:
+                        del self.active_files[key]
+                    else:
+                        self.active_files[key] -= 1
+                self.condition.notify_all()
+        return release
+    
+    def acquire(self, keys, on_queued=None):
+        """Wait for a slot for the files keys, returns its release function or None when refused
         
-        self.status_label = tk.Label(
-            status_content,
-            text="⏳ Starting server...",
-            font=("Segoe UI", 11),
-            fg=self.colors['text_secondary'],
-            bg=self.colors['bg_card'],
-            anchor=tk.W
-        )
-        self.status_label.pack(fill=tk.X, pady=(0, 8))
+        All of the files' slots are taken together, or none. on_queued is
+        called with the 1-based queue position whenever it changes while
+        waiting.
+        """
+        keys = tuple(sorted(set(keys)))
+        with self.condition:
+            if self._next() is None and self._free(keys):
+                return self._take(keys)
+            if len(self.waiting) >= self.max_queued:
+                self.refused += 1
+                return None
+            ticket = object()
+            self.waiting.append((ticket, keys))
+            deadline = time.monotonic() + self.max_wait
+            position = None
+            try:
+                while self._next() is not ticket:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.refused += 1
+                        return None
+                    current = next(i for i, (t, _) in enumerate(self.waiting) if t is ticket) + 1
+                    if current != position and on_queued:
+                        position = current
+                        on_queued(position)
+                    self.condition.wait(remaining)
+                return self._take(keys)
+            finally:
+                self.waiting = [(t, k) for t, k in self.waiting if t is not ticket]
+                self.condition.notify_all()
+    
+    def configure(self, max_active=None, per_file=None):
+        with self.condition:
+            if max_active is not None:
+                self.max_active = max_active
+            if per_file is not None:
+                self.per_file = per_file
+            self.condition.notify_all()
+    
+    def stats(self):
+        with self.condition:
+            return {
+                'active': self.active,
+                'queued': len(self.waiting),
+                'refused': self.refused,
+                'max_active': self.max_active,
+                'per_file': self.per_file,
+                'max_queued': self.max_queued
+            }
+
+class Metrics:
+    """Counters and histograms behind /metrics, cheap enough to bump per chunk
+    
+    Each thread counts into its own shard, a plain dict only that thread
+    writes, so counting takes no lock. A scrape adds the shards up. Shards
+    of threads that have ended are folded into `retired` whenever the
+    shard count has doubled, so thread-per-connection engines don't grow
+    the list without bound. Series are keyed by (name, label values) and
+    every name is declared with define() first.
+    """
+    buckets = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # Seconds
+    
+    def __init__(self):
+        self.families = {}  # {name: (kind, description, label names)}
+        self.local = threading.local()
+        self.shards = []  # [(thread, shard)]
+        self.retired = {}  # Totals of shards whose threads ended
+        self.fold_at = 64
+        self.started = time.time()
+        self.lock = threading.Lock()
+    
+    def define(self, name, kind, description, labels=()):
+        self.families[name] = (kind, description, labels)
+    
+    def _shard(self):
+        try:
+            return self.local.shard
+        except AttributeError:
+            pass
+        shard = self.local.shard = {}
+        with self.lock:
+            self.shards.append((threading.current_thread(), shard))
+            if len(self.shards) >= self.fold_at:
+                self._fold()
+                self.fold_at = max(64, 2 * len(self.shards))
+        return shard
+    
+    def _fold(self):
+        live = []
+        for thread, shard in self.shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._merge(self.retired, shard)
+        self.shards = live
+    
+    def _merge(self, totals, shard):
+        for key, value in list(shard.items()):
+            if isinstance(value, list):
+                current = totals.get(key)
+                totals[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+            else:
+                totals[key] = totals.get(key, 0) + value
+    
+    def add(self, name, amount=1, labels=()):
+        """Increase a counter, labels being the values of its label names"""
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + amount
+    
+    def observe(self, name, value, labels=()):
+        """Count a value into a histogram"""
+        shard = self._shard()
+        key = (name, labels)
+        counts = shard.get(key)
+        if counts is None:
+            # One count per bucket, one for +Inf, then the sum
+            counts = shard[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+    
+    def totals(self):
+        with self.lock:
+            totals = {}
+            self._merge(totals, self.retired)
+            for _, shard in self.shards:
+                self._merge(totals, shard)
+        return totals
+    
+    def render(self):
+        """The declared series in the Prometheus text format, as a list of lines"""
+        series = {}
+        for (name, labels), value in self.totals().items():
+            series.setdefault(name, []).append((labels, value))
+        lines = []
+        for name, (kind, description, label_names) in self.families.items():
+            samples = []
+            for labels, value in sorted(series.get(name, ())):
+                pairs = tuple(zip(label_names, labels))
+                if kind != 'histogram':
+                    samples.append(('', pairs, value))
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), value):
+                    cumulative += count
+                    samples.append(('_bucket', pairs + (('le', bound),), cumulative))
+                samples.append(('_sum', pairs, value[-1]))
+                samples.append(('_count', pairs, cumulative))
+            lines.extend(metric_lines(name, kind, description, samples))
+        return lines
+    
+    def wrap(self, app):
+        """WSGI middleware counting requests by route and timing them
         
-        self.url_label = tk.Label(
-            status_content,
-            text="",
-            font=("Segoe UI", 10),
-            fg=self.colors['accent'],
-            bg=self.colors['bg_card'],
-            cursor="hand2",
-            anchor=tk.W
+        The time is measured until the response starts. The body is passed
+        on untouched, so engines still spot file bodies and send them with
+        sendfile; how long a transfer takes shows up in the byte counters.
+        The route comes from the environ, where the app's before_request
+        hook puts the matched rule.
+        """
+        methods = ('GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'OPTIONS')
+        
+        def timed(environ, start_response):
+            started = time.perf_counter()
+            status = []
+            
+            def start(status_line, headers, exc_info=None):
+                status.append(status_line[:3])
+                return start_response(status_line, headers, exc_info)
+            
+            body = app(environ, start)
+            route = environ.get('burnbin.route') or 'unmatched'
+            method = environ.get('REQUEST_METHOD')
+            self.add('burnbin_http_requests_total', 1,
+                     (route, method if method in methods else 'other', status[-1] if status else ''))
+            self.observe('burnbin_http_request_duration_seconds', time.perf_counter() - started, (route,))
+            return body
+        return timed
+
+class Profiler:
+    """Profiles the running server for a few seconds on demand
+    
+    'sample' mode snapshots every thread's stack 200 times a second: the
+    request workers, the GUI, the metadata writer and time spent waiting
+    on locks or the GIL. It writes collapsed stacks, one
+    "thread;frame;...;frame count" line per stack, for flamegraph.pl,
+    speedscope or inferno. 'cprofile' mode runs each request handler under
+    cProfile and writes a .pstats file with exact call counts. On Python
+    3.12+ only one handler can be under cProfile at a time, so requests
+    overlapping it are timed but not profiled.
+    
+    Both modes also write the requests served meanwhile, slowest first.
+    While no profile runs, the middleware costs one attribute check.
+    """
+    modes = ('sample', 'cprofile')
+    interval = 0.005  # Seconds between stack samples
+    max_seconds = 600
+    
+    def __init__(self, directory, on_saved=None):
+        self.directory = directory
+        self.on_saved = on_saved  # Called with the list of files written
+        self.running = None  # The profile being taken, a dict
+        self.last = None  # Status of the last finished profile
+        self.lock = threading.Lock()
+    
+    def start(self, mode='sample', seconds=30):
+        """Begin a profile in the background, returns False if one is already running"""
+        with self.lock:
+            if self.running is not None:
+                return False
+            self.running = {
+                'mode': mode,
+                'seconds': seconds,
+                'started': time.time(),
+                'stop': threading.Event(),
+                'requests': [],  # [(seconds, method, path, route)]
+                'stacks': {},  # {collapsed stack: samples}
+                'stats': None,  # pstats.Stats of the handlers profiled
+                'skipped': 0
+            }
+            run = self.running
+        threading.Thread(target=self._run, args=(run,), name='burnbin-profiler', daemon=True).start()
+        return True
+    
+    def stop(self):
+        """End the running profile early, it's saved as usual"""
+        run = self.running
+        if run is not None:
+            run['stop'].set()
+    
+    def status(self):
+        run = self.running
+        if run is None:
+            return {'running': False, 'last': self.last}
+        return {
+            'running': True,
+            'mode': run['mode'],
+            'remaining': max(0.0, round(run['started'] + run['seconds'] - time.time(), 1)),
+            'last': self.last
+        }
+    
+    def _run(self, run):
+        deadline = time.monotonic() + run['seconds']
+        if run['mode'] == 'sample':
+            me = threading.get_ident()
+            while time.monotonic() < deadline and not run['stop'].wait(self.interval):
+                self._sample(run['stacks'], me)
+        else:
+            run['stop'].wait(run['seconds'])
+        with self.lock:
+            self.running = None
+        paths = self._save(run)
+        self.last = {'mode': run['mode'], 'files': paths, 'requests': len(run['requests'])}
+        if self.on_saved:
+            self.on_saved(paths)
+    
+    def _sample(self, stacks, skip):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            # Pool threads are numbered, one tower per pool reads better
+            frames.append(names.get(ident, 'thread').rstrip('0123456789').rstrip('-_ ') or 'thread')
+            key = ';'.join(part.replace(';', ':') for part in reversed(frames))
+            stacks[key] = stacks.get(key, 0) + 1
+    
+    def wrap(self, app):
+        """WSGI middleware recording requests while a profile runs"""
+        def profiled(environ, start_response):
+            run = self.running
+            if run is None:
+                return app(environ, start_response)
+            started = time.perf_counter()
+            profile = None
+            if run['mode'] == 'cprofile':
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # 3.12+: another handler holds the profiler
+                    profile = None
+                    run['skipped'] += 1
+            try:
+                return app(environ, start_response)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    with self.lock:
+                        if run['stats'] is None:
+                            run['stats'] = pstats.Stats(profile)
+                        else:
+                            run['stats'].add(profile)
+                run['requests'].append((
+                    time.perf_counter() - started,
+                    environ.get('REQUEST_METHOD'),
+                    environ.get('PATH_INFO'),
+                    environ.get('burnbin.route')
+                ))
+        return profiled
+    
+    def _save(self, run):
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(
+            self.directory, f"{datetime.fromtimestamp(run['started']).strftime('%Y%m%d-%H%M%S')}-{run['mode']}"
         )
-        self.url_label.bind("<Button-1>", lambda e: self.open_url())
-        self.url_label.bind("<Enter>", lambda e: self.url_label.config(fg=self.colors['bg_button_primary_hover']))
-        self.url_label.bind("<Leave>", lambda e: self.url_label.config(fg=self.colors['accent']))
+        paths = []
+        if run['mode'] == 'sample':
+            with open(f"{prefix}-stacks.txt", 'w', encoding='utf-8') as f:
+                for stack, count in sorted(run['stacks'].items()):
+                    f.write(f"{stack} {count}\n")
+            paths.append(f"{prefix}-stacks.txt")
+        elif run['stats'] is not None:
+            run['stats'].dump_stats(f"{prefix}.pstats")
+            paths.append(f"{prefix}.pstats")
         
-        # Install cloudflared button (initially hidden)
-        self.install_cloudflared_btn = tk.Button(
-            status_content,
-            text="🔥 Install Cloudflared",
-            command=self.install_cloudflared,
-            bg=self.colors['bg_button_primary'],
-            fg="white",
-            font=("Segoe UI", 10, "bold"),
-            padx=20,
-            pady=8,
-            relief=tk.FLAT,
-            cursor="hand2",
-            activebackground=self.colors['bg_button_primary_hover'],
-            activeforeground="white",
-            borderwidth=0
+        requests = sorted(run['requests'], key=lambda entry: entry[0], reverse=True)
+        routes = {}
+        for seconds, method, _, route in requests:
+            total = routes.setdefault(f"{method} {route or 'unmatched'}", [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += seconds
+            total[2] = max(total[2], seconds)
+        with open(f"{prefix}-requests.txt", 'w', encoding='utf-8') as f:
+            f.write(f"{len(requests)} requests in {run['seconds']}s ({run['mode']} profile")
+            f.write(f", {run['skipped']} not profiled)\n\n" if run['skipped'] else ")\n\n")
+            f.write(f"{'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}  route\n")
+            for name, (count, total, longest) in sorted(routes.items(), key=lambda item: -item[1][1]):
+                f.write(f"{count:>7} {total * 1000:>10.1f} {total / count * 1000:>9.2f} {longest * 1000:>9.2f}  {name}\n")
+            f.write("\nSlowest requests (time until the response started)\n")
+            for seconds, method, path, _ in requests[:100]:
+                f.write(f"{seconds * 1000:>9.2f} ms  {method} {path}\n")
+        paths.append(f"{prefix}-requests.txt")
+        return paths
+
+class MultipartReader:
+    """Incremental multipart/form-data parser over a request body stream
+    
+    Iterating yields (params, chunks) for each part: the Content-Disposition
+    parameters and a generator of the part's bytes. Nothing is buffered
+    beyond one read, so a file part can be written straight to its final
+    place. Parts the caller doesn't consume are skipped. Raises ValueError
+    on a malformed or truncated body.
+    """
+    read_size = 256 * 1024
+    max_header_size = 16384
+    
+    def __init__(self, stream, boundary):
+        self.stream = stream
+        self.delimiter = b'\r\n--' + boundary.encode('latin-1')
+        # The first delimiter has no CRLF in front of it, pretend it does
+        self.buffer = bytearray(b'\r\n')
+    
+    def _fill(self):
+        data = self.stream.read(self.read_size)
+        if not data:
+            return False
+        self.buffer += data
+        return True
+    
+    def _part_data(self):
+        """Yield bytes up to the next delimiter and consume it"""
+        buffer = self.buffer
+        keep = len(self.delimiter) - 1  # A delimiter may straddle two reads
+        while True:
+            index = buffer.find(self.delimiter)
+            if index >= 0:
+                if index:
+                    yield bytes(buffer[:index])
+                del buffer[:index + len(self.delimiter)]
+                return
+            if len(buffer) > keep:
+                yield bytes(buffer[:-keep])
+                del buffer[:-keep]
+            if not self._fill():
+                raise ValueError("multipart body ended early")
+    
+    def _read_headers(self):
+        buffer = self.buffer
+        while True:
+            if buffer.startswith(b'\r\n'):
+                del buffer[:2]
+                return {}
+            end = buffer.find(b'\r\n\r\n')
+            if end >= 0:
+                break
+            if len(buffer) > self.max_header_size:
+                raise ValueError("multipart headers too large")
+            if not self._fill():
+                raise ValueError("multipart body ended early")
+        headers = {}
+        for line in buffer[:end].decode('utf-8', 'replace').split('\r\n'):
+            name, sep, value = line.partition(':')
+            if not sep:
+                raise ValueError("malformed multipart header")
+            headers[name.strip().lower()] = value.strip()
+        del buffer[:end + 4]
+        return headers
+    
+    def __iter__(self):
+        # Skip the preamble
+        for _ in self._part_data():
+            pass
+        while True:
+            # After a delimiter, '--' ends the body and CRLF starts a part
+            while len(self.buffer) < 2:
+                if not self._fill():
+                    raise ValueError("multipart body ended early")
+            if self.buffer.startswith(b'--'):
+                return
+            if not self.buffer.startswith(b'\r\n'):
+                raise ValueError("malformed multipart delimiter")
+            del self.buffer[:2]
+            
+            headers = self._read_headers()
+            params = parse_options_header(headers.get('content-disposition', ''))[1]
+            chunks = self._part_data()
+            yield params, chunks
+            for _ in chunks:
+                pass
+
+class BlobStore:
+    """Content-addressed upload storage, one file per SHA-256 digest
+    
+    Uploaded files point at blobs under uploads/blobs and the same bytes
+    uploaded again share the existing blob. Blobs are reference counted
+    by path, so uploads stored before the blob store (uploads/<id>_<name>)
+    are simply blobs with a single reference. A blob is deleted when its
+    last reference is released.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.refs = {}  # {path: number of uploaded files pointing at it}
+        self.lock = threading.Lock()
+    
+    def path(self, digest):
+        return os.path.join(self.directory, digest)
+    
+    def add(self, temp_path, digest):
+        """Move a freshly written file into the store and take a reference, returns the blob path
+        
+        If the blob already exists the new copy is deleted instead.
+        """
+        path = self.path(digest)
+        with self.lock:
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+            self.refs[path] = self.refs.get(path, 0) + 1
+        return path
+    
+    def ref(self, path):
+        """Count a reference to an existing file (registries loaded at startup)"""
+        with self.lock:
+            self.refs[path] = self.refs.get(path, 0) + 1
+    
+    def release(self, path):
+        """Drop a reference, deleting the file with the last one (raises OSError on failure)"""
+        with self.lock:
+            count = self.refs.get(path, 1)
+            if count <= 1:
+                if os.path.exists(path):
+                    os.remove(path)
+                self.refs.pop(path, None)
+            else:
+                self.refs[path] = count - 1
+    
+    def forget(self, path):
+        """Drop a reference to a file that is already gone"""
+        with self.lock:
+            count = self.refs.get(path, 1)
+            if count <= 1:
+                self.refs.pop(path, None)
+            else:
+                self.refs[path] = count - 1
+    
+    def digest(self, path):
+        """SHA-256 of a file on disk"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(1024 * 1024)
+                if not data:
+                    return digest.hexdigest()
+                digest.update(data)
+    
+    def stats(self):
+        with self.lock:
+            return {'blobs': len(self.refs), 'references': sum(self.refs.values())}
+
+class VariantCache:
+    """Compressed copies of shared files on disk, least recently used out first
+    
+    Entries are named after a hash of path, size, mtime and coding, so an
+    edited file simply misses and its stale copies age out. Only one
+    request writes a given entry at a time, the others compress without
+    caching. Hits bump the mtime, which is what eviction goes by.
+    """
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.writing = set()  # Keys being written
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            try:
+                if name.endswith('.part'):
+                    os.remove(path)  # Left behind by a crash
+                else:
+                    self.size += os.path.getsize(path)
+            except OSError:
+                pass
+    
+    def key(self, file_path, stat, coding):
+        source = f"{os.path.abspath(file_path)}\0{stat.st_size}\0{stat.st_mtime_ns}\0{coding}"
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+    
+    def path(self, key):
+        return os.path.join(self.directory, key)
+    
+    def lookup(self, key):
+        """Path of a cached entry, None on a miss"""
+        path = self.path(key)
+        try:
+            os.utime(path)  # Most recently used
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return path
+    
+    def reserve(self, key):
+        """Temp path to write a new entry to, None if another request already is"""
+        with self.lock:
+            if key in self.writing:
+                return None
+            self.writing.add(key)
+        return self.path(key) + '.part'
+    
+    def commit(self, key, temp_path):
+        """Publish a completely written entry and evict past max_bytes"""
+        try:
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            self.discard(key, temp_path)
+            return
+        with self.lock:
+            self.writing.discard(key)
+            self.size += size
+        self.trim()
+    
+    def discard(self, key, temp_path):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        with self.lock:
+            self.writing.discard(key)
+    
+    def trim(self):
+        with self.lock:
+            if self.size <= self.max_bytes:
+                return
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith('.part'):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            for _, size, path in entries:
+                if self.size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue  # Still being sent on Windows
+                self.size -= size
+    
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'bytes': self.size}
+
+class ResumableUploads:
+    """Uploads sent as chunks at byte offsets, so a dropped connection only costs the chunks in flight
+    
+    Each upload is preallocated as uploads/<id>_<name>.part and chunks are
+    written in place, in any order and in parallel. Once complete the part
+    file is handed over to the blob store. Received byte ranges
+    are merged as they land. An upload idle for ttl seconds is abandoned
+    and its part file deleted.
+    
+    Preallocation claims disk space before any data arrives, so each
+    client IP may only have max_per_client uploads open, and an upload
+    that would leave less than min_free bytes on the disk is refused.
+    """
+    chunk_size = 8 * 1024 * 1024  # Suggested to clients, well under Cloudflare's body limit
+    max_chunk = 64 * 1024 * 1024
+    max_per_client = 4  # Open uploads per client IP
+    min_free = 1024 * 1024 * 1024  # Disk space an upload may not reserve
+    
+    def __init__(self, directory, ttl=86400, sweep_interval=300):
+        self.directory = directory
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.uploads = {}  # {upload_id: upload}
+        self.allocating = 0  # Bytes being preallocated right now, not yet off the free space
+        self.lock = threading.Lock()
+        self.last_sweep = time.monotonic()
+        self.started = time.time()
+    
+    def create(self, name, size, client_ip):
+        """Start an upload and preallocate its file
+        
+        Raises ValueError when the client has too many uploads open and
+        OSError when the disk can't spare the space.
+        """
+        self.expire()
+        upload_id = str(uuid.uuid4())
+        part_path = os.path.join(self.directory, f"{upload_id}_{name}.part")
+        upload = {
+            'id': upload_id,
+            'name': name,
+            'size': size,
+            'part_path': part_path,
+            'client_ip': client_ip,
+            'ranges': [],  # Merged [start, end) byte ranges received so far
+            'lock': threading.Lock(),
+            'last_active': time.monotonic()
+        }
+        with self.lock:
+            if sum(1 for other in self.uploads.values() if other['client_ip'] == client_ip) >= self.max_per_client:
+                raise ValueError("too many uploads in progress")
+            if shutil.disk_usage(self.directory).free - self.allocating - size < self.min_free:
+                raise OSError(errno.ENOSPC, "the disk would be left almost full")
+            self.allocating += size
+            self.uploads[upload_id] = upload  # Counts against the client while allocating
+        try:
+            with open(part_path, 'wb') as f:
+                try:
+                    if hasattr(os, 'posix_fallocate') and size:
+                        os.posix_fallocate(f.fileno(), 0, size)
+                    else:
+                        f.truncate(size)
+                except OSError:
+                    f.close()
+                    os.remove(part_path)
+                    raise
+        except OSError:
+            with self.lock:
+                del self.uploads[upload_id]
+            raise
+        finally:
+            with self.lock:
+                self.allocating -= size
+        return upload
+    
+    def get(self, upload_id):
+        self.expire()
+        return self.uploads.get(upload_id)
+    
+    def write(self, upload, offset, stream, length):
+        """Write length bytes from stream at offset, returns how many arrived
+        
+        Whatever arrived before the client went away still counts, a retry
+        only needs the rest. Raises ValueError for a chunk outside the file.
+        """
+        if offset < 0 or length < 0 or length > self.max_chunk or offset + length > upload['size']:
+            raise ValueError("chunk outside the upload")
+        written = 0
+        try:
+            with open(upload['part_path'], 'r+b') as f:
+                f.seek(offset)
+                while written < length:
+                    data = stream.read(min(length - written, 1024 * 1024))
+                    if not data:
+                        break
+                    f.write(data)
+                    written += len(data)
+        finally:
+            if written:
+                self.add_range(upload, offset, offset + written)
+        return written
+    
+    def add_range(self, upload, start, end):
+        with upload['lock']:
+            ranges = []
+            for range_start, range_end in upload['ranges']:
+                if range_end < start or range_start > end:
+                    ranges.append((range_start, range_end))
+                else:
+                    start, end = min(start, range_start), max(end, range_end)
+            ranges.append((start, end))
+            ranges.sort()
+            upload['ranges'] = ranges
+            upload['last_active'] = time.monotonic()
+    
+    def missing(self, upload):
+        """Byte ranges the client still has to send, [[start, end]]"""
+        gaps, position = [], 0
+        with upload['lock']:
+            for start, end in upload['ranges']:
+                if start > position:
+                    gaps.append([position, start])
+                position = end
+        if position < upload['size']:
+            gaps.append([position, upload['size']])
+        return gaps
+    
+    def status(self, upload):
+        missing = self.missing(upload)
+        return {
+            'upload_id': upload['id'],
+            'name': upload['name'],
+            'size': upload['size'],
+            'received': upload['size'] - sum(end - start for start, end in missing),
+            'missing': missing,
+            'chunk_size': self.chunk_size
+        }
+    
+    def finish(self, upload):
+        """Stop tracking a complete upload, its part file is the caller's from here"""
+        with self.lock:
+            if self.uploads.pop(upload['id'], None) is None:
+                raise KeyError(upload['id'])
+    
+    def expire(self):
+        now = time.monotonic()
+        if now - self.last_sweep < self.sweep_interval:
+            return
+        with self.lock:
+            self.last_sweep = now
+            expired = [
+                upload for upload in self.uploads.values()
+                if now - upload['last_active'] > self.ttl
+            ]
+            for upload in expired:
+                del self.uploads[upload['id']]
+        for upload in expired:
+            try:
+                os.remove(upload['part_path'])
+            except OSError:
+                pass
+    
+    def remove_orphans(self):
+        """Delete part files left behind by a previous run"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        live = {os.path.basename(upload['part_path']) for upload in list(self.uploads.values())}
+        for name in names:
+            if name.endswith('.part') and name not in live:
+                path = os.path.join(self.directory, name)
+                try:
+                    # Uploads started since we came up are still being written
+                    if os.path.getmtime(path) < self.started:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+class MetadataStore:
+    """SQLite (WAL) store for shares, uploads and download history
+    
+    Shares and uploads are written through as soon as they change. Download
+    counter bumps and session history are write-behind: they are coalesced
+    in memory and applied in one transaction by a background thread, at
+    most flush_interval seconds later or as soon as max_pending changes pile
+    up. A crash loses at most that window. A failed flush puts its changes
+    back in the queue for the next one.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS shares (
+            id TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            upload_time TEXT NOT NULL,
+            downloads INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS shares_name ON shares (name);
+        CREATE INDEX IF NOT EXISTS shares_upload_time ON shares (upload_time);
+        CREATE TABLE IF NOT EXISTS uploads (
+            id TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            upload_time TEXT NOT NULL,
+            uploader_ip TEXT
+        );
+        CREATE INDEX IF NOT EXISTS uploads_name ON uploads (name);
+        CREATE INDEX IF NOT EXISTS uploads_upload_time ON uploads (upload_time);
+        CREATE TABLE IF NOT EXISTS downloads (
+            session_id TEXT PRIMARY KEY,
+            file_id TEXT NOT NULL,
+            client_ip TEXT,
+            start_time TEXT NOT NULL,
+            end_time TEXT,
+            bytes_sent INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS downloads_file_id ON downloads (file_id);
+        CREATE INDEX IF NOT EXISTS downloads_start_time ON downloads (start_time);
+    """
+    
+    def __init__(self, db_path, flush_interval=1.0, max_pending=256, on_error=None):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.on_error = on_error
+        
+        # One connection shared by all threads, serialized by db_lock
+        self.db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, safe against corruption
+        self.db.executescript(self.SCHEMA)
+        self.db_lock = threading.Lock()
+        
+        self.lock = threading.Lock()
+        self.pending_downloads = {}  # {file_id: count} coalesced counter bumps
+        self.pending_sessions = {}  # {session_id: row} latest state of each download
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.running = False
+    
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def close(self):
+        """Flush pending changes, checkpoint the WAL and close the database"""
+        self.running = False
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        with self.db_lock:
+            try:
+                self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                self.db.close()
+    
+    def _write(self, statements):
+        """Run (sql, params) pairs in one transaction"""
+        with self.db_lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        self.db.executemany(sql, params)
+                    else:
+                        self.db.execute(sql, params)
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+    
+    def _query(self, sql, params=()):
+        with self.db_lock:
+            return self.db.execute(sql, params).fetchall()
+    
+    def put_share(self, file_id, path, name, size, upload_time, downloads=0):
+        self._write([(
+            "INSERT OR REPLACE INTO shares (id, path, name, size, upload_time, downloads) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (file_id, path, name, size, upload_time, downloads)
+        )])
+    
+    def remove_shares(self, file_ids):
+        with self.lock:
+            for file_id in file_ids:
+                self.pending_downloads.pop(file_id, None)
+        self._write([("DELETE FROM shares WHERE id = ?", [(file_id,) for file_id in file_ids])])
+    
+    def put_upload(self, file_id, path, name, size, upload_time, uploader_ip):
+        self._write([(
+            "INSERT OR REPLACE INTO uploads (id, path, name, size, upload_time, uploader_ip) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (file_id, path, name, size, upload_time, uploader_ip)
+        )])
+    
+    def remove_uploads(self, file_ids):
+        self._write([("DELETE FROM uploads WHERE id = ?", [(file_id,) for file_id in file_ids])])
+    
+    def update_sizes(self, table, sizes):
+        """Store new byte sizes, sizes is a list of (size, id)"""
+        self._write([(f"UPDATE {table} SET size = ? WHERE id = ?", sizes)])
+    
+    def record_download(self, file_id):
+        with self.lock:
+            self.pending_downloads[file_id] = self.pending_downloads.get(file_id, 0) + 1
+        self._maybe_wake()
+    
+    def record_session(self, session_id, session):
+        """Queue the current state of a download session for the history table"""
+        row = (
+            session_id,
+            session['file_id'],
+            session.get('client_ip'),
+            session['start_time'].strftime("%Y-%m-%d %H:%M:%S"),
+            session['end_time'].strftime("%Y-%m-%d %H:%M:%S") if session.get('end_time') else None,
+            session.get('bytes_sent', 0),
+            session['status']
         )
-        # Don't pack initially - will be shown when needed
+        with self.lock:
+            self.pending_sessions[session_id] = row
+        self._maybe_wake()
+    
+    def _maybe_wake(self):
+        if len(self.pending_downloads) + len(self.pending_sessions) >= self.max_pending:
+            self.wakeup.set()
+    
+    def _run(self):
+        while self.running:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+    
+    def flush(self):
+        """Apply queued counter bumps and session history in one transaction"""
+        with self.lock:
+            downloads = [(count, file_id) for file_id, count in self.pending_downloads.items()]
+            sessions = list(self.pending_sessions.values())
+            self.pending_downloads = {}
+            self.pending_sessions = {}
+        if not downloads and not sessions:
+            return
         
+        try:
+            self._write([
+                ("UPDATE shares SET downloads = downloads + ? WHERE id = ?", downloads),
+                (
+                    "INSERT INTO downloads (session_id, file_id, client_ip, start_time, end_time, bytes_sent, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (session_id) DO UPDATE SET start_time = excluded.start_time, "
+                    "end_time = excluded.end_time, bytes_sent = excluded.bytes_sent, status = excluded.status",
+                    sessions
+                )
+            ])
+        except Exception as e:
+            # Put the batch back, behind anything newer that came in meanwhile
+            with self.lock:
+                for count, file_id in downloads:
+                    self.pending_downloads[file_id] = self.pending_downloads.get(file_id, 0) + count
+                for row in sessions:
+                    self.pending_sessions.setdefault(row[0], row)
+            if self.on_error:
+                self.on_error(f"Error writing download counts and history to the database, will retry: {str(e)}")
     
-    def setup_files_tab(self):
-        """Setup the Files tab with shared files list"""
-        # Shared files section - Modern card
-        files_card = tk.Frame(
-            self.files_tab,
-            bg=self.colors['bg_card'],
-            relief=tk.FLAT,
-            highlightbackground=self.colors['border'],
-            highlightthickness=1
+    def shares(self):
+        """All shares in creation order as (id, path, name, size, upload_time, downloads)"""
+        return self._query(
+            "SELECT id, path, name, size, upload_time, downloads FROM shares ORDER BY rowid"
         )
-        files_card.pack(fill=tk.BOTH, expand=True)
+    
+    def uploads(self):
+        """All uploads in creation order as (id, path, name, size, upload_time, uploader_ip)"""
+        return self._query(
+            "SELECT id, path, name, size, upload_time, uploader_ip FROM uploads ORDER BY rowid"
+        )
+    
+    def find_shares(self, name):
+        """IDs of shares with exactly this file name"""
+        return [row[0] for row in self._query("SELECT id FROM shares WHERE name = ?", (name,))]
+    
+    def download_history(self, file_id, limit=100):
+        """Most recent download sessions of a share, newest first"""
+        return self._query(
+            "SELECT session_id, client_ip, start_time, end_time, bytes_sent, status FROM downloads "
+            "WHERE file_id = ? ORDER BY start_time DESC LIMIT ?",
+            (file_id, limit)
+        )
+    
+    def import_json(self, snapshot_path):
+        """One-time import of shared_files.json (and its journal) from older versions"""
+        data = {}
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        journal_path = os.path.splitext(snapshot_path)[0] + '.journal'
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash, nothing valid follows it
+                        break
+                    if record['op'] == 'share':
+                        data[record['id']] = record['entry']
+                    elif record['op'] == 'remove':
+                        data.pop(record['id'], None)
+                    elif record['op'] == 'downloads' and record['id'] in data:
+                        entry = data[record['id']]
+                        entry['downloads'] = entry.get('downloads', 0) + record['add']
         
-        files_header = tk.Frame(files_card, bg=self.colors['bg_card'])
-        files_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        self._write([(
+            "INSERT OR IGNORE INTO shares (id, path, name, size, upload_time, downloads) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    file_id,
+                    entry['path'],
+                    entry['name'],
+                    os.path.getsize(entry['path']) if os.path.exists(entry['path']) else 0,
+                    entry.get('upload_time', datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                    entry.get('downloads', 0)
+                )
+                for file_id, entry in data.items()
+            ]
+        )])
         
-        files_title = tk.Label(
-            files_header,
-            text="🔥 Shared Files",
-            font=("Segoe UI", 14, "bold"),
-            bg=self.colors['bg_card'],
-            fg=self.colors['text_primary']
+        # Keep the old file around, but never import it twice
+        if os.path.exists(snapshot_path):
+            os.replace(snapshot_path, snapshot_path + '.migrated')
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        return len(data)
+
+class ActivityLog:
+    """Activity history: recent lines in memory, everything in rotating JSONL files
+    
+    recent is a ring buffer of the last max_recent formatted lines, enough
+    to redraw any view. Every message is also appended to activity.jsonl
+    as {"time", "message"}. Past max_bytes the file rotates to
+    activity.jsonl.1 and so on, keeping `backups` old files, so the
+    history on disk stays bounded too.
+    """
+    def __init__(self, path, max_recent=1000, max_bytes=5 * 1024 * 1024, backups=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.recent = deque(maxlen=max_recent)
+        self.lock = threading.Lock()
+        self.file = None
+        self.size = 0
+    
+    def append(self, when, message, line):
+        record = json.dumps(
+            {'time': when.isoformat(timespec='seconds'), 'message': message},
+            separators=(',', ':'), ensure_ascii=False
         )
-        files_title.pack(side=tk.LEFT)
+        data = (record + '\n').encode('utf-8')
+        with self.lock:
+            self.recent.append(line)
+            try:
+                if self.file is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self.file = open(self.path, 'ab')
+                    self.size = self.file.tell()
+                if self.size and self.size + len(data) > self.max_bytes:
+                    self._rotate()
+                self.file.write(data)
+                self.file.flush()
+                self.size += len(data)
+            except OSError:
+                # History on disk is best effort, logging must never fail a request
+                pass
+    
+    def _rotate(self):
+        self.file.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        self.file = open(self.path, 'wb')
+        self.size = 0
+    
+    def lines(self):
+        with self.lock:
+            return list(self.recent)
+    
+    def files(self):
+        """Log files from oldest to newest"""
+        paths = [f"{self.path}.{index}" for index in range(self.backups, 0, -1)] + [self.path]
+        return [path for path in paths if os.path.exists(path)]
+    
+    def search(self, text=None, since=None, until=None, limit=500):
+        """The newest records matching every filter given, oldest first
         
-        # Treeview container
-        tree_container = tk.Frame(files_card, bg=self.colors['bg_card'])
-        tree_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 15))
+        text is a substring of the message (ASCII letters match in any
+        case), since/until are datetimes. Lines that can't contain the
+        text are skipped on their raw bytes, the rest are decoded and
+        matched on the message alone.
+        """
+        needle = text.encode('utf-8').lower() if text else None
+        # JSON writes the needle as is unless it has characters it escapes
+        prefilter = needle and not any(byte < 0x20 or byte in b'"\\' for byte in needle)
+        since = since.isoformat(timespec='seconds') if since else None
+        until = until.isoformat(timespec='seconds') if until else None
+        matches = deque(maxlen=limit)
+        for path in self.files():
+            try:
+                with open(path, 'rb') as f:
+                    for raw in f:
+                        if since or until:
+                            # Records start with {"time":"<19 characters>"
+                            stamp = raw[9:28].decode('ascii', 'replace')
+                            if (since and stamp < since) or (until and stamp > until):
+                                continue
+                        if prefilter and needle not in raw.lower():
+                            continue
+                        try:
+                            entry = json.loads(raw)
+                        except ValueError:
+                            continue  # A line cut short by a crash
+                        if needle and needle not in entry['message'].encode('utf-8').lower():
+                            continue
+                        matches.append(entry)
+            except OSError:
+                continue
+        return list(matches)
+    
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+class BurnBinServer:
+    """GUI-free serving core: Flask routes, file registries and the tunnel"""
+    tunnel_states = ('idle', 'checking', 'missing', 'starting', 'active', 'failed')
+    stop_timeout = 5  # Seconds stop() waits for the engine to finish
+    loopback_addrs = ('127.0.0.1', '::1')  # Where cloudflared and local tools connect from
+    
+    def __init__(self, base_path=None, local_port=5000, engine='pool', engine_options=None,
+                 max_upload_size=None, compress_downloads=False, bandwidth_limits=None,
+                 download_limits=None, public_metrics=False):
+        # Initialize Flask app, requests are counted and timed for /metrics
+        # and the profiler once base_path is known
+        self.flask_app = Flask(__name__)
+        self.metrics = Metrics()
+        self.public_metrics = public_metrics  # Serve /metrics beyond this machine
+        self.define_metrics()
+        self.setup_flask_routes()
         
-        # Configure modern treeview style
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("Treeview",
-                       background=self.colors['bg_card'],
-                       foreground=self.colors['text_primary'],
-                       fieldbackground=self.colors['bg_card'],
-                       borderwidth=0,
-                       font=("Segoe UI", 10))
-        style.configure("Treeview.Heading",
-                       background='#2d2d2d',
-                       foreground=self.colors['text_primary'],
-                       font=("Segoe UI", 10, "bold"),
-                       relief=tk.FLAT)
-        style.map("Treeview",
-                 background=[('selected', self.colors['accent'])],
-                 foreground=[('selected', 'white')])
+        # Storage for shared files
+        self.shared_files = {}  # {file_id: {path, name, size, upload_time, downloads}}
+        self.download_sessions = SessionStore()  # {session_id: {file_id, start_time, progress, status}}
+        self.uploaded_files = {}  # {file_id: {path, name, size, upload_time, uploader_ip}}
         
-        # Treeview for files
-        columns = ("File Name", "Size", "Status", "Downloads", "Link")
-        self.files_tree = ttk.Treeview(tree_container, columns=columns, show="tree headings", height=15)
-        self.files_tree.heading("#0", text="")
-        self.files_tree.column("#0", width=20)
+        # Activity listeners, called with each formatted log line
+        self.log_listeners = []
+        # Change listeners, called with ('files' | 'uploads', None) when a registry
+        # changes and ('download', file_id) when a download count does
+        self.change_listeners = []
         
-        for col in columns:
-            self.files_tree.heading(col, text=col)
-            if col == "File Name":
-                self.files_tree.column(col, width=300)
-            elif col == "Size":
-                self.files_tree.column(col, width=120)
-            elif col == "Status":
-                self.files_tree.column(col, width=140)
-            elif col == "Downloads":
-                self.files_tree.column(col, width=100)
+        # Push channel for open pages (file list and download progress)
+        self.events = EventChannel()
+        self.files_timer = None
+        self.files_lock = threading.Lock()
+        self.files_debounce = 0.2  # Seconds to gather a burst of changes into one event
+        self.progress_interval = 0.25  # Seconds between progress events per download
+        
+        # Download rate limits: rate, client_rate, share_rate in bytes/s (0 = none)
+        self.bandwidth = BandwidthScheduler(**(bandwidth_limits or {}))
+        # Concurrent download limits: max_active, per_file, max_queued, max_wait
+        self.admission = AdmissionControl(**(download_limits or {}))
+        
+        # Change counters behind the ETags of the JSON listings
+        self.boot_id = uuid.uuid4().hex[:8]  # Counters restart with us, keep old ETags from matching
+        self.files_version = 0
+        self.uploads_version = 0
+        self.json_cache = {}  # {name: (version, variants)}
+        
+        # Create uploads directory
+        if base_path is None:
+            # When running as PyInstaller executable, use directory next to exe
+            if getattr(sys, 'frozen', False):
+                # Running as compiled executable
+                base_path = os.path.dirname(sys.executable)
             else:
-                self.files_tree.column(col, width=280)
+                # Running as script
+                base_path = os.getcwd()
+        self.base_path = base_path
+        self.activity = ActivityLog(os.path.join(base_path, "logs", "activity.jsonl"))
+        self.uploads_dir = os.path.join(base_path, "uploads")
+        os.makedirs(self.uploads_dir, exist_ok=True)
+        self.resumable = ResumableUploads(self.uploads_dir)
+        self.blobs = BlobStore(os.path.join(self.uploads_dir, "blobs"))
+        self.profiler = Profiler(os.path.join(base_path, "profiles"), on_saved=self.profile_saved)
+        self.flask_app.wsgi_app = self.metrics.wrap(self.profiler.wrap(self.flask_app.wsgi_app))
+        self.max_upload_size = max_upload_size  # Bytes, None for no limit
         
-        scrollbar = ttk.Scrollbar(tree_container, orient=tk.VERTICAL, command=self.files_tree.yview)
-        self.files_tree.configure(yscrollcommand=scrollbar.set)
+        # Compressed downloads (opt-in): text-like files are encoded in a
+        # worker pool and the results kept in cache/compressed
+        self.compress_downloads = compress_downloads
+        self.compress_min_size = 4096  # Bytes, smaller files go out as they are
+        self.compress_pool = None
+        self.variants = None
+        if compress_downloads:
+            self.compress_pool = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 2, thread_name_prefix='burnbin-compress'
+            )
+            self.variants = VariantCache(os.path.join(base_path, "cache", "compressed"))
         
-        self.files_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Persistence: SQLite metadata store, shared_files.json is only read to migrate
+        self.shared_files_file = os.path.join(base_path, "shared_files.json")
+        self.metadata_file = os.path.join(base_path, "burnbin.db")
+        self.store = MetadataStore(self.metadata_file, on_error=self.log_activity)
         
-        # Bind double-click to copy link
-        self.files_tree.bind("<Double-1>", self.copy_file_link)
+        # Server state
+        self.engine_name = engine  # Key into SERVER_ENGINES
+        self.engine_options = engine_options or {}
+        self.engine = None
+        self.server_thread = None
+        self.cloudflare_process = None
+        self.server_running = False
+        self.public_url = None
+        self.tunnel_state = 'idle'
+        self.tunnel_lock = threading.Lock()  # Serializes starting the tunnel
+        self.cloudflared_installed = None  # Unknown until first checked
+        self.cloudflared_lock = threading.Lock()
+        self.cloudflared_watch_interval = 5  # Seconds between PATH checks while missing
+        self.path_signature = ()
+        self.local_port = local_port
+        self.use_sendfile = True  # Zero-copy downloads when the server allows it
         
-        # Button container
-        button_container = tk.Frame(files_card, bg=self.colors['bg_card'])
-        button_container.pack(fill=tk.X, padx=20, pady=(0, 20))
+        # Load persisted shared files
+        self.load_shared_files()
+        self.store.start()
+    
+    def get_client_ip(self, request):
+        """Get the real client IP address, handling proxies and Cloudflare Tunnel
         
-        # Modern remove button
-        remove_btn = tk.Button(
-            button_container,
-            text="🔥 Remove Selected",
-            command=self.remove_file,
-            bg=self.colors['bg_button_danger'],
-            fg="white",
-            font=("Segoe UI", 10, "bold"),
-            padx=24,
-            pady=10,
-            relief=tk.FLAT,
-            cursor="hand2",
-            activebackground=self.colors['bg_button_danger_hover'],
-            activeforeground="white",
-            borderwidth=0
-        )
-        remove_btn.pack(side=tk.RIGHT)
-    
-    def setup_uploads_tab(self):
-        """Setup the Uploads tab with files uploaded by users"""
-        # Uploaded files section - Modern card
-        uploads_card = tk.Frame(
-            self.uploads_tab,
-            bg=self.colors['bg_card'],
-            relief=tk.FLAT,
-            highlightbackground=self.colors['border'],
-            highlightthickness=1
-        )
-        uploads_card.pack(fill=tk.BOTH, expand=True)
+        Forwarding headers are only believed from loopback, where cloudflared
+        connects from. Anyone else could send them to dodge per-client
+        limits or spend another client's.
+        """
+        if request.remote_addr not in self.loopback_addrs:
+            return request.remote_addr
         
-        uploads_header = tk.Frame(uploads_card, bg=self.colors['bg_card'])
-        uploads_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        # Check X-Forwarded-For header (most common for proxies)
+        if request.headers.get('X-Forwarded-For'):
+            # X-Forwarded-For can contain multiple IPs, take the first one
+            ip = request.headers.get('X-Forwarded-For').split(',')[0].strip()
+            if ip:
+                return ip
         
-        uploads_title = tk.Label(
-            uploads_header,
-            text="🔥 Uploaded Files",
-            font=("Segoe UI", 14, "bold"),
-            bg=self.colors['bg_card'],
-            fg=self.colors['text_primary']
-        )
-        uploads_title.pack(side=tk.LEFT)
+        # Check X-Real-IP header
+        if request.headers.get('X-Real-IP'):
+            return request.headers.get('X-Real-IP')
         
-        # Treeview container
-        tree_container = tk.Frame(uploads_card, bg=self.colors['bg_card'])
-        tree_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 15))
+        # Check CF-Connecting-IP (Cloudflare specific)
+        if request.headers.get('CF-Connecting-IP'):
+            return request.headers.get('CF-Connecting-IP')
         
-        # Configure modern treeview style
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("Uploads.Treeview",
-                       background=self.colors['bg_card'],
-                       foreground=self.colors['text_primary'],
-                       fieldbackground=self.colors['bg_card'],
-                       borderwidth=0,
-                       font=("Segoe UI", 10))
-        style.configure("Uploads.Treeview.Heading",
-                       background='#2d2d2d',
-                       foreground=self.colors['text_primary'],
-                       font=("Segoe UI", 10, "bold"),
-                       relief=tk.FLAT)
-        style.map("Uploads.Treeview",
-                 background=[('selected', self.colors['accent'])],
-                 foreground=[('selected', 'white')])
+        # Fall back to remote_addr
+        return request.remote_addr
+    
+    def is_local_request(self, request):
+        """True for requests made on this machine, not relayed by the tunnel or a proxy"""
+        return (request.remote_addr in self.loopback_addrs
+                and 'X-Forwarded-For' not in request.headers
+                and 'CF-Connecting-IP' not in request.headers)
+    
+    def profile_saved(self, paths):
+        self.log_activity(f"Profile saved: {', '.join(paths)}")
+    
+    def define_metrics(self):
+        """Declare the series counted on the serving path"""
+        self.metrics.define('burnbin_http_requests_total', 'counter',
+                            "HTTP requests by route, method and status", ('route', 'method', 'status'))
+        self.metrics.define('burnbin_http_request_duration_seconds', 'histogram',
+                            "Time until the response starts, by route", ('route',))
+        self.metrics.define('burnbin_download_bytes_total', 'counter', "File bytes sent to downloads")
+        self.metrics.define('burnbin_upload_bytes_total', 'counter', "Bytes received in uploads")
+    
+    def render_metrics(self):
+        """/metrics lines: the counters plus gauges read from their owners now"""
+        downloads = self.admission.stats()
+        sessions = self.download_sessions.stats()
+        families = [
+            ('burnbin_downloads_active', 'gauge', "Downloads streaming", downloads['active']),
+            ('burnbin_downloads_queued', 'gauge', "Downloads waiting for a slot", downloads['queued']),
+            ('burnbin_downloads_refused_total', 'counter', "Downloads turned away with 503", downloads['refused']),
+            ('burnbin_download_sessions', 'gauge', "Live download progress sessions", sessions['live']),
+            ('burnbin_download_sessions_evicted_total', 'counter', "Sessions dropped for age or space",
+             sessions['evicted']),
+            ('burnbin_download_sessions_aborted_total', 'counter', "Downloads the client walked away from",
+             sessions['aborted']),
+            ('burnbin_event_streams', 'gauge', "Open Server-Sent Events streams", self.events.stats()['streams']),
+            ('burnbin_shared_files', 'gauge', "Shared files and folders", len(self.shared_files)),
+            ('burnbin_uploaded_files', 'gauge', "Files uploaded by visitors", len(self.uploaded_files)),
+            ('burnbin_server_running', 'gauge', "1 while the HTTP server runs", int(self.server_running)),
+            ('process_cpu_seconds_total', 'counter', "User and system CPU time", round(time.process_time(), 3)),
+            ('process_start_time_seconds', 'gauge', "Start time since the epoch", round(self.metrics.started, 3)),
+            ('burnbin_threads', 'gauge', "Python threads alive", threading.active_count())
+        ]
+        rss = process_rss()
+        if rss is not None:
+            families.append(('process_resident_memory_bytes', 'gauge', "Resident memory", rss))
         
-        # Treeview for uploaded files
-        columns = ("File Name", "Size", "Upload Time", "From IP")
-        self.uploads_tree = ttk.Treeview(tree_container, columns=columns, show="tree headings", height=15, style="Uploads.Treeview")
-        self.uploads_tree.heading("#0", text="")
-        self.uploads_tree.column("#0", width=20)
+        lines = self.metrics.render()
+        for name, kind, description, value in families:
+            lines.extend(metric_lines(name, kind, description, [('', (), value)]))
+        lines.extend(metric_lines(
+            'burnbin_tunnel_state', 'gauge', "1 for the tunnel's current state",
+            [('', (('state', state),), int(state == self.tunnel_state)) for state in self.tunnel_states]
+        ))
+        return lines
+    
+    def file_validators(self, stat):
+        """ETag and Last-Modified for a file, derived from its size and mtime"""
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        return etag, http_date(int(stat.st_mtime))
+    
+    def requested_ranges(self, request, file_size, etag, last_modified):
+        """Resolve the Range header into a list of (start, end) byte offsets
         
-        for col in columns:
-            self.uploads_tree.heading(col, text=col)
-            if col == "File Name":
-                self.uploads_tree.column(col, width=300)
-            elif col == "Size":
-                self.uploads_tree.column(col, width=120)
-            elif col == "Upload Time":
-                self.uploads_tree.column(col, width=180)
+        Returns None when the whole file should be sent (no Range header,
+        a malformed one or a stale If-Range) and [] when no range can be
+        satisfied. End offsets are exclusive.
+        """
+        header = request.headers.get('Range')
+        if not header:
+            return None
+        
+        # If-Range: only honour the Range if the client's copy is still current
+        if_range = request.headers.get('If-Range')
+        if if_range:
+            if_range = if_range.strip()
+            if if_range.startswith(('"', 'W/')):
+                if if_range != etag:
+                    return None
             else:
-                self.uploads_tree.column(col, width=150)
+                if_range_date = parse_date(if_range)
+                if if_range_date is None or http_date(if_range_date) != last_modified:
+                    return None
         
-        scrollbar = ttk.Scrollbar(tree_container, orient=tk.VERTICAL, command=self.uploads_tree.yview)
-        self.uploads_tree.configure(yscrollcommand=scrollbar.set)
+        unit, _, spec = header.partition('=')
+        if unit.strip().lower() != 'bytes' or not spec.strip():
+            return None
         
-        self.uploads_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        specs = spec.split(',')
+        if len(specs) > 64:
+            # Pathological multi-range requests just get the whole file
+            return None
         
-        # Bind double-click to download
-        self.uploads_tree.bind("<Double-1>", self.download_uploaded_file)
+        ranges = []
+        for part in specs:
+            first, dash, last = part.strip().partition('-')
+            if not dash:
+                return None
+            try:
+                if first == '':
+                    # Suffix range: the last N bytes
+                    length = int(last)
+                    if length <= 0:
+                        continue
+                    start, end = max(0, file_size - length), file_size
+                else:
+                    start = int(first)
+                    end = int(last) + 1 if last else file_size
+                    if last and end <= start:
+                        # Syntactically invalid range, ignore the header
+                        return None
+                    end = min(end, file_size)
+            except ValueError:
+                return None
+            if start < file_size:
+                ranges.append((start, end))
         
-        # Button container
-        button_container = tk.Frame(uploads_card, bg=self.colors['bg_card'])
-        button_container.pack(fill=tk.X, padx=20, pady=(0, 20))
+        # Coalesce overlapping/adjacent ranges so a client can't make us
+        # read the same bytes many times over
+        ranges.sort()
+        merged = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+    
+    def bind_download_session(self, request, file_id, file_size, transfer_size):
+        """Progress session of a download request, returns (session_id, session)
         
-        # Download button
-        download_btn = tk.Button(
-            button_container,
-            text="🔥 Download Selected",
-            command=self.download_selected_upload,
-            bg=self.colors['bg_button_success'],
-            fg="white",
-            font=("Segoe UI", 10, "bold"),
-            padx=24,
-            pady=10,
-            relief=tk.FLAT,
-            cursor="hand2",
-            activebackground=self.colors['bg_button_success_hover'],
-            activeforeground="white",
-            borderwidth=0
-        )
-        download_btn.pack(side=tk.RIGHT, padx=(10, 0))
+        The page's session from start-download is reused when it passes one,
+        otherwise a new session is created.
+        """
+        session_id = request.args.get('session')
+        session = self.download_sessions.get(session_id) if session_id else None
         
-        # Share button
-        share_upload_btn = tk.Button(
-            button_container,
-            text="🔥 Share Selected",
-            command=self.share_uploaded_file,
-            bg=self.colors['bg_button_primary'],
-            fg="white",
-            font=("Segoe UI", 10, "bold"),
-            padx=24,
-            pady=10,
-            relief=tk.FLAT,
-            cursor="hand2",
-            activebackground=self.colors['bg_button_primary_hover'],
-            activeforeground="white",
-            borderwidth=0
-        )
-        share_upload_btn.pack(side=tk.RIGHT, padx=(10, 0))
+        if session is not None:
+            # Use existing session
+            session['status'] = 'downloading'
+            session['start_time'] = datetime.now()
+            session.pop('end_time', None)
+        else:
+            # Create new session if not provided
+            session_id = str(uuid.uuid4())
+            session = self.download_sessions.add(session_id, {
+                'file_id': file_id,
+                'start_time': datetime.now(),
+                'progress': 0,
+                'status': 'downloading'
+            })
+        # Progress is measured against the bytes this response carries
+        session.update({
+            'file_size': file_size,
+            'transfer_size': transfer_size,
+            'bytes_sent': 0,
+            'client_ip': self.get_client_ip(request)
+        })
+        self.store.record_session(session_id, session)  # Download history
+        return session_id, session
+    
+    def admit_download(self, session_id, session, file_ids):
+        """Wait for a slot to download file_ids, returns its release function
         
-        # Remove button
-        remove_upload_btn = tk.Button(
-            button_container,
-            text="🔥 Remove Selected",
-            command=self.remove_uploaded_file,
-            bg=self.colors['bg_button_danger'],
-            fg="white",
-            font=("Segoe UI", 10, "bold"),
-            padx=24,
-            pady=10,
-            relief=tk.FLAT,
-            cursor="hand2",
-            activebackground=self.colors['bg_button_danger_hover'],
-            activeforeground="white",
-            borderwidth=0
-        )
-        remove_upload_btn.pack(side=tk.RIGHT)
+        The page sees 'queued' with its position while the request waits.
+        Returns None if the download was turned away.
+        """
+        def queued(position):
+            session['status'] = 'queued'
+            session['queue_position'] = position
+            self.push_progress(session_id, session, force=True)
+        
+        release = self.admission.acquire(file_ids, queued)
+        session.pop('queue_position', None)
+        if release is None:
+            session['status'] = 'refused'
+            session['end_time'] = datetime.now()
+            self.store.record_session(session_id, session)
+            self.push_progress(session_id, session, force=True)
+            self.log_activity(f"Download turned away, server busy (Session: {session_id[:8]})")
+            return None
+        session['status'] = 'downloading'
+        return release
     
-    def setup_activity_tab(self):
-        """Setup the Activity tab with download activity log"""
-        # Download activity section - Modern card
-        activity_card = tk.Frame(
-            self.activity_tab,
-            bg=self.colors['bg_card'],
-            relief=tk.FLAT,
-            highlightbackground=self.colors['border'],
-            highlightthickness=1
+    def busy_response(self):
+        return Response(
+            "Too many downloads right now, try again shortly",
+            status=503,
+            headers={'Retry-After': str(self.admission.retry_after)}
         )
-        activity_card.pack(fill=tk.BOTH, expand=True)
+    
+    def count_download(self, file_id, session_id, note=""):
+        """Count a download that starts from the first byte"""
+        file_info = self.shared_files[file_id]
+        file_info['downloads'] += 1
+        self.store.record_download(file_id)  # Persist download count
+        self.notify_change('download', file_id)
+        self.log_activity(f"Download started: {file_info['name']} (Session: {session_id[:8]}{note})")
+    
+    def download_callbacks(self, session_id, session, name, transfer_size):
+        """on_progress, on_complete and on_abort for a download body"""
+        def track_progress(sent):
+            self.metrics.add('burnbin_download_bytes_total', sent)
+            session['bytes_sent'] += sent
+            session['progress'] = (session['bytes_sent'] / transfer_size) * 100
+            self.download_sessions.touch(session)
+            self.push_progress(session_id, session)
         
-        activity_header = tk.Frame(activity_card, bg=self.colors['bg_card'])
-        activity_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        def mark_completed():
+            session['status'] = 'completed'
+            session['progress'] = 100
+            session['end_time'] = datetime.now()
+            self.store.record_session(session_id, session)
+            self.push_progress(session_id, session, force=True)
+            duration = (session['end_time'] - session['start_time']).total_seconds()
+            self.log_activity(
+                f"Download completed: {name} "
+                f"({self.format_size(transfer_size)} in {duration:.1f}s)"
+            )
         
-        activity_title = tk.Label(
-            activity_header,
-            text="🔥 Download Activity",
-            font=("Segoe UI", 14, "bold"),
-            bg=self.colors['bg_card'],
-            fg=self.colors['text_primary']
-        )
-        activity_title.pack(anchor=tk.W)
+        def mark_aborted():
+            self.download_sessions.mark_aborted(session)
+            self.store.record_session(session_id, session)
+            self.push_progress(session_id, session, force=True)
+            self.log_activity(
+                f"Download aborted: {name} after "
+                f"{self.format_size(session['bytes_sent'])} (Session: {session_id[:8]})"
+            )
         
-        activity_content = tk.Frame(activity_card, bg=self.colors['bg_card'])
-        activity_content.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        return {'on_progress': track_progress, 'on_complete': mark_completed, 'on_abort': mark_aborted}
+    
+    def download_folder(self, request, file_id, file_info):
+        """Send a shared folder as <name>.zip, listed afresh for every download
         
-        # Modern text widget with styling
-        self.activity_text = tk.Text(
-            activity_content,
-            font=("Consolas", 9),
-            wrap=tk.WORD,
-            state=tk.DISABLED,
-            bg='#1a1a1a',
-            fg=self.colors['text_primary'],
-            relief=tk.FLAT,
-            highlightbackground=self.colors['border'],
-            highlightthickness=1,
-            padx=12,
-            pady=12
+        Files are stored, so the length is known and progress is exact, or
+        text-like ones deflated when compressed downloads are enabled.
+        """
+        entries = folder_entries(file_info['path'])
+        self.update_share_size(file_id, sum(size for _, _, size, _ in entries))
+        return self.send_archive(
+            request, [file_id], f"{file_info['name']}.zip", entries, f", {len(entries)} files"
         )
-        self.activity_text.pack(fill=tk.BOTH, expand=True)
     
-    def get_client_ip(self, request):
-        """Get the real client IP address, handling proxies and Cloudflare Tunnel"""
-        # Check X-Forwarded-For header (most common for proxies)
-        if request.headers.get('X-Forwarded-For'):
-            # X-Forwarded-For can contain multiple IPs, take the first one
-            ip = request.headers.get('X-Forwarded-For').split(',')[0].strip()
-            if ip:
-                return ip
-        
-        # Check X-Real-IP header
-        if request.headers.get('X-Real-IP'):
-            return request.headers.get('X-Real-IP')
+    def send_archive(self, request, file_ids, name, entries, note, owners=None):
+        """Stream entries as one ZIP download, counted for each of file_ids
         
-        # Check CF-Connecting-IP (Cloudflare specific)
-        if request.headers.get('CF-Connecting-IP'):
-            return request.headers.get('CF-Connecting-IP')
+        owners gives the file ID each entry belongs to (the first of
+        file_ids when omitted), whose share bandwidth limit it is paced by.
+        """
+        deflate = is_compressible if self.compress_downloads else None
+        headers = {
+            'Content-Disposition': f'attachment; filename="{name}"',
+            'Cache-Control': 'no-cache'
+        }
+        length = ZipStream(entries, deflate=deflate).content_length()
+        if length is not None:
+            headers['Content-Length'] = str(length)
+        if request.method == 'HEAD':
+            return Response(iter(()), mimetype='application/zip', headers=headers)
         
-        # Fall back to remote_addr
-        return request.remote_addr
+        total = sum(size for _, _, size, _ in entries)
+        session_id, session = self.bind_download_session(request, ','.join(file_ids), total, total)
+        headers['X-Session-Id'] = session_id
+        release = self.admit_download(session_id, session, file_ids)
+        if release is None:
+            return self.busy_response()
+        for file_id in file_ids:
+            self.count_download(file_id, session_id, note)
+        throttles = {file_id: self.bandwidth.throttle(session['client_ip'], file_id) for file_id in file_ids}
+        if owners is None:
+            owners = [file_ids[0]] * len(entries)
+        body = ZipStream(
+            entries,
+            deflate=deflate,
+            throttles=[throttles[owner] for owner in owners],
+            **self.download_callbacks(session_id, session, name, total)
+        )
+        response = Response(body, mimetype='application/zip', headers=headers)
+        response.call_on_close(release)
+        return response
+    
+    def bulk_file_ids(self, file_ids):
+        """Shared file IDs from a bulk request, known ones only, deduplicated, in order"""
+        if not isinstance(file_ids, list):
+            return []
+        file_ids = [file_id for file_id in file_ids if isinstance(file_id, str)]
+        return [file_id for file_id in dict.fromkeys(file_ids) if file_id in self.shared_files]
+    
+    def update_share_size(self, file_id, file_size):
+        """Record a new size for a share whose file or folder changed"""
+        file_info = self.shared_files.get(file_id)
+        size = self.format_size(file_size)
+        if file_info is None or file_info['size'] == size:
+            return
+        file_info['size'] = size
+        try:
+            self.store.update_sizes('shares', [(file_size, file_id)])
+        except Exception as e:
+            self.log_activity(f"Error saving the new size of a shared file: {str(e)}")
+        self.files_changed()
     
     def setup_flask_routes(self):
         # Define HTML template once
@@ -699,6 +3560,31 @@ class FileShareApp:
                         transform: scale(1.05);
                         box-shadow: 0 5px 20px rgba(255, 107, 53, 0.5);
                     }
+                    .bulk-bar {
+                        display: none;
+                        flex-wrap: wrap;
+                        align-items: center;
+                        gap: 10px;
+                        margin-bottom: 15px;
+                    }
+                    .bulk-bar .progress-container {
+                        flex-basis: 100%;
+                        margin-top: 0;
+                    }
+                    .select-all-btn {
+                        background: #2d2d2d;
+                        color: #ffffff;
+                        border: 1px solid #404040;
+                        padding: 10px 20px;
+                        border-radius: 25px;
+                        cursor: pointer;
+                    }
+                    .file-select {
+                        float: right;
+                        color: #b0b0b0;
+                        font-size: 0.9em;
+                        cursor: pointer;
+                    }
                     .progress-container {
                         margin-top: 15px;
                         display: none;
@@ -746,6 +3632,18 @@ class FileShareApp:
                     
                     <!-- Download Section -->
                     <h2 style="color: #ff6b35; margin-bottom: 15px; font-size: 1.3em;">🔥 Download Files</h2>
+                    <div class="bulk-bar" id="bulkBar">
+                        <button class="download-btn" id="bulkDownloadBtn" onclick="downloadSelected(event);" disabled>
+                            Download Selected (0)
+                        </button>
+                        <button class="select-all-btn" onclick="toggleSelectAll();">Select All</button>
+                        <div class="progress-container" id="progress-bulk">
+                            <div class="progress-bar">
+                                <div class="progress-fill" id="progress-fill-bulk">0%</div>
+                            </div>
+                            <div class="progress-text" id="progress-text-bulk">Preparing download...</div>
+                        </div>
+                    </div>
                     <ul class="file-list" id="fileList">
                         <!-- Files will be inserted here -->
                     </ul>
@@ -771,36 +3669,238 @@ class FileShareApp:
                     </div>
                 </div>
                 <script>
+                    function renderFileList(files) {
+                        const list = document.getElementById('fileList');
+                        listedFiles = files;
+                        const listed = new Set(files.map(file => file.id));
+                        selectedFiles.forEach(fileId => {
+                            if (!listed.has(fileId)) {
+                                selectedFiles.delete(fileId);
+                            }
+                        });
+                        updateBulkBar();
+                        if (files.length === 0) {
+                            list.innerHTML = '<div class="empty-state"><div class="empty-state-icon">📭</div><p>No files available for download</p></div>';
+                            return;
+                        }
+                        list.innerHTML = files.map(file => `
+                            <li class="file-item">
+                                <label class="file-select">
+                                    <input type="checkbox" ${selectedFiles.has(file.id) ? 'checked' : ''} onchange="toggleSelected('${file.id}', this.checked);"> Select
+                                </label>
+                                <div class="file-name">${file.folder ? '📁 ' : ''}${file.name}</div>
+                                <div class="file-info">Size: ${file.size} | Added: ${file.upload_time}</div>
+                                <button class="download-btn" id="download-btn-${file.id}" onclick="trackDownload('${file.id}', event);">
+                                    ${file.folder ? 'Download ZIP' : 'Download File'}
+                                </button>
+                                <div class="progress-container" id="progress-${file.id}">
+                                    <div class="progress-bar">
+                                        <div class="progress-fill" id="progress-fill-${file.id}">0%</div>
+                                    </div>
+                                    <div class="progress-text" id="progress-text-${file.id}">Preparing download...</div>
+                                </div>
+                            </li>
+                        `).join('');
+                    }
+                    
                     function updateFileList() {
                         fetch('/api/files')
                             .then(r => r.json())
-                            .then(data => {
-                                const list = document.getElementById('fileList');
-                                if (data.files.length === 0) {
-                                    list.innerHTML = '<div class="empty-state"><div class="empty-state-icon">📭</div><p>No files available for download</p></div>';
-                                    return;
-                                }
-                                list.innerHTML = data.files.map(file => `
-                                    <li class="file-item">
-                                        <div class="file-name">${file.name}</div>
-                                        <div class="file-info">Size: ${file.size} | Added: ${file.upload_time}</div>
-                                        <button class="download-btn" id="download-btn-${file.id}" onclick="trackDownload('${file.id}', event);">
-                                            Download File
-                                        </button>
-                                        <div class="progress-container" id="progress-${file.id}">
-                                            <div class="progress-bar">
-                                                <div class="progress-fill" id="progress-fill-${file.id}">0%</div>
-                                            </div>
-                                            <div class="progress-text" id="progress-text-${file.id}">Preparing download...</div>
-                                        </div>
-                                    </li>
-                                `).join('');
-                            });
+                            .then(data => renderFileList(data.files));
                     }
                     
-                    // Track active downloads and intervals to prevent duplicates
+                    // Server-Sent Events carry file list changes and download progress.
+                    // Without them (no EventSource, server full) the page polls.
+                    let eventStream = null;  // Our stream ID while connected
+                    let fileListTimer = null;
+                    const progressWatchers = {};  // {sessionId: {callback, timer}}
+                    
+                    function startFilePolling() {
+                        if (!fileListTimer) {
+                            updateFileList();
+                            fileListTimer = setInterval(updateFileList, 2000);
+                        }
+                    }
+                    
+                    function stopFilePolling() {
+                        clearInterval(fileListTimer);
+                        fileListTimer = null;
+                    }
+                    
+                    function pollProgress(sessionId) {
+                        const watcher = progressWatchers[sessionId];
+                        if (!watcher || watcher.timer) {
+                            return;
+                        }
+                        watcher.timer = setInterval(() => {
+                            fetch('/api/download-progress/' + sessionId)
+                                .then(r => r.json())
+                                .then(progressData => {
+                                    if (progressWatchers[sessionId]) {
+                                        progressWatchers[sessionId].callback(progressData);
+                                    }
+                                })
+                                .catch(err => {
+                                    console.error('Progress fetch error:', err);
+                                    if (progressWatchers[sessionId]) {
+                                        progressWatchers[sessionId].callback({error: 'Progress unavailable'});
+                                    }
+                                });
+                        }, 300); // Poll every 300ms
+                    }
+                    
+                    function watchProgress(sessionId, pushed, callback) {
+                        progressWatchers[sessionId] = {callback: callback, timer: null};
+                        if (!pushed || !eventStream) {
+                            pollProgress(sessionId);
+                        }
+                    }
+                    
+                    function stopWatching(sessionId) {
+                        const watcher = progressWatchers[sessionId];
+                        if (watcher) {
+                            clearInterval(watcher.timer);
+                            delete progressWatchers[sessionId];
+                        }
+                    }
+                    
+                    function connectEvents() {
+                        if (!window.EventSource) {
+                            startFilePolling();
+                            return;
+                        }
+                        const source = new EventSource('/api/events');
+                        source.addEventListener('hello', e => {
+                            eventStream = JSON.parse(e.data).stream;
+                            stopFilePolling();
+                        });
+                        source.addEventListener('files', e => renderFileList(JSON.parse(e.data).files));
+                        source.addEventListener('progress', e => {
+                            const progressData = JSON.parse(e.data);
+                            const watcher = progressWatchers[progressData.session_id];
+                            if (watcher) {
+                                watcher.callback(progressData);
+                            }
+                        });
+                        source.onerror = () => {
+                            // Progress was bound to the stream that just dropped, poll it from here on
+                            eventStream = null;
+                            Object.keys(progressWatchers).forEach(pollProgress);
+                            if (source.readyState === EventSource.CLOSED) {
+                                startFilePolling();
+                                setTimeout(connectEvents, 30000);
+                            }
+                        };
+                    }
+                    
+                    // Track active downloads and intervals to prevent duplicates
                     const activeDownloads = {};
                     
+                    // Multi-select: the chosen files come down as one ZIP with one progress bar
+                    const selectedFiles = new Set();
+                    let listedFiles = [];
+                    let bulkActive = false;
+                    
+                    function toggleSelected(fileId, checked) {
+                        if (checked) {
+                            selectedFiles.add(fileId);
+                        } else {
+                            selectedFiles.delete(fileId);
+                        }
+                        updateBulkBar();
+                    }
+                    
+                    function toggleSelectAll() {
+                        const all = listedFiles.every(file => selectedFiles.has(file.id));
+                        listedFiles.forEach(file => all ? selectedFiles.delete(file.id) : selectedFiles.add(file.id));
+                        renderFileList(listedFiles);
+                    }
+                    
+                    function updateBulkBar() {
+                        const button = document.getElementById('bulkDownloadBtn');
+                        button.textContent = `Download Selected (${selectedFiles.size})`;
+                        button.disabled = bulkActive || selectedFiles.size === 0;
+                        button.style.opacity = button.disabled ? '0.6' : '1';
+                        button.style.cursor = button.disabled ? 'not-allowed' : 'pointer';
+                        document.getElementById('bulkBar').style.display = listedFiles.length > 1 ? 'flex' : 'none';
+                    }
+                    
+                    function downloadSelected(event) {
+                        if (event) {
+                            event.preventDefault();
+                        }
+                        if (bulkActive || selectedFiles.size === 0) {
+                            return;
+                        }
+                        const progressContainer = document.getElementById('progress-bulk');
+                        const progressFill = document.getElementById('progress-fill-bulk');
+                        const progressText = document.getElementById('progress-text-bulk');
+                        const finish = text => {
+                            bulkActive = false;
+                            updateBulkBar();
+                            progressText.textContent = text;
+                        };
+                        bulkActive = true;
+                        updateBulkBar();
+                        progressContainer.style.display = 'block';
+                        progressFill.style.width = '0%';
+                        progressFill.textContent = '0%';
+                        progressText.textContent = 'Preparing download...';
+                        
+                        fetch('/api/start-bulk-download', {
+                            method: 'POST',
+                            headers: {'Content-Type': 'application/json'},
+                            body: JSON.stringify({file_ids: Array.from(selectedFiles), stream: eventStream})
+                        })
+                            .then(r => r.json())
+                            .then(data => {
+                                if (data.error) {
+                                    finish('Error: ' + data.error);
+                                    return;
+                                }
+                                const a = document.createElement('a');
+                                a.href = data.download_url;
+                                a.style.display = 'none';
+                                a.download = '';
+                                document.body.appendChild(a);
+                                a.click();
+                                document.body.removeChild(a);
+                                
+                                watchProgress(data.session_id, data.pushed, progressData => {
+                                    if (progressData.status === 'queued') {
+                                        progressText.textContent = `Waiting for a free slot, position ${progressData.queue_position} in line...`;
+                                        return;
+                                    }
+                                    if (progressData.status === 'refused') {
+                                        stopWatching(data.session_id);
+                                        finish('Server busy, please try again in a moment');
+                                        return;
+                                    }
+                                    if (progressData.error || progressData.status === 'aborted') {
+                                        stopWatching(data.session_id);
+                                        finish('Download stopped');
+                                        return;
+                                    }
+                                    const progress = Math.min(progressData.progress || 0, 100);
+                                    const mbSent = ((progressData.bytes_sent || 0) / (1024 * 1024)).toFixed(2);
+                                    const mbTotal = ((progressData.transfer_size || 0) / (1024 * 1024)).toFixed(2);
+                                    progressFill.style.width = progress + '%';
+                                    progressFill.textContent = Math.round(progress) + '%';
+                                    progressText.textContent = `Downloading ${data.file_count} files... ${mbSent} MB / ${mbTotal} MB`;
+                                    if (progressData.status === 'completed' || progress >= 100) {
+                                        stopWatching(data.session_id);
+                                        progressFill.style.width = '100%';
+                                        progressFill.textContent = '100%';
+                                        finish(`Download complete! ${data.file_count} files, ${mbTotal} MB`);
+                                    }
+                                });
+                            })
+                            .catch(err => {
+                                console.error('Error starting download:', err);
+                                finish('Error starting download');
+                            });
+                    }
+                    
                     function trackDownload(fileId, event) {
                         // Prevent default if event exists
                         if (event) {
@@ -840,7 +3940,7 @@ class FileShareApp:
                         });
                         
                         // Create session first, then start download
-                        fetch('/api/start-download/' + fileId)
+                        fetch('/api/start-download/' + fileId + (eventStream ? '?stream=' + eventStream : ''))
                             .then(r => r.json())
                             .then(data => {
                                 if (data.error) {
@@ -869,66 +3969,61 @@ class FileShareApp:
                                 a.click();
                                 document.body.removeChild(a);
                                 
-                                // Poll for real progress
-                                const progressInterval = setInterval(() => {
-                                    fetch('/api/download-progress/' + sessionId)
-                                        .then(r => r.json())
-                                        .then(progressData => {
-                                            if (progressData.error) {
-                                                clearInterval(progressInterval);
-                                                delete activeDownloads[fileId];
-                                                if (downloadBtn) {
-                                                    downloadBtn.disabled = false;
-                                                    downloadBtn.style.opacity = '1';
-                                                    downloadBtn.style.cursor = 'pointer';
-                                                }
-                                                return;
-                                            }
-                                            
-                                            const progress = Math.min(progressData.progress || 0, 100);
-                                            const bytesSent = progressData.bytes_sent || 0;
-                                            const totalSize = progressData.file_size || fileSize;
-                                            
-                                            if (progressFill) {
-                                                progressFill.style.width = progress + '%';
-                                                progressFill.textContent = Math.round(progress) + '%';
-                                            }
-                                            
-                                            if (progressText) {
-                                                const mbSent = (bytesSent / (1024 * 1024)).toFixed(2);
-                                                const mbTotal = (totalSize / (1024 * 1024)).toFixed(2);
-                                                progressText.textContent = `Downloading... ${mbSent} MB / ${mbTotal} MB (${Math.round(progress)}%)`;
-                                            }
-                                            
-                                            if (progressData.status === 'completed' || progress >= 100) {
-                                                clearInterval(progressInterval);
-                                                delete activeDownloads[fileId];
-                                                if (downloadBtn) {
-                                                    downloadBtn.disabled = false;
-                                                    downloadBtn.style.opacity = '1';
-                                                    downloadBtn.style.cursor = 'pointer';
-                                                }
-                                                if (progressFill) {
-                                                    progressFill.style.width = '100%';
-                                                    progressFill.textContent = '100%';
-                                                }
-                                                if (progressText) {
-                                                    const mbTotal = (totalSize / (1024 * 1024)).toFixed(2);
-                                                    progressText.textContent = `Download complete! ${mbTotal} MB`;
-                                                }
-                                            }
-                                        })
-                                        .catch(err => {
-                                            console.error('Progress fetch error:', err);
-                                            clearInterval(progressInterval);
-                                            delete activeDownloads[fileId];
-                                            if (downloadBtn) {
-                                                downloadBtn.disabled = false;
-                                                downloadBtn.style.opacity = '1';
-                                                downloadBtn.style.cursor = 'pointer';
-                                            }
-                                        });
-                                }, 300); // Poll every 300ms
+                                // Follow real progress, pushed over the event stream or polled
+                                watchProgress(sessionId, data.pushed, progressData => {
+                                    if (progressData.status === 'queued') {
+                                        if (progressText) {
+                                            progressText.textContent = `Waiting for a free slot, position ${progressData.queue_position} in line...`;
+                                        }
+                                        return;
+                                    }
+                                    if (progressData.error || progressData.status === 'aborted' || progressData.status === 'refused') {
+                                        stopWatching(sessionId);
+                                        delete activeDownloads[fileId];
+                                        if (downloadBtn) {
+                                            downloadBtn.disabled = false;
+                                            downloadBtn.style.opacity = '1';
+                                            downloadBtn.style.cursor = 'pointer';
+                                        }
+                                        if (progressText && progressData.status === 'refused') {
+                                            progressText.textContent = 'Server busy, please try again in a moment';
+                                        }
+                                        return;
+                                    }
+                                    
+                                    const progress = Math.min(progressData.progress || 0, 100);
+                                    const bytesSent = progressData.bytes_sent || 0;
+                                    const totalSize = progressData.transfer_size || progressData.file_size || fileSize;
+                                    
+                                    if (progressFill) {
+                                        progressFill.style.width = progress + '%';
+                                        progressFill.textContent = Math.round(progress) + '%';
+                                    }
+                                    
+                                    if (progressText) {
+                                        const mbSent = (bytesSent / (1024 * 1024)).toFixed(2);
+                                        const mbTotal = (totalSize / (1024 * 1024)).toFixed(2);
+                                        progressText.textContent = `Downloading... ${mbSent} MB / ${mbTotal} MB (${Math.round(progress)}%)`;
+                                    }
+                                    
+                                    if (progressData.status === 'completed' || progress >= 100) {
+                                        stopWatching(sessionId);
+                                        delete activeDownloads[fileId];
+                                        if (downloadBtn) {
+                                            downloadBtn.disabled = false;
+                                            downloadBtn.style.opacity = '1';
+                                            downloadBtn.style.cursor = 'pointer';
+                                        }
+                                        if (progressFill) {
+                                            progressFill.style.width = '100%';
+                                            progressFill.textContent = '100%';
+                                        }
+                                        if (progressText) {
+                                            const mbTotal = (totalSize / (1024 * 1024)).toFixed(2);
+                                            progressText.textContent = `Download complete! ${mbTotal} MB`;
+                                        }
+                                    }
+                                });
                             })
                             .catch(err => {
                                 console.error('Error starting download:', err);
@@ -945,6 +4040,124 @@ class FileShareApp:
                             });
                     }
                     
+                    // Resumable uploads: the file goes up in chunks, several at a time, and a
+                    // chunk lost to a dropped connection is simply sent again
+                    const UPLOAD_PARALLEL = 4;
+                    const UPLOAD_RETRIES = 5;
+                    
+                    function uploadError(xhr) {
+                        try {
+                            return JSON.parse(xhr.responseText).error || 'Upload failed';
+                        } catch {
+                            return 'Upload failed (HTTP ' + xhr.status + ')';
+                        }
+                    }
+                    
+                    function sendChunk(uploadId, file, start, end, onProgress) {
+                        return new Promise((resolve, reject) => {
+                            const xhr = new XMLHttpRequest();
+                            xhr.upload.addEventListener('progress', e => onProgress(e.loaded));
+                            xhr.addEventListener('load', () => {
+                                if (xhr.status === 200) {
+                                    resolve();
+                                } else {
+                                    reject(new Error(uploadError(xhr)));
+                                }
+                            });
+                            xhr.addEventListener('error', () => reject(new Error('Network error during upload')));
+                            xhr.open('PUT', '/api/upload/' + uploadId + '?offset=' + start);
+                            xhr.send(file.slice(start, end));
+                        });
+                    }
+                    
+                    function savedUpload(key, uploadId) {
+                        // Remembers unfinished uploads so picking the same file again resumes it
+                        try {
+                            if (uploadId === undefined) {
+                                return localStorage.getItem(key);
+                            } else if (uploadId === null) {
+                                localStorage.removeItem(key);
+                            } else {
+                                localStorage.setItem(key, uploadId);
+                            }
+                        } catch {
+                            return null;  // Storage disabled, uploads still work but can't resume
+                        }
+                    }
+                    
+                    async function resumableUpload(file, onProgress) {
+                        const key = 'burnbin-upload:' + file.name + ':' + file.size + ':' + file.lastModified;
+                        let upload = null;
+                        const savedId = savedUpload(key);
+                        if (savedId) {
+                            const r = await fetch('/api/upload/' + savedId);
+                            if (r.ok) {
+                                upload = await r.json();
+                            }
+                        }
+                        if (!upload) {
+                            const r = await fetch('/api/upload/init', {
+                                method: 'POST',
+                                headers: {'Content-Type': 'application/json'},
+                                body: JSON.stringify({name: file.name, size: file.size})
+                            });
+                            upload = await r.json();
+                            if (!r.ok) {
+                                throw new Error(upload.error || 'Upload failed');
+                            }
+                            savedUpload(key, upload.upload_id);
+                        }
+                        
+                        // Split whatever the server is still missing into chunks
+                        const chunks = [];
+                        for (const [start, end] of upload.missing) {
+                            for (let offset = start; offset < end; offset += upload.chunk_size) {
+                                chunks.push([offset, Math.min(offset + upload.chunk_size, end)]);
+                            }
+                        }
+                        let done = upload.received;
+                        const inFlight = {};  // {chunk start: bytes sent so far}
+                        const report = () => {
+                            onProgress(done + Object.values(inFlight).reduce((a, b) => a + b, 0), file.size);
+                        };
+                        
+                        async function worker() {
+                            while (chunks.length) {
+                                const [start, end] = chunks.shift();
+                                for (let attempt = 1; ; attempt++) {
+                                    try {
+                                        await sendChunk(upload.upload_id, file, start, end, loaded => {
+                                            inFlight[start] = loaded;
+                                            report();
+                                        });
+                                        break;
+                                    } catch (err) {
+                                        inFlight[start] = 0;
+                                        if (attempt >= UPLOAD_RETRIES) {
+                                            throw err;
+                                        }
+                                        // Most likely a tunnel hiccup, back off and send it again
+                                        await new Promise(resolve => setTimeout(resolve, 1000 * attempt));
+                                    }
+                                }
+                                delete inFlight[start];
+                                done += end - start;
+                                report();
+                            }
+                        }
+                        
+                        report();
+                        await Promise.all(Array.from({length: UPLOAD_PARALLEL}, worker));
+                        
+                        const r = await fetch('/api/upload/' + upload.upload_id + '/finalize', {method: 'POST'});
+                        const data = await r.json();
+                        if (!r.ok) {
+                            throw new Error(data.error || 'Upload failed');
+                        }
+                        savedUpload(key, null);
+                        return data;
+                    }
+                    
                     // Upload form handler with real progress tracking
                     document.getElementById('uploadForm').addEventListener('submit', function(e) {
                         e.preventDefault();
@@ -963,114 +4176,86 @@ class FileShareApp:
                         
                         const file = fileInput.files[0];
                         const fileSize = file.size;
-                        const formData = new FormData();
-                        formData.append('file', file);
                         
                         // Show progress bar
                         progressContainer.style.display = 'block';
                         statusDiv.style.display = 'none';
                         
-                        // Use XMLHttpRequest for upload progress tracking
-                        const xhr = new XMLHttpRequest();
-                        
-                        // Track upload progress
-                        xhr.upload.addEventListener('progress', function(e) {
-                            if (e.lengthComputable) {
-                                const percentComplete = (e.loaded / e.total) * 100;
-                                const mbLoaded = (e.loaded / (1024 * 1024)).toFixed(2);
-                                const mbTotal = (e.total / (1024 * 1024)).toFixed(2);
-                                
+                        resumableUpload(file, (loaded, total) => {
+                            const percentComplete = total ? (loaded / total) * 100 : 100;
+                            const mbLoaded = (loaded / (1024 * 1024)).toFixed(2);
+                            const mbTotal = (total / (1024 * 1024)).toFixed(2);
+                            
+                            if (progressFill) {
+                                progressFill.style.width = percentComplete + '%';
+                                progressFill.textContent = Math.round(percentComplete) + '%';
+                            }
+                            
+                            if (progressText) {
+                                progressText.textContent = `Uploading... ${mbLoaded} MB / ${mbTotal} MB (${Math.round(percentComplete)}%)`;
+                            }
+                        })
+                            .then(() => {
                                 if (progressFill) {
-                                    progressFill.style.width = percentComplete + '%';
-                                    progressFill.textContent = Math.round(percentComplete) + '%';
+                                    progressFill.style.width = '100%';
+                                    progressFill.textContent = '100%';
                                 }
-                                
                                 if (progressText) {
-                                    progressText.textContent = `Uploading... ${mbLoaded} MB / ${mbTotal} MB (${Math.round(percentComplete)}%)`;
+                                    const mbTotal = (fileSize / (1024 * 1024)).toFixed(2);
+                                    progressText.textContent = `Upload complete! ${mbTotal} MB`;
                                 }
-                            }
-                        });
-                        
-                        // Handle completion
-                        xhr.addEventListener('load', function() {
-                            if (xhr.status === 200) {
-                                try {
-                                    const data = JSON.parse(xhr.responseText);
-                                    if (data.status === 'success') {
-                                        if (progressFill) {
-                                            progressFill.style.width = '100%';
-                                            progressFill.textContent = '100%';
-                                        }
-                                        if (progressText) {
-                                            const mbTotal = (fileSize / (1024 * 1024)).toFixed(2);
-                                            progressText.textContent = `Upload complete! ${mbTotal} MB`;
-                                        }
-                                        
-                                        statusDiv.textContent = '✅ File uploaded successfully!';
-                                        statusDiv.style.color = '#ff6b35';
-                                        statusDiv.style.display = 'block';
-                                        fileInput.value = '';
-                                        
-                                        // Hide progress after 3 seconds
-                                        setTimeout(() => {
-                                            progressContainer.style.display = 'none';
-                                            statusDiv.style.display = 'none';
-                                        }, 3000);
-                                        
-                                        // Refresh file list
-                                        updateFileList();
-                                    } else {
-                                        throw new Error(data.error || 'Upload failed');
-                                    }
-                                } catch (err) {
-                                    statusDiv.textContent = '❌ Error: ' + err.message;
-                                    statusDiv.style.color = '#ff4444';
-                                    statusDiv.style.display = 'block';
+                                
+                                statusDiv.textContent = '✅ File uploaded successfully!';
+                                statusDiv.style.color = '#ff6b35';
+                                statusDiv.style.display = 'block';
+                                fileInput.value = '';
+                                
+                                // Hide progress after 3 seconds
+                                setTimeout(() => {
                                     progressContainer.style.display = 'none';
+                                    statusDiv.style.display = 'none';
+                                }, 3000);
+                                
+                                // Refresh file list
+                                if (!eventStream) {
+                                    updateFileList();
                                 }
-                            } else {
-                                try {
-                                    const data = JSON.parse(xhr.responseText);
-                                    statusDiv.textContent = '❌ Error: ' + (data.error || 'Upload failed');
-                                } catch {
-                                    statusDiv.textContent = '❌ Error: Upload failed (HTTP ' + xhr.status + ')';
-                                }
+                            })
+                            .catch(err => {
+                                statusDiv.textContent = '❌ Error: ' + err.message + ' (upload the same file again to resume)';
                                 statusDiv.style.color = '#ff4444';
                                 statusDiv.style.display = 'block';
                                 progressContainer.style.display = 'none';
-                            }
-                        });
-                        
-                        // Handle errors
-                        xhr.addEventListener('error', function() {
-                            statusDiv.textContent = '❌ Error: Network error during upload';
-                            statusDiv.style.color = '#ff4444';
-                            statusDiv.style.display = 'block';
-                            progressContainer.style.display = 'none';
-                        });
-                        
-                        // Start upload
-                        xhr.open('POST', '/api/upload');
-                        xhr.send(formData);
+                            });
                     });
                     
-                    updateFileList();
-                    setInterval(updateFileList, 2000);
+                    connectEvents();
                 </script>
             </body>
             </html>
             """
         
+        # The page never changes while we run: compress it once, tag it by content
+        page = html_template.encode('utf-8')
+        page_variants = compress_variants(page)
+        page_etag = hashlib.sha1(page).hexdigest()[:16]
+        
+        @self.flask_app.before_request
+        def label_route():
+            # Route label for the metrics middleware: the rule, never the raw path
+            if request.url_rule is not None:
+                request.environ['burnbin.route'] = request.url_rule.rule
+        
         @self.flask_app.route('/')
         def index():
-            return html_template
+            return self.cached_response(page_variants, page_etag, 'text/html')
         
         # Add catch-all route to handle any path issues (redirect unknown paths to root)
         @self.flask_app.route('/<path:path>')
         def catch_all(path):
             # If it's not a known API route, redirect to root
             if not path.startswith(('api/', 'download/', 'download-upload/')):
-                return html_template
+                return self.cached_response(page_variants, page_etag, 'text/html')
             return "Not found", 404
         
         @self.flask_app.route('/download/<file_id>')
@@ -1083,78 +4268,141 @@ class FileShareApp:
             
             if not os.path.exists(file_path):
                 return "File not found", 404
+            if os.path.isdir(file_path):
+                return self.download_folder(request, file_id, file_info)
             
-            # Get session ID from query parameter or create new one
-            session_id = request.args.get('session')
-            file_size = os.path.getsize(file_path)
+            # Validators let clients resume with Range/If-Range
+            stat = os.stat(file_path)
+            file_size = stat.st_size
+            etag, last_modified = self.file_validators(stat)
+            headers = {
+                'Content-Disposition': f'attachment; filename="{file_info["name"]}"',
+                'Accept-Ranges': 'bytes',
+                'ETag': etag,
+                'Last-Modified': last_modified,
+                'Cache-Control': 'no-cache'  # Prevent caching for accurate progress
+            }
             
-            if session_id and session_id in self.download_sessions:
-                # Use existing session
-                self.download_sessions[session_id]['status'] = 'downloading'
-                self.download_sessions[session_id]['start_time'] = datetime.now()
-            else:
-                # Create new session if not provided
-                session_id = str(uuid.uuid4())
-                self.download_sessions[session_id] = {
-                    'file_id': file_id,
-                    'start_time': datetime.now(),
-                    'progress': 0,
-                    'status': 'downloading',
-                    'file_size': file_size,
-                    'bytes_sent': 0
-                }
+            # Text-like files go out compressed when enabled and accepted.
+            # A cached copy is sent like any file (ranges work), otherwise
+            # the whole file is compressed on the fly without ranges, so a
+            # Range request gets its range of the uncompressed file instead
+            coding = None
+            body_path, body_size = file_path, file_size
+            if (self.compress_downloads and file_size >= self.compress_min_size
+                    and is_compressible(file_info['name'])):
+                headers['Vary'] = 'Accept-Encoding'
+                coding = choose_encoding(request.headers.get('Accept-Encoding'), STREAM_CODECS)
+            cache_key = None
+            if coding is not None:
+                cache_key = self.variants.key(file_path, stat, coding)
+                cached = self.variants.lookup(cache_key)
+                if cached is not None:
+                    body_path, body_size = cached, os.path.getsize(cached)
+                elif 'Range' in request.headers:
+                    coding = None
+            if coding is not None:
+                etag = f'{etag[:-1]}-{coding}"'
+                headers['ETag'] = etag
+                headers['Content-Encoding'] = coding
+            streaming = coding is not None and body_path == file_path
+            if streaming:
+                headers['Accept-Ranges'] = 'none'
+            
+            ranges = None if streaming else self.requested_ranges(request, body_size, etag, last_modified)
+            if ranges == []:
+                headers['Content-Range'] = f'bytes */{body_size}'
+                return Response("Requested range not satisfiable", status=416, headers=headers)
             
-            # Increment download count
-            self.shared_files[file_id]['downloads'] += 1
-            self.save_shared_files()  # Persist download count
+            # Work out what goes on the wire: [(part_header, start, end)]
+            status = 200
+            mimetype = 'application/octet-stream'
+            closing = b''
+            if ranges is None:
+                parts = [(b'', 0, body_size)]
+            elif len(ranges) == 1:
+                status = 206
+                start, end = ranges[0]
+                parts = [(b'', start, end)]
+                headers['Content-Range'] = f'bytes {start}-{end - 1}/{body_size}'
+            else:
+                status = 206
+                boundary = uuid.uuid4().hex
+                mimetype = f'multipart/byteranges; boundary={boundary}'
+                parts = [
+                    (
+                        f'\r\n--{boundary}\r\n'
+                        f'Content-Type: application/octet-stream\r\n'
+                        f'Content-Range: bytes {start}-{end - 1}/{body_size}\r\n\r\n'.encode(),
+                        start,
+                        end
+                    )
+                    for start, end in ranges
+                ]
+                closing = f'\r\n--{boundary}--\r\n'.encode()
+            transfer_size = sum(end - start for _, start, end in parts)
+            if not streaming:
+                headers['Content-Length'] = str(
+                    transfer_size + sum(len(part_header) for part_header, _, _ in parts) + len(closing)
+                )
+            if request.method == 'HEAD':
+                # No body goes out, so there is no session to track or download to count
+                return Response(iter(()), status=status, mimetype=mimetype, headers=headers)
             
-            # Log activity
-            self.log_activity(f"Download started: {file_info['name']} (Session: {session_id[:8]})")
+            session_id, session = self.bind_download_session(request, file_id, file_size, transfer_size)
+            headers['X-Session-Id'] = session_id  # Include session ID for progress tracking
+            release = self.admit_download(session_id, session, [file_id])
+            if release is None:
+                return self.busy_response()
             
-            # Create a generator to track progress with larger chunks for better performance
-            def generate():
-                with open(file_path, 'rb') as f:
-                    while True:
-                        chunk = f.read(131072)  # 128KB chunks for better performance
-                        if not chunk:
-                            break
-                        self.download_sessions[session_id]['bytes_sent'] += len(chunk)
-                        progress = (self.download_sessions[session_id]['bytes_sent'] / file_size) * 100
-                        self.download_sessions[session_id]['progress'] = progress
-                        yield chunk
-                
-                # Mark as completed
-                self.download_sessions[session_id]['status'] = 'completed'
-                self.download_sessions[session_id]['end_time'] = datetime.now()
-                duration = (self.download_sessions[session_id]['end_time'] - 
-                           self.download_sessions[session_id]['start_time']).total_seconds()
+            # Resumed/partial requests continue a download rather than start one
+            if parts[0][1] == 0:
+                self.count_download(file_id, session_id, f", {coding}" if coding else "")
+            else:
                 self.log_activity(
-                    f"Download completed: {file_info['name']} "
-                    f"({self.format_size(file_size)} in {duration:.1f}s)"
+                    f"Download resumed: {file_info['name']} at {self.format_size(parts[0][1])} "
+                    f"(Session: {session_id[:8]})"
                 )
+            callbacks = self.download_callbacks(session_id, session, file_info['name'], transfer_size)
+            callbacks['throttle'] = self.bandwidth.throttle(session['client_ip'], file_id)
             
-            return Response(
-                generate(),
-                mimetype='application/octet-stream',
-                headers={
-                    'Content-Disposition': f'attachment; filename="{file_info["name"]}"',
-                    'Content-Length': str(file_size),
-                    'X-Session-Id': session_id,  # Include session ID for progress tracking
-                    'Cache-Control': 'no-cache'  # Prevent caching for accurate progress
-                }
-            )
+            if streaming:
+                body = CompressedStream(
+                    file_path,
+                    coding,
+                    self.compress_pool,
+                    cache=self.variants,
+                    cache_key=cache_key,
+                    **callbacks
+                )
+            else:
+                body = FileRangeStream(
+                    body_path,
+                    parts,
+                    closing,
+                    environ=request.environ,
+                    use_sendfile=self.use_sendfile,
+                    **callbacks
+                )
+            response = Response(body, status=status, mimetype=mimetype, headers=headers)
+            response.call_on_close(release)
+            return response
         
         @self.flask_app.route('/api/files')
         def api_files():
-            files = []
-            for file_id, file_info in self.shared_files.items():
-                files.append({
-                    'id': file_id,
-                    'name': file_info['name'],
-                    'size': file_info['size'],
-                    'upload_time': file_info['upload_time']
-                })
-            return jsonify({'files': files})
+            return self.cached_json('files', self.files_version, lambda: {'files': self.file_list()})
+        
+        @self.flask_app.route('/api/events')
+        def api_events():
+            """Server-Sent Events: the file list on every change, progress of this page's downloads"""
+            stream = self.events.subscribe(request.environ, [('files', {'files': self.file_list()})])
+            if stream is None:
+                # The page polls instead
+                return jsonify({'error': 'Too many event streams'}), 503
+            return Response(stream, mimetype='text/event-stream', headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            })
         
         @self.flask_app.route('/api/track-download', methods=['POST'])
         def track_download():
@@ -1176,87 +4424,276 @@ class FileShareApp:
             if not os.path.exists(file_path):
                 return jsonify({'error': 'File not found'}), 404
             
-            # Create session
+            # Create session, bound to the page's event stream if it has one
             session_id = str(uuid.uuid4())
-            file_size = os.path.getsize(file_path)
-            self.download_sessions[session_id] = {
+            file_size = 0 if os.path.isdir(file_path) else os.path.getsize(file_path)  # Folders are sized when listed
+            stream_id = request.args.get('stream')
+            if stream_id not in self.events.streams:
+                stream_id = None
+            self.download_sessions.add(session_id, {
                 'file_id': file_id,
                 'start_time': datetime.now(),
                 'progress': 0,
                 'status': 'pending',
                 'file_size': file_size,
-                'bytes_sent': 0
-            }
+                'bytes_sent': 0,
+                'stream': stream_id
+            })
             
             return jsonify({
                 'session_id': session_id,
                 'file_size': file_size,
-                'download_url': f'/download/{file_id}?session={session_id}'
+                'download_url': f'/download/{file_id}?session={session_id}',
+                'pushed': stream_id is not None
+            })
+        
+        @self.flask_app.route('/api/start-bulk-download', methods=['POST'])
+        def start_bulk_download():
+            """Create one download session for several files, sent as a single ZIP"""
+            data = request.get_json(silent=True) or {}
+            file_ids = self.bulk_file_ids(data.get('file_ids'))
+            if not file_ids:
+                return jsonify({'error': 'No files selected'}), 400
+            
+            session_id = str(uuid.uuid4())
+            stream_id = data.get('stream')
+            if stream_id not in self.events.streams:
+                stream_id = None
+            self.download_sessions.add(session_id, {
+                'file_id': ','.join(file_ids),
+                'file_ids': file_ids,
+                'start_time': datetime.now(),
+                'progress': 0,
+                'status': 'pending',
+                'file_size': 0,
+                'bytes_sent': 0,
+                'stream': stream_id
+            })
+            return jsonify({
+                'session_id': session_id,
+                'file_count': len(file_ids),
+                'download_url': f'/download-bulk?session={session_id}',
+                'pushed': stream_id is not None
             })
         
+        @self.flask_app.route('/download-bulk')
+        def download_bulk():
+            """Several shared files as one ZIP: a session's files or ?files=id,id,..."""
+            session_id = request.args.get('session')
+            session = self.download_sessions.get(session_id) if session_id else None
+            if session is not None and 'file_ids' in session:
+                file_ids = self.bulk_file_ids(session['file_ids'])
+            else:
+                file_ids = self.bulk_file_ids(request.args.get('files', '').split(','))
+            if not file_ids:
+                return "File not found", 404
+            
+            entries = []
+            owners = []
+            taken = set()
+            for file_id in file_ids:
+                file_info = self.shared_files.get(file_id)
+                if file_info is None:
+                    continue
+                file_path = file_info['path']
+                name = unique_name(file_info['name'], taken)
+                if os.path.isdir(file_path):
+                    entries += [
+                        (f"{name}/{arcname.split('/', 1)[1]}", path, size, mtime)
+                        for arcname, path, size, mtime in folder_entries(file_path)
+                    ]
+                else:
+                    try:
+                        info = os.stat(file_path)
+                    except OSError:
+                        continue
+                    entries.append((name, file_path, info.st_size, info.st_mtime))
+                owners += [file_id] * (len(entries) - len(owners))
+            return self.send_archive(
+                request, file_ids, f"burnbin-{len(file_ids)}-files.zip", entries, f", bulk of {len(file_ids)}",
+                owners
+            )
+        
         @self.flask_app.route('/api/download-progress/<session_id>')
         def get_download_progress(session_id):
-            if session_id in self.download_sessions:
-                session = self.download_sessions[session_id]
-                return jsonify({
-                    'progress': session['progress'],
-                    'status': session['status'],
-                    'bytes_sent': session.get('bytes_sent', 0),
-                    'file_size': session.get('file_size', 0)
-                })
+            session = self.download_sessions.get(session_id)
+            if session is not None:
+                return jsonify(self.session_progress(session_id, session))
             return jsonify({'error': 'Session not found'}), 404
         
+        @self.flask_app.route('/api/stats')
+        def get_stats():
+            """Server internals, only for this machine unless public_metrics"""
+            if not self.public_metrics and not self.is_local_request(request):
+                return "Not found", 404
+            return jsonify({
+                'sessions': self.download_sessions.stats(),
+                'events': self.events.stats(),
+                'uploads': self.blobs.stats(),
+                'compression': self.variants.stats() if self.variants is not None else None,
+                'bandwidth': self.bandwidth.limits(),
+                'downloads': self.admission.stats()
+            })
+        
+        @self.flask_app.route('/metrics')
+        def get_metrics():
+            """Prometheus scrape target, only for this machine unless public_metrics"""
+            if not self.public_metrics and not self.is_local_request(request):
+                return "Not found", 404
+            return Response(
+                '\n'.join(self.render_metrics()) + '\n',
+                content_type='text/plain; version=0.0.4; charset=utf-8'
+            )
+        
+        @self.flask_app.route('/api/profile', methods=['GET', 'POST', 'DELETE'])
+        def api_profile():
+            """Start (POST ?mode=sample|cprofile&seconds=N), stop (DELETE) or check a profile, local only"""
+            if not self.is_local_request(request):
+                return "Not found", 404
+            if request.method == 'POST':
+                mode = request.args.get('mode', 'sample')
+                seconds = request.args.get('seconds', 30, type=float)
+                if mode not in Profiler.modes:
+                    return jsonify({'error': f"mode must be one of {', '.join(Profiler.modes)}"}), 400
+                if not 0 < seconds <= Profiler.max_seconds:
+                    return jsonify({'error': f'seconds must be between 0 and {Profiler.max_seconds}'}), 400
+                if not self.profiler.start(mode, seconds):
+                    return jsonify({'error': 'A profile is already running'}), 409
+                self.log_activity(f"Profiling started: {mode} for {seconds:g}s")
+            elif request.method == 'DELETE':
+                self.profiler.stop()
+            return jsonify(self.profiler.status())
+        
         @self.flask_app.route('/api/upload', methods=['POST'])
         def upload_file():
-            if 'file' not in request.files:
+            # Refuse oversize bodies before reading any of them
+            if self.upload_too_large(request.content_length):
+                return jsonify({'error': 'File too large'}), 413
+            boundary = request.mimetype_params.get('boundary')
+            if request.mimetype != 'multipart/form-data' or not boundary:
                 return jsonify({'error': 'No file provided'}), 400
             
-            file = request.files['file']
-            if file.filename == '':
-                return jsonify({'error': 'No file selected'}), 400
-            
-            # Generate unique file ID
+            # Parse the body as it arrives and write the file part straight
+            # into uploads/, instead of spooling it to a temp file first.
+            # Once its hash is known it moves into (or is dropped for) its blob
             file_id = str(uuid.uuid4())
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(self.uploads_dir, f"{file_id}_{filename}")
-            
-            # Save file
-            file.save(file_path)
-            file_size = os.path.getsize(file_path)
-            
-            # Get real client IP
-            client_ip = self.get_client_ip(request)
+            try:
+                for params, chunks in MultipartReader(request.stream, boundary):
+                    if params.get('name') != 'file' or 'filename' not in params:
+                        continue
+                    filename = secure_filename(params['filename'])
+                    if not filename:
+                        return jsonify({'error': 'No file selected'}), 400
+                    
+                    temp_path = os.path.join(self.uploads_dir, f"{file_id}_{filename}.part")
+                    file_size, digest = self.write_upload(temp_path, chunks)
+                    if file_size is None:
+                        return jsonify({'error': 'File too large'}), 413
+                    file_path = self.blobs.add(temp_path, digest)
+                    self.register_upload(
+                        file_id, file_path, filename, self.get_client_ip(request), file_size, digest
+                    )
+                    return jsonify({
+                        'status': 'success',
+                        'file_id': file_id,
+                        'size': file_size,
+                        'sha256': digest,
+                        'message': 'File uploaded successfully'
+                    })
+            except ValueError:
+                return jsonify({'error': 'Malformed or incomplete upload'}), 400
+            return jsonify({'error': 'No file provided'}), 400
+        
+        # Resumable uploads: init, PUT chunks at offsets (in any order), status, finalize
+        @self.flask_app.route('/api/upload/init', methods=['POST'])
+        def upload_init():
+            data = request.get_json(silent=True) or {}
+            filename = secure_filename(str(data.get('name') or ''))
+            size = data.get('size')
+            if not filename:
+                return jsonify({'error': 'No file selected'}), 400
+            if not isinstance(size, int) or isinstance(size, bool) or size < 0:
+                return jsonify({'error': 'Invalid file size'}), 400
+            if self.upload_too_large(size):
+                return jsonify({'error': 'File too large'}), 413
             
-            # Store file info
-            self.uploaded_files[file_id] = {
-                'path': file_path,
-                'name': filename,
-                'size': self.format_size(file_size),
-                'upload_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'uploader_ip': client_ip
-            }
+            try:
+                upload = self.resumable.create(filename, size, self.get_client_ip(request))
+            except ValueError:
+                return jsonify({'error': 'Too many uploads in progress, finish or wait for one first'}), 429
+            except OSError as e:
+                return jsonify({'error': f'Not enough space for this file: {e.strerror}'}), 507
+            return jsonify(self.resumable.status(upload))
+        
+        @self.flask_app.route('/api/upload/<upload_id>', methods=['GET'])
+        def upload_status(upload_id):
+            upload = self.resumable.get(upload_id)
+            if upload is None:
+                return jsonify({'error': 'Upload not found'}), 404
+            return jsonify(self.resumable.status(upload))
+        
+        @self.flask_app.route('/api/upload/<upload_id>', methods=['PUT'])
+        def upload_chunk(upload_id):
+            upload = self.resumable.get(upload_id)
+            if upload is None:
+                return jsonify({'error': 'Upload not found'}), 404
+            length = request.content_length
+            if length is None:
+                return jsonify({'error': 'Content-Length required'}), 411
+            offset = request.args.get('offset', type=int)
+            if offset is None:
+                return jsonify({'error': 'offset required'}), 400
+            if length > self.resumable.max_chunk:
+                return jsonify({'error': 'Chunk too large'}), 413
             
-            # Log activity
-            self.log_activity(f"File uploaded: {filename} (from {client_ip})")
+            try:
+                written = self.resumable.write(upload, offset, request.stream, length)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 416
+            self.metrics.add('burnbin_upload_bytes_total', written)
+            if written < length:
+                return jsonify({'error': 'Incomplete chunk'}), 400
+            return jsonify({'received': written})
+        
+        @self.flask_app.route('/api/upload/<upload_id>/finalize', methods=['POST'])
+        def upload_finalize(upload_id):
+            upload = self.resumable.get(upload_id)
+            if upload is None:
+                return jsonify({'error': 'Upload not found'}), 404
+            missing = self.resumable.missing(upload)
+            if missing:
+                return jsonify({'error': 'Upload incomplete', 'missing': missing}), 409
             
+            try:
+                self.resumable.finish(upload)
+            except KeyError:
+                return jsonify({'error': 'Upload not found'}), 404
+            # Chunks came in any order, so the hash takes a read pass at the end
+            digest = self.blobs.digest(upload['part_path'])
+            file_path = self.blobs.add(upload['part_path'], digest)
+            self.register_upload(
+                upload['id'], file_path, upload['name'], upload['client_ip'], upload['size'], digest
+            )
             return jsonify({
                 'status': 'success',
-                'file_id': file_id,
+                'file_id': upload['id'],
                 'message': 'File uploaded successfully'
             })
         
         @self.flask_app.route('/api/uploaded-files')
         def api_uploaded_files():
-            files = []
-            for file_id, file_info in self.uploaded_files.items():
-                files.append({
-                    'id': file_id,
-                    'name': file_info['name'],
-                    'size': file_info['size'],
-                    'upload_time': file_info['upload_time'],
-                    'uploader_ip': file_info.get('uploader_ip', 'Unknown')
-                })
-            return jsonify({'files': files})
+            def build():
+                files = []
+                for file_id, file_info in list(self.uploaded_files.items()):
+                    files.append({
+                        'id': file_id,
+                        'name': file_info['name'],
+                        'size': file_info['size'],
+                        'upload_time': file_info['upload_time'],
+                        'uploader_ip': file_info.get('uploader_ip', 'Unknown')
+                    })
+                return {'files': files}
+            return self.cached_json('uploads', self.uploads_version, build)
         
         @self.flask_app.route('/download-upload/<file_id>')
         def download_uploaded_file(file_id):
@@ -1277,6 +4714,1423 @@ class FileShareApp:
                 download_name=file_info['name']
             )
     
+    def share_path(self, file_path):
+        """Register a file or folder on disk for sharing and return its file ID
+        
+        Folders are sent as ZIP archives and listed again on every download,
+        so their size here is only what the listing shows.
+        """
+        file_id = str(uuid.uuid4())
+        is_folder = os.path.isdir(file_path)
+        if is_folder:
+            file_name = os.path.basename(os.path.normpath(file_path))
+            file_size = sum(size for _, _, size, _ in folder_entries(file_path))
+        else:
+            file_name = os.path.basename(file_path)
+            file_size = os.path.getsize(file_path)
+        upload_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.shared_files[file_id] = {
+            'path': file_path,
+            'name': file_name,
+            'size': self.format_size(file_size),
+            'upload_time': upload_time,
+            'downloads': 0
+        }
+        if is_folder:
+            self.shared_files[file_id]['folder'] = True
+        self.log_activity(f"{'Folder' if is_folder else 'File'} shared: {file_name}")
+        self.store.put_share(file_id, file_path, file_name, file_size, upload_time)  # Persist changes
+        self.files_changed()
+        return file_id
+    
+    def upload_too_large(self, size):
+        return self.max_upload_size is not None and size is not None and size > self.max_upload_size
+    
+    def write_upload(self, file_path, chunks):
+        """Write an upload's bytes to file_path, measuring and hashing them on the way
+        
+        Returns (size, sha256 hex) or (None, None) once the upload passes
+        max_upload_size. Nothing is left on disk unless it succeeds.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(file_path, 'wb') as f:
+                for data in chunks:
+                    size += len(data)
+                    self.metrics.add('burnbin_upload_bytes_total', len(data))
+                    if self.upload_too_large(size):
+                        break
+                    f.write(data)
+                    digest.update(data)
+        except BaseException:
+            os.remove(file_path)
+            raise
+        if self.upload_too_large(size):
+            os.remove(file_path)
+            return None, None
+        return size, digest.hexdigest()
+    
+    def register_upload(self, file_id, file_path, filename, client_ip, file_size, digest):
+        """Record an upload stored as a blob and persist it"""
+        upload_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.uploaded_files[file_id] = {
+            'path': file_path,
+            'name': filename,
+            'size': self.format_size(file_size),
+            'upload_time': upload_time,
+            'uploader_ip': client_ip,
+            'sha256': digest
+        }
+        self.store.put_upload(file_id, file_path, filename, file_size, upload_time, client_ip)
+        self.uploads_changed()
+        
+        # Log activity
+        self.log_activity(f"File uploaded: {filename} (from {client_ip})")
+    
+    def share_upload(self, upload_file_id):
+        """Share an uploaded file under a new file ID and return it"""
+        file_info = self.uploaded_files[upload_file_id]
+        
+        # Generate new unique file ID for sharing
+        share_file_id = str(uuid.uuid4())
+        file_size = os.path.getsize(file_info['path'])
+        upload_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.shared_files[share_file_id] = {
+            'path': file_info['path'],
+            'name': file_info['name'],
+            'size': self.format_size(file_size),
+            'upload_time': upload_time,
+            'downloads': 0
+        }
+        
+        self.log_activity(f"Uploaded file shared: {file_info['name']}")
+        self.store.put_share(  # Persist changes
+            share_file_id, file_info['path'], file_info['name'], file_size, upload_time
+        )
+        self.files_changed()
+        return share_file_id
+    
+    def remove_shared_file(self, file_id):
+        """Stop sharing a file, returns the removed entry or None"""
+        file_info = self.shared_files.pop(file_id, None)
+        if file_info is not None:
+            self.log_activity(f"File removed: {file_info['name']}")
+            self.store.remove_shares([file_id])  # Persist changes
+            self.files_changed()
+        return file_info
+    
+    def remove_uploaded_file(self, file_id):
+        """Delete an uploaded file from disk and forget it (raises OSError on failure)"""
+        file_info = self.uploaded_files.get(file_id)
+        if file_info is None:
+            return None
+        
+        # Delete the blob from disk unless other uploads share it
+        self.blobs.release(file_info['path'])
+        
+        del self.uploaded_files[file_id]
+        self.store.remove_uploads([file_id])
+        self.uploads_changed()
+        self.log_activity(f"Uploaded file removed: {file_info['name']}")
+        return file_info
+    
+    def file_list(self):
+        """Shared files as the page shows them"""
+        return [
+            {
+                'id': file_id,
+                'name': file_info['name'],
+                'size': file_info['size'],
+                'upload_time': file_info['upload_time'],
+                'folder': file_info.get('folder', False)
+            }
+            for file_id, file_info in list(self.shared_files.items())
+        ]
+    
+    def files_changed(self):
+        """Bump the file list version and push the list to open pages, once per burst of changes"""
+        self.notify_change('files')
+        with self.files_lock:
+            self.files_version += 1
+            if self.files_timer is not None:
+                return
+            self.files_timer = threading.Timer(self.files_debounce, self.publish_files)
+            self.files_timer.daemon = True
+            self.files_timer.start()
+    
+    def publish_files(self):
+        with self.files_lock:
+            self.files_timer = None
+        self.events.publish('files', {'files': self.file_list()})
+    
+    def uploads_changed(self):
+        with self.files_lock:
+            self.uploads_version += 1
+        self.notify_change('uploads')
+    
+    def notify_change(self, kind, payload=None):
+        for listener in list(self.change_listeners):
+            try:
+                listener(kind, payload)
+            except Exception:
+                # A broken listener must never take down a request thread
+                pass
+    
+    def cached_response(self, variants, etag, mimetype):
+        """Serve a precompressed body with its ETag, or 304 if the client has it"""
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'), variants)
+        # Each encoding is a different representation and needs its own tag
+        etag = f'"{etag}"' if encoding == 'identity' else f'"{etag}-{encoding}"'
+        headers = {
+            'ETag': etag,
+            'Cache-Control': 'no-cache',  # Always revalidate, a 304 costs next to nothing
+            'Vary': 'Accept-Encoding'
+        }
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            return Response(status=304, headers=headers)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(variants[encoding], mimetype=mimetype, headers=headers)
+    
+    def cached_json(self, name, version, build):
+        """JSON for a registry listing, rebuilt only when its version moves"""
+        cached = self.json_cache.get(name)
+        if cached is None or cached[0] != version:
+            body = json.dumps(build(), separators=(',', ':')).encode('utf-8')
+            variants = compress_variants(body, level=5) if len(body) >= 1024 else {'identity': body}
+            cached = self.json_cache[name] = (version, variants)
+        return self.cached_response(cached[1], f"{name}-{self.boot_id}-{version}", 'application/json')
+    
+    def session_progress(self, session_id, session):
+        return {
+            'session_id': session_id,
+            'progress': session['progress'],
+            'status': session['status'],
+            'bytes_sent': session.get('bytes_sent', 0),
+            'file_size': session.get('file_size', 0),
+            'transfer_size': session.get('transfer_size', session.get('file_size', 0)),
+            'queue_position': session.get('queue_position')
+        }
+    
+    def push_progress(self, session_id, session, force=False):
+        """Send a download's progress to the page that started it, rate limited"""
+        stream_id = session.get('stream')
+        if stream_id is None:
+            return
+        now = time.monotonic()
+        if not force and now - session.get('pushed_at', 0) < self.progress_interval:
+            return
+        session['pushed_at'] = now
+        if not self.events.send(stream_id, 'progress', self.session_progress(session_id, session)):
+            session['stream'] = None  # Page is gone
+    
+    def file_link(self, file_id):
+        """Public download link for a shared file, or None until the tunnel is up"""
+        if self.public_url:
+            return f"{self.public_url}/download/{file_id}"
+        return None
+    
+    def local_url(self):
+        return f"http://127.0.0.1:{self.local_port}"
+    
+    def is_valid_url(self, url):
+        """Validate that URL is properly formatted"""
+        if not url:
+            return False
+        url = url.strip()
+        # Check if it's a valid HTTPS URL with proper domain
+        if url.startswith('https://') and ('.trycloudflare.com' in url or '.cloudflared.net' in url):
+            # Basic validation - check it doesn't have spaces or invalid chars
+            if ' ' not in url and len(url) > 20:
+                return True
+        return False
+    
+    def start_local_server(self):
+        engine_class = SERVER_ENGINES[self.engine_name]
+        try:
+            self.engine = engine_class(self.flask_app, '127.0.0.1', self.local_port, **self.engine_options)
+        except OSError as e:
+            self.log_activity(f"❌ Could not start server on port {self.local_port}: {e}")
+            return
+        self.local_port = self.engine.port  # Resolves port 0 to the one we got
+        # Each queued download holds a worker while it waits, the engine
+        # says how many it can spare besides its event streams
+        self.events.max_streams = self.engine.max_event_streams
+        self.admission.max_queued = min(self.admission.max_queued, self.engine.max_download_waiters)
+        
+        self.server_thread = threading.Thread(target=self.engine.serve_forever, daemon=True)
+        self.server_thread.start()
+        
+        self.server_running = True
+        self.start_cloudflare_tunnel()
+    
+    def check_cloudflared_installed(self, force=False):
+        """Check if cloudflared is installed and available
+        
+        The answer is cached; it is only looked up again with force=True
+        (explicit actions and the PATH watcher).
+        """
+        with self.cloudflared_lock:
+            if self.cloudflared_installed is None or force:
+                self.path_signature = self.get_path_signature()
+                self.cloudflared_installed = self.probe_cloudflared()
+            return self.cloudflared_installed
+    
+    def probe_cloudflared(self):
+        # Look the binary up first so a missing install costs no process spawn
+        if shutil.which('cloudflared') is None:
+            return False
+        try:
+            # Hide console window on Windows
+            creation_flags = 0
+            if sys.platform == 'win32':
+                creation_flags = subprocess.CREATE_NO_WINDOW
+            
+            result = subprocess.run(
+                ['cloudflared', '--version'],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                creationflags=creation_flags
+            )
+            return result.returncode == 0
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return False
+    
+    def get_path_signature(self):
+        """Modification times of the PATH directories, changes when binaries are added"""
+        signature = []
+        for directory in os.environ.get('PATH', '').split(os.pathsep):
+            try:
+                signature.append((directory, os.stat(directory).st_mtime_ns))
+            except OSError:
+                continue
+        return tuple(signature)
+    
+    def watch_for_cloudflared(self):
+        """Start the tunnel once cloudflared shows up on the PATH"""
+        def watch():
+            while self.server_running and not self.cloudflared_installed:
+                time.sleep(self.cloudflared_watch_interval)
+                if self.get_path_signature() == self.path_signature:
+                    continue
+                if self.check_cloudflared_installed(force=True):
+                    self.log_activity("Cloudflared detected, enabling public URLs.")
+                    self.start_cloudflare_tunnel()
+        
+        threading.Thread(target=watch, daemon=True).start()
+    
+    def set_tunnel_state(self, state):
+        """Move the tunnel state machine, see tunnel_states"""
+        self.tunnel_state = state
+    
+    def start_cloudflare_tunnel(self):
+        """Bring the tunnel up in the background, unless it is already coming up or up"""
+        with self.tunnel_lock:
+            if self.tunnel_state in ('checking', 'starting', 'active'):
+                return
+            self.set_tunnel_state('checking')
+        
+        def run_tunnel():
+            # Check if cloudflared is available
+            if not self.check_cloudflared_installed():
+                self.set_tunnel_state('missing')
+                self.log_activity("Cloudflared not found. App running in local mode only.")
+                self.log_activity("Click 'Install Cloudflared' button to enable public URLs.")
+                self.watch_for_cloudflared()
+                return
+            
+            self.set_tunnel_state('starting')
+            try:
+                # Start tunnel with a small delay to avoid rapid reconnections
+                self.log_activity("Starting Cloudflare Tunnel...")
+                time.sleep(0.5)  # Small delay to avoid rapid tunnel creation
+                
+                # Hide console window on Windows
+                creation_flags = 0
+                if sys.platform == 'win32':
+                    creation_flags = subprocess.CREATE_NO_WINDOW
+                
+                process = subprocess.Popen(
+                    ['cloudflared', 'tunnel', '--url', f'http://127.0.0.1:{self.local_port}'],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    bufsize=1,
+                    creationflags=creation_flags
+                )
+                
+                self.cloudflare_process = process
+                
+                # Read output to get public URL
+                import re
+                url_found = False
+                timeout = time.time() + 30  # 30 second timeout
+                error_messages = []
+                
+                for line in process.stdout:
+                    if time.time() > timeout:
+                        self.log_activity("Timeout waiting for tunnel URL")
+                        break
+                    
+                    # Log tunnel output for debugging
+                    line_stripped = line.strip()
+                    if line_stripped:
+                        # Check for error messages indicating rate limits or issues
+                        line_lower = line_stripped.lower()
+                        if any(keyword in line_lower for keyword in ['error', 'failed', 'limit', 'rate', 'quota', 'too many']):
+                            error_messages.append(line_stripped)
+                            self.log_activity(f"⚠️ Tunnel warning: {line_stripped}")
+                        
+                        # Only log non-error lines if verbose (to reduce spam)
+                        elif 'https://' in line_stripped or 'tunnel' in line_lower:
+                            self.log_activity(f"Tunnel: {line_stripped}")
+                    
+                    # Look for cloudflare tunnel URLs (trycloudflare.com or cloudflared.net domain)
+                    # Updated patterns to match various cloudflared output formats
+                    url_patterns = [
+                        r'https://[a-zA-Z0-9-]+\.trycloudflare\.com',
+                        r'https://[a-zA-Z0-9-]+\.cloudflared\.net',
+                        r'https://[a-zA-Z0-9-]+\.(?:trycloudflare|cloudflared)\.(?:com|net)',
+                    ]
+                    
+                    for pattern in url_patterns:
+                        match = re.search(pattern, line, re.IGNORECASE)
+                        if match:
+                            url = match.group(0).strip()
+                            # Validate URL format
+                            if url.startswith('https://') and ('.trycloudflare.com' in url or '.cloudflared.net' in url):
+                                self.public_url = url
+                                self.set_tunnel_state('active')
+                                self.log_activity(f"✅ Tunnel active! Public URL: {self.public_url}")
+                                url_found = True
+                                break
+                    
+                    if url_found:
+                        break
+                    
+                    if process.poll() is not None:
+                        self.log_activity("❌ Cloudflared process ended unexpectedly")
+                        break
+                
+                if not url_found:
+                    self.set_tunnel_state('failed')
+                    if error_messages:
+                        error_msg = "\n".join(error_messages[-3:])  # Show last 3 errors
+                        self.log_activity("❌ Tunnel failed. Possible Cloudflare rate limit or error:")
+                        self.log_activity(f"   {error_msg}")
+                        self.log_activity("💡 Tip: Wait a few minutes and try again, or restart the app.")
+                    else:
+                        self.log_activity("⚠️ Warning: Could not extract tunnel URL from cloudflared output")
+                        self.log_activity("💡 Tip: Cloudflare may be rate-limiting. Wait 5-10 minutes and restart.")
+                
+            except Exception as e:
+                self.set_tunnel_state('failed')
+                self.log_activity(f"Tunnel error: {str(e)}")
+        
+        tunnel_thread = threading.Thread(target=run_tunnel, daemon=True)
+        tunnel_thread.start()
+    
+    def log_activity(self, message):
+        now = datetime.now()
+        timestamp = now.strftime("%H:%M:%S")
+        log_message = f"[{timestamp}] {message}\n"
+        self.activity.append(now, message, log_message)
+        
+        for listener in list(self.log_listeners):
+            try:
+                listener(log_message)
+            except Exception:
+                # A broken listener must never take down a request thread
+                pass
+    
+    def format_size(self, size_bytes):
+        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+            if size_bytes < 1024.0:
+                return f"{size_bytes:.2f} {unit}"
+            size_bytes /= 1024.0
+        return f"{size_bytes:.2f} PB"
+    
+    def save_shared_files(self):
+        """Write queued download counts and history to the metadata store now"""
+        self.store.flush()
+    
+    def load_shared_files(self):
+        """Load shared and uploaded files from the metadata store on startup"""
+        try:
+            if os.path.exists(self.shared_files_file) or os.path.exists(
+                os.path.splitext(self.shared_files_file)[0] + '.journal'
+            ):
+                migrated = self.store.import_json(self.shared_files_file)
+                self.log_activity(f"Migrated {migrated} shared file(s) from shared_files.json")
+            
+            for file_id, path, name, size, upload_time, downloads in self.store.shares():
+                self.shared_files[file_id] = {
+                    'path': path,
+                    'name': name,
+                    'size': self.format_size(size),
+                    'upload_time': upload_time,
+                    'downloads': downloads
+                }
+            for file_id, path, name, size, upload_time, uploader_ip in self.store.uploads():
+                self.uploaded_files[file_id] = {
+                    'path': path,
+                    'name': name,
+                    'size': self.format_size(size),
+                    'upload_time': upload_time,
+                    'uploader_ip': uploader_ip or 'Unknown'
+                }
+                if os.path.dirname(path) == self.blobs.directory:
+                    self.uploaded_files[file_id]['sha256'] = os.path.basename(path)
+                self.blobs.ref(path)
+            
+            if self.shared_files:
+                self.log_activity(f"Loaded {len(self.shared_files)} shared file(s) from previous session")
+        except Exception as e:
+            self.log_activity(f"Error loading shared files: {str(e)}")
+        
+        # Checking every file on disk is slow for large registries, do it off the startup path
+        threading.Thread(target=self.prune_missing_files, daemon=True).start()
+    
+    def prune_missing_files(self):
+        """Forget shares and uploads whose files are gone, refresh changed sizes"""
+        self.resumable.remove_orphans()
+        for registry, table, remove in (
+            (self.shared_files, 'shares', self.store.remove_shares),
+            (self.uploaded_files, 'uploads', self.store.remove_uploads)
+        ):
+            missing, resized, folders = [], [], []
+            for file_id, file_info in list(registry.items()):
+                try:
+                    info = os.stat(file_info['path'])
+                except OSError:
+                    missing.append(file_id)
+                    continue
+                if stat.S_ISDIR(info.st_mode):
+                    # Shared folder, its size is refreshed when it is downloaded
+                    if not file_info.get('folder'):
+                        file_info['folder'] = True
+                        folders.append(file_id)
+                    continue
+                file_size = info.st_size
+                size = self.format_size(file_size)
+                if size != file_info['size']:
+                    file_info['size'] = size
+                    resized.append((file_size, file_id))
+            
+            for file_id in missing:
+                file_info = registry.pop(file_id, None)
+                if file_info is not None and registry is self.uploaded_files:
+                    self.blobs.forget(file_info['path'])
+            if missing or resized or folders:
+                if registry is self.shared_files:
+                    self.files_changed()
+                else:
+                    self.uploads_changed()
+            try:
+                if missing:
+                    remove(missing)
+                if resized:
+                    self.store.update_sizes(table, resized)
+            except Exception as e:
+                self.log_activity(f"Error saving missing and resized files to the database: {str(e)}")
+    
+    def stop(self):
+        """Shut down the tunnel and the server, then persist state
+        
+        Requests still finishing count downloads and log activity, so the
+        store and the log are closed only once the engine has stopped.
+        """
+        if self.cloudflare_process:
+            self.cloudflare_process.terminate()
+        self.events.close()
+        if self.engine:
+            self.engine.shutdown()
+            if self.server_thread is not None:
+                self.server_thread.join(self.stop_timeout)
+        self.server_running = False
+        if self.compress_pool is not None:
+            self.compress_pool.shutdown(wait=False, cancel_futures=True)
+        self.store.close()
+        self.activity.close()
+
+class UIEventQueue:
+    """Hands events from any thread to the Tk loop
+    
+    Publishing only puts a (kind, payload) tuple on a SimpleQueue, so
+    request threads never wait on or touch Tk. The Tk loop drains it from
+    after() and gets each batch coalesced: log lines in order, the oldest
+    dropped past max_lines, and every other kind reduced to its latest
+    payload, except the `merged` kinds whose payloads are gathered into a
+    set (which rows changed).
+    """
+    def __init__(self, max_lines=500, max_batch=10000, merged=('download',)):
+        self.max_lines = max_lines  # Log lines shown per drain, the rest are counted
+        self.max_batch = max_batch  # Events taken per drain, bounds time spent on the Tk thread
+        self.merged = set(merged)
+        self.events = queue.SimpleQueue()
+    
+    def publish(self, kind, payload=None):
+        self.events.put((kind, payload))
+    
+    def drain(self):
+        """Take pending events, returns (log lines, lines dropped, {kind: latest payload})"""
+        lines, latest = [], {}
+        for _ in range(self.max_batch):
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'log':
+                lines.append(payload)
+            elif kind in self.merged:
+                latest.setdefault(kind, set()).add(payload)
+            else:
+                latest[kind] = payload
+        dropped = max(0, len(lines) - self.max_lines)
+        return lines[dropped:], dropped, latest
+
+class TreePager:
+    """Shows one page of a registry in a Treeview and updates rows in place
+    
+    Only page_size rows exist in the widget, so Tk stays responsive with
+    10k+ entries. Each row remembers the values it was drawn with and is
+    only touched when they change.
+    """
+    def __init__(self, tree, registry, row_values, page_size=500, on_change=None):
+        self.tree = tree
+        self.registry = registry  # {file_id: file_info}
+        self.row_values = row_values  # (file_id, file_info) -> tuple of column values
+        self.page_size = page_size
+        self.on_change = on_change  # Called after the page or entry count changes
+        self.page = 0
+        self.rows = {}  # {file_id: values} of the rows on screen, in order
+    
+    def page_count(self):
+        return max(1, -(-len(self.registry) // self.page_size))
+    
+    def refresh(self):
+        """Redraw the page after entries were added or removed"""
+        order = list(self.registry)
+        self.page = min(self.page, self.page_count() - 1)
+        start = self.page * self.page_size
+        page_ids = order[start:start + self.page_size]
+        if page_ids == list(self.rows):
+            self.update_rows(page_ids)
+        else:
+            selection = self.tree.selection()
+            self.tree.delete(*self.rows)
+            self.rows = {}
+            for file_id in page_ids:
+                file_info = self.registry.get(file_id)
+                if file_info is None:
+                    continue
+                values = self.row_values(file_id, file_info)
+                self.tree.insert("", tk.END, iid=file_id, values=values)
+                self.rows[file_id] = values
+            kept = [file_id for file_id in selection if file_id in self.rows]
+            if kept:
+                self.tree.selection_set(kept)
+        if self.on_change:
+            self.on_change(self)
+    
+    def update_rows(self, file_ids):
+        """Redraw the given rows if they are on this page and their values changed"""
+        for file_id in file_ids:
+            if file_id not in self.rows:
+                continue
+            file_info = self.registry.get(file_id)
+            if file_info is None:
+                continue
+            values = self.row_values(file_id, file_info)
+            if values != self.rows[file_id]:
+                self.tree.item(file_id, values=values)
+                self.rows[file_id] = values
+    
+    def update_all(self):
+        self.update_rows(list(self.rows))
+    
+    def show(self, file_id):
+        """Turn to the page holding file_id and select it"""
+        try:
+            self.page = list(self.registry).index(file_id) // self.page_size
+        except ValueError:
+            return
+        self.refresh()
+        if file_id in self.rows:
+            self.tree.selection_set(file_id)
+            self.tree.see(file_id)
+    
+    def turn(self, step):
+        page = min(max(self.page + step, 0), self.page_count() - 1)
+        if page != self.page:
+            self.page = page
+            self.refresh()
+
+class FileShareApp:
+    def __init__(self, root, server=None):
+        self.root = root
+        self.root.title("BurnBin - Share Files Online")
+        self.root.geometry("1000x700")
+        self.root.minsize(900, 600)
+        self.root.resizable(True, True)
+        
+        # Dark theme with orange highlights
+        self.colors = {
+            'bg_main': '#1a1a1a',
+            'bg_header': '#2d2d2d',
+            'bg_card': '#252525',
+            'bg_button_primary': '#ff6b35',
+            'bg_button_primary_hover': '#ff8555',
+            'bg_button_success': '#ff6b35',
+            'bg_button_success_hover': '#ff8555',
+            'bg_button_danger': '#ff4444',
+            'bg_button_danger_hover': '#ff6666',
+            'text_primary': '#ffffff',
+            'text_secondary': '#b0b0b0',
+            'text_light': '#808080',
+            'border': '#404040',
+            'accent': '#ff6b35',
+            'success': '#ff6b35',
+            'warning': '#ffaa00',
+            'error': '#ff4444'
+        }
+        
+        # Serving core (routes, registries, tunnel). Its threads reach the UI
+        # only through ui_events, drained on the Tk loop
+        self.server = server if server is not None else BurnBinServer()
+        self.ui_events = UIEventQueue()
+        self.ui_interval = 100  # Milliseconds between drains
+        self.activity_view_lines = 1000  # Lines kept in the Activity view
+        self.activity_searching = False
+        self.server.log_listeners.append(lambda line: self.ui_events.publish('log', line))
+        self.server.change_listeners.append(self.ui_events.publish)
+        self.last_status_key = None  # Status panel is redrawn when this changes
+        
+        # Set root background
+        self.root.configure(bg=self.colors['bg_main'])
+        
+        # Setup UI
+        self.setup_ui()
+        
+        # Populate treeview with loaded shared files
+        self.files_pager.refresh()
+        self.uploads_pager.refresh()
+        self.process_ui_events()
+        
+        # Start local server
+        self.server.start_local_server()
+    
+    def setup_ui(self):
+        
+        # Modern header with gradient effect
+        header_frame = tk.Frame(self.root, bg=self.colors['bg_header'], height=120)
+        header_frame.pack(fill=tk.X)
+        header_frame.pack_propagate(False)
+        
+        # Header content container
+        header_content = tk.Frame(header_frame, bg=self.colors['bg_header'])
+        header_content.pack(fill=tk.BOTH, expand=True, padx=30, pady=18)
+        
+        # Title with icon emoji
+        title_container = tk.Frame(header_content, bg=self.colors['bg_header'])
+        title_container.pack(anchor=tk.W)
+        
+        title_label = tk.Label(
+            title_container,
+            text="🔥 BurnBin",
+            font=("Segoe UI", 28, "bold"),
+            bg=self.colors['bg_header'],
+            fg="#ff6b35"
+        )
+        title_label.pack(side=tk.LEFT)
+        
+        subtitle_label = tk.Label(
+            header_content,
+            text="Share files instantly with secure public links • PyroSoft Productions",
+            font=("Segoe UI", 10),
+            bg=self.colors['bg_header'],
+            fg="#b0b0b0"
+        )
+        subtitle_label.pack(anchor=tk.W, pady=(5, 0))
+        
+        # Website link
+        website_label = tk.Label(
+            header_content,
+            text="https://pyrosoft.pro/",
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_header'],
+            fg="#ff6b35",
+            cursor="hand2"
+        )
+        website_label.pack(anchor=tk.W, pady=(2, 0))
+        website_label.bind("<Button-1>", lambda e: self.open_website())
+        
+        # Main container with tabs
+        main_container = tk.Frame(self.root, bg=self.colors['bg_main'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
+        
+        # Create notebook (tabs)
+        style = ttk.Style()
+        style.theme_use("clam")
+        
+        # Configure tab style for dark theme
+        style.configure("TNotebook", background=self.colors['bg_main'], borderwidth=0)
+        style.configure("TNotebook.Tab", 
+                       padding=[20, 10],
+                       font=("Segoe UI", 11, "bold"),
+                       background='#2d2d2d',
+                       foreground=self.colors['text_secondary'])
+        # Configure selected tab with larger padding
+        style.configure("TNotebook.Tab",
+                       padding=[20, 10])
+        style.map("TNotebook.Tab",
+                 background=[("selected", self.colors['bg_card'])],
+                 foreground=[("selected", self.colors['accent'])],
+                 padding=[("selected", [24, 12]), ("!selected", [18, 8])])
+        
+        self.notebook = ttk.Notebook(main_container)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
+        
+        # Tab 1: Share (Add files + Status)
+        self.share_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
+        self.notebook.add(self.share_tab, text="🔥 Share")
+        self.setup_share_tab()
+        
+        # Tab 2: Files (Shared files list)
+        self.files_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
+        self.notebook.add(self.files_tab, text="🔥 Files")
+        self.setup_files_tab()
+        
+        # Tab 3: Uploads (Files uploaded by users)
+        self.uploads_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
+        self.notebook.add(self.uploads_tab, text="🔥 Uploads")
+        self.setup_uploads_tab()
+        
+        # Tab 4: Activity (Download activity log)
+        self.activity_tab = tk.Frame(self.notebook, bg=self.colors['bg_main'], padx=25, pady=25)
+        self.notebook.add(self.activity_tab, text="🔥 Activity")
+        self.setup_activity_tab()
+        
+        # Start update loop
+        self.update_status()
+    
+    def setup_share_tab(self):
+        """Setup the Share tab with file upload and status"""
+        # Add file section - Modern card design
+        add_file_card = tk.Frame(
+            self.share_tab,
+            bg=self.colors['bg_card'],
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1
+        )
+        add_file_card.pack(fill=tk.X, pady=(0, 20))
+        
+        # Card header
+        card_header = tk.Frame(add_file_card, bg=self.colors['bg_card'])
+        card_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        
+        card_title = tk.Label(
+            card_header,
+            text="🔥 Add File to Share",
+            font=("Segoe UI", 14, "bold"),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_primary']
+        )
+        card_title.pack(anchor=tk.W)
+        
+        # File selection area
+        file_selection_frame = tk.Frame(add_file_card, bg=self.colors['bg_card'])
+        file_selection_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+        
+        # File path input with modern styling
+        input_container = tk.Frame(file_selection_frame, bg=self.colors['bg_card'])
+        input_container.pack(fill=tk.X, pady=(0, 12))
+        
+        self.file_path_var = tk.StringVar()
+        file_entry = tk.Entry(
+            input_container,
+            textvariable=self.file_path_var,
+            font=("Segoe UI", 11),
+            state="readonly",
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1,
+            highlightcolor=self.colors['accent'],
+            bg='#1a1a1a',
+            fg=self.colors['text_primary'],
+            insertbackground=self.colors['text_primary']
+        )
+        file_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 12), ipady=10)
+        
+        # Modern browse button
+        browse_btn = tk.Button(
+            input_container,
+            text="🔥 Browse",
+            command=self.browse_file,
+            bg=self.colors['bg_button_primary'],
+            fg="white",
+            font=("Segoe UI", 10, "bold"),
+            padx=24,
+            pady=10,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_primary_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        browse_btn.pack(side=tk.RIGHT)
+        
+        folder_btn = tk.Button(
+            input_container,
+            text="📁 Folder",
+            command=self.browse_folder,
+            bg=self.colors['bg_header'],
+            fg=self.colors['text_primary'],
+            font=("Segoe UI", 10, "bold"),
+            padx=18,
+            pady=10,
+            relief=tk.FLAT,
+            cursor="hand2",
+            borderwidth=0
+        )
+        folder_btn.pack(side=tk.RIGHT, padx=(0, 8))
+        
+        # Share button - prominent CTA
+        share_btn = tk.Button(
+            file_selection_frame,
+            text="🔥 Share File",
+            command=self.share_file,
+            bg=self.colors['bg_button_success'],
+            fg="white",
+            font=("Segoe UI", 12, "bold"),
+            padx=40,
+            pady=12,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_success_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        share_btn.pack(fill=tk.X)
+        
+        # Status section - Modern card with status indicators
+        status_card = tk.Frame(
+            self.share_tab,
+            bg=self.colors['bg_card'],
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1
+        )
+        status_card.pack(fill=tk.X)
+        
+        status_header = tk.Frame(status_card, bg=self.colors['bg_card'])
+        status_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        
+        status_title = tk.Label(
+            status_header,
+            text="🔥 Connection Status",
+            font=("Segoe UI", 14, "bold"),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_primary']
+        )
+        status_title.pack(anchor=tk.W)
+        
+        status_content = tk.Frame(status_card, bg=self.colors['bg_card'])
+        status_content.pack(fill=tk.X, padx=20, pady=(0, 20))
+        
+        self.status_label = tk.Label(
+            status_content,
+            text="⏳ Starting server...",
+            font=("Segoe UI", 11),
+            fg=self.colors['text_secondary'],
+            bg=self.colors['bg_card'],
+            anchor=tk.W
+        )
+        self.status_label.pack(fill=tk.X, pady=(0, 8))
+        
+        self.url_label = tk.Label(
+            status_content,
+            text="",
+            font=("Segoe UI", 10),
+            fg=self.colors['accent'],
+            bg=self.colors['bg_card'],
+            cursor="hand2",
+            anchor=tk.W
+        )
+        self.url_label.bind("<Button-1>", lambda e: self.open_url())
+        self.url_label.bind("<Enter>", lambda e: self.url_label.config(fg=self.colors['bg_button_primary_hover']))
+        self.url_label.bind("<Leave>", lambda e: self.url_label.config(fg=self.colors['accent']))
+        
+        # Install cloudflared button (initially hidden)
+        self.install_cloudflared_btn = tk.Button(
+            status_content,
+            text="🔥 Install Cloudflared",
+            command=self.install_cloudflared,
+            bg=self.colors['bg_button_primary'],
+            fg="white",
+            font=("Segoe UI", 10, "bold"),
+            padx=20,
+            pady=8,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_primary_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        # Don't pack initially - will be shown when needed
+        
+    
+    def setup_files_tab(self):
+        """Setup the Files tab with shared files list"""
+        # Shared files section - Modern card
+        files_card = tk.Frame(
+            self.files_tab,
+            bg=self.colors['bg_card'],
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1
+        )
+        files_card.pack(fill=tk.BOTH, expand=True)
+        
+        files_header = tk.Frame(files_card, bg=self.colors['bg_card'])
+        files_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        
+        files_title = tk.Label(
+            files_header,
+            text="🔥 Shared Files",
+            font=("Segoe UI", 14, "bold"),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_primary']
+        )
+        files_title.pack(side=tk.LEFT)
+        
+        # Live download slots, refreshed by update_status
+        self.downloads_label = tk.Label(
+            files_header,
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_secondary']
+        )
+        self.downloads_label.pack(side=tk.LEFT, padx=(15, 0))
+        
+        self.setup_bandwidth_controls(files_header)
+        
+        # Treeview container
+        tree_container = tk.Frame(files_card, bg=self.colors['bg_card'])
+        tree_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 15))
+        
+        # Configure modern treeview style
+        style = ttk.Style()
+        style.theme_use("clam")
+        style.configure("Treeview",
+                       background=self.colors['bg_card'],
+                       foreground=self.colors['text_primary'],
+                       fieldbackground=self.colors['bg_card'],
+                       borderwidth=0,
+                       font=("Segoe UI", 10))
+        style.configure("Treeview.Heading",
+                       background='#2d2d2d',
+                       foreground=self.colors['text_primary'],
+                       font=("Segoe UI", 10, "bold"),
+                       relief=tk.FLAT)
+        style.map("Treeview",
+                 background=[('selected', self.colors['accent'])],
+                 foreground=[('selected', 'white')])
+        
+        # Treeview for files
+        columns = ("File Name", "Size", "Status", "Downloads", "Link")
+        self.files_tree = ttk.Treeview(tree_container, columns=columns, show="tree headings", height=15)
+        self.files_tree.heading("#0", text="")
+        self.files_tree.column("#0", width=20)
+        
+        for col in columns:
+            self.files_tree.heading(col, text=col)
+            if col == "File Name":
+                self.files_tree.column(col, width=300)
+            elif col == "Size":
+                self.files_tree.column(col, width=120)
+            elif col == "Status":
+                self.files_tree.column(col, width=140)
+            elif col == "Downloads":
+                self.files_tree.column(col, width=100)
+            else:
+                self.files_tree.column(col, width=280)
+        
+        scrollbar = ttk.Scrollbar(tree_container, orient=tk.VERTICAL, command=self.files_tree.yview)
+        self.files_tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.files_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Bind double-click to copy link
+        self.files_tree.bind("<Double-1>", self.copy_file_link)
+        
+        # Button container
+        button_container = tk.Frame(files_card, bg=self.colors['bg_card'])
+        button_container.pack(fill=tk.X, padx=20, pady=(0, 20))
+        
+        self.files_pager = TreePager(self.files_tree, self.server.shared_files, self.file_row_values)
+        self.setup_pager_controls(button_container, self.files_pager, "files")
+        
+        # Modern remove button
+        remove_btn = tk.Button(
+            button_container,
+            text="🔥 Remove Selected",
+            command=self.remove_file,
+            bg=self.colors['bg_button_danger'],
+            fg="white",
+            font=("Segoe UI", 10, "bold"),
+            padx=24,
+            pady=10,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_danger_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        remove_btn.pack(side=tk.RIGHT)
+    
+    def setup_bandwidth_controls(self, parent):
+        """Download limits in KB/s, applied to running downloads too"""
+        apply_btn = tk.Button(
+            parent,
+            text="Apply",
+            command=self.apply_bandwidth_limits,
+            bg=self.colors['bg_header'],
+            fg=self.colors['text_primary'],
+            font=("Segoe UI", 9),
+            padx=10,
+            pady=4,
+            relief=tk.FLAT,
+            cursor="hand2",
+            borderwidth=0
+        )
+        apply_btn.pack(side=tk.RIGHT)
+        
+        limits = self.server.bandwidth.limits()
+        self.bandwidth_vars = {}
+        # Packed right to left
+        for key, label in (('share_rate', "Per file"), ('client_rate', "Per client"), ('rate', "Total")):
+            var = tk.StringVar(value=str(limits[key] // 1024) if limits[key] else "")
+            entry = tk.Entry(
+                parent,
+                textvariable=var,
+                width=7,
+                font=("Segoe UI", 9),
+                relief=tk.FLAT,
+                bg='#1a1a1a',
+                fg=self.colors['text_primary'],
+                insertbackground=self.colors['text_primary']
+            )
+            entry.pack(side=tk.RIGHT, padx=(4, 10), ipady=3)
+            entry.bind("<Return>", lambda event: self.apply_bandwidth_limits())
+            tk.Label(
+                parent,
+                text=label,
+                font=("Segoe UI", 9),
+                bg=self.colors['bg_card'],
+                fg=self.colors['text_secondary']
+            ).pack(side=tk.RIGHT)
+            self.bandwidth_vars[key] = var
+        
+        tk.Label(
+            parent,
+            text="Limits (KB/s, empty = none):",
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_secondary']
+        ).pack(side=tk.RIGHT, padx=(0, 8))
+    
+    def apply_bandwidth_limits(self):
+        limits = {}
+        for key, var in self.bandwidth_vars.items():
+            text = var.get().strip()
+            try:
+                limits[key] = int(text) * 1024 if text else 0
+            except ValueError:
+                messagebox.showerror("Error", f"Not a number of KB/s: {text}")
+                return
+            if limits[key] < 0:
+                messagebox.showerror("Error", "Limits can't be negative.")
+                return
+        self.server.bandwidth.configure(**limits)
+        described = ", ".join(
+            f"{key.replace('_', ' ')} {value // 1024} KB/s" for key, value in limits.items() if value
+        )
+        self.server.log_activity(f"Bandwidth limits: {described or 'none'}")
+    
+    def setup_pager_controls(self, parent, pager, noun):
+        """Previous/next buttons and a page label for a TreePager"""
+        def button(text, step):
+            return tk.Button(
+                parent,
+                text=text,
+                command=lambda: pager.turn(step),
+                bg=self.colors['bg_header'],
+                fg=self.colors['text_primary'],
+                font=("Segoe UI", 10),
+                padx=10,
+                pady=10,
+                relief=tk.FLAT,
+                cursor="hand2",
+                borderwidth=0
+            )
+        
+        button("◀", -1).pack(side=tk.LEFT)
+        page_label = tk.Label(
+            parent,
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_secondary']
+        )
+        page_label.pack(side=tk.LEFT, padx=8)
+        button("▶", 1).pack(side=tk.LEFT)
+        
+        pager.on_change = lambda pager: page_label.config(
+            text=f"Page {pager.page + 1} of {pager.page_count()} ({len(pager.registry):,} {noun})"
+        )
+    
+    def setup_uploads_tab(self):
+        """Setup the Uploads tab with files uploaded by users"""
+        # Uploaded files section - Modern card
+        uploads_card = tk.Frame(
+            self.uploads_tab,
+            bg=self.colors['bg_card'],
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1
+        )
+        uploads_card.pack(fill=tk.BOTH, expand=True)
+        
+        uploads_header = tk.Frame(uploads_card, bg=self.colors['bg_card'])
+        uploads_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        
+        uploads_title = tk.Label(
+            uploads_header,
+            text="🔥 Uploaded Files",
+            font=("Segoe UI", 14, "bold"),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_primary']
+        )
+        uploads_title.pack(side=tk.LEFT)
+        
+        # Treeview container
+        tree_container = tk.Frame(uploads_card, bg=self.colors['bg_card'])
+        tree_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 15))
+        
+        # Configure modern treeview style
+        style = ttk.Style()
+        style.theme_use("clam")
+        style.configure("Uploads.Treeview",
+                       background=self.colors['bg_card'],
+                       foreground=self.colors['text_primary'],
+                       fieldbackground=self.colors['bg_card'],
+                       borderwidth=0,
+                       font=("Segoe UI", 10))
+        style.configure("Uploads.Treeview.Heading",
+                       background='#2d2d2d',
+                       foreground=self.colors['text_primary'],
+                       font=("Segoe UI", 10, "bold"),
+                       relief=tk.FLAT)
+        style.map("Uploads.Treeview",
+                 background=[('selected', self.colors['accent'])],
+                 foreground=[('selected', 'white')])
+        
+        # Treeview for uploaded files
+        columns = ("File Name", "Size", "Upload Time", "From IP")
+        self.uploads_tree = ttk.Treeview(tree_container, columns=columns, show="tree headings", height=15, style="Uploads.Treeview")
+        self.uploads_tree.heading("#0", text="")
+        self.uploads_tree.column("#0", width=20)
+        
+        for col in columns:
+            self.uploads_tree.heading(col, text=col)
+            if col == "File Name":
+                self.uploads_tree.column(col, width=300)
+            elif col == "Size":
+                self.uploads_tree.column(col, width=120)
+            elif col == "Upload Time":
+                self.uploads_tree.column(col, width=180)
+            else:
+                self.uploads_tree.column(col, width=150)
+        
+        scrollbar = ttk.Scrollbar(tree_container, orient=tk.VERTICAL, command=self.uploads_tree.yview)
+        self.uploads_tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.uploads_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Bind double-click to download
+        self.uploads_tree.bind("<Double-1>", self.download_uploaded_file)
+        
+        # Button container
+        button_container = tk.Frame(uploads_card, bg=self.colors['bg_card'])
+        button_container.pack(fill=tk.X, padx=20, pady=(0, 20))
+        
+        self.uploads_pager = TreePager(self.uploads_tree, self.server.uploaded_files, self.upload_row_values)
+        self.setup_pager_controls(button_container, self.uploads_pager, "uploads")
+        
+        # Download button
+        download_btn = tk.Button(
+            button_container,
+            text="🔥 Download Selected",
+            command=self.download_selected_upload,
+            bg=self.colors['bg_button_success'],
+            fg="white",
+            font=("Segoe UI", 10, "bold"),
+            padx=24,
+            pady=10,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_success_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        download_btn.pack(side=tk.RIGHT, padx=(10, 0))
+        
+        # Share button
+        share_upload_btn = tk.Button(
+            button_container,
+            text="🔥 Share Selected",
+            command=self.share_uploaded_file,
+            bg=self.colors['bg_button_primary'],
+            fg="white",
+            font=("Segoe UI", 10, "bold"),
+            padx=24,
+            pady=10,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_primary_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        share_upload_btn.pack(side=tk.RIGHT, padx=(10, 0))
+        
+        # Remove button
+        remove_upload_btn = tk.Button(
+            button_container,
+            text="🔥 Remove Selected",
+            command=self.remove_uploaded_file,
+            bg=self.colors['bg_button_danger'],
+            fg="white",
+            font=("Segoe UI", 10, "bold"),
+            padx=24,
+            pady=10,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_danger_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        remove_upload_btn.pack(side=tk.RIGHT)
+    
+    def setup_activity_tab(self):
+        """Setup the Activity tab with download activity log"""
+        # Download activity section - Modern card
+        activity_card = tk.Frame(
+            self.activity_tab,
+            bg=self.colors['bg_card'],
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1
+        )
+        activity_card.pack(fill=tk.BOTH, expand=True)
+        
+        activity_header = tk.Frame(activity_card, bg=self.colors['bg_card'])
+        activity_header.pack(fill=tk.X, padx=20, pady=(20, 15))
+        
+        activity_title = tk.Label(
+            activity_header,
+            text="🔥 Download Activity",
+            font=("Segoe UI", 14, "bold"),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_primary']
+        )
+        activity_title.pack(side=tk.LEFT)
+        
+        # Samples every thread, GUI included; the stacks are saved under profiles/
+        self.profile_btn = tk.Button(
+            activity_header,
+            text="⏱ Profile 30s",
+            command=self.toggle_profile,
+            bg=self.colors['bg_header'],
+            fg=self.colors['text_primary'],
+            font=("Segoe UI", 9),
+            padx=12,
+            relief=tk.FLAT,
+            cursor="hand2",
+            borderwidth=0
+        )
+        self.profile_btn.pack(side=tk.LEFT, padx=(12, 0))
+        
+        # History search over the JSONL log, the view shows live lines otherwise
+        live_btn = tk.Button(
+            activity_header,
+            text="Live",
+            command=self.show_live_activity,
+            bg=self.colors['bg_header'],
+            fg=self.colors['text_primary'],
+            font=("Segoe UI", 9),
+            padx=12,
+            relief=tk.FLAT,
+            cursor="hand2",
+            borderwidth=0
+        )
+        live_btn.pack(side=tk.RIGHT)
+        
+        search_btn = tk.Button(
+            activity_header,
+            text="🔥 Search History",
+            command=self.search_activity,
+            bg=self.colors['bg_button_primary'],
+            fg="white",
+            font=("Segoe UI", 9, "bold"),
+            padx=12,
+            relief=tk.FLAT,
+            cursor="hand2",
+            activebackground=self.colors['bg_button_primary_hover'],
+            activeforeground="white",
+            borderwidth=0
+        )
+        search_btn.pack(side=tk.RIGHT, padx=(0, 8))
+        
+        self.activity_search_var = tk.StringVar()
+        search_entry = tk.Entry(
+            activity_header,
+            textvariable=self.activity_search_var,
+            font=("Segoe UI", 10),
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1,
+            highlightcolor=self.colors['accent'],
+            bg='#1a1a1a',
+            fg=self.colors['text_primary'],
+            insertbackground=self.colors['text_primary']
+        )
+        search_entry.pack(side=tk.RIGHT, padx=(0, 8), ipady=4)
+        search_entry.bind('<Return>', lambda event: self.search_activity())
+        
+        activity_content = tk.Frame(activity_card, bg=self.colors['bg_card'])
+        activity_content.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        
+        # Modern text widget with styling
+        self.activity_text = tk.Text(
+            activity_content,
+            font=("Consolas", 9),
+            wrap=tk.WORD,
+            state=tk.DISABLED,
+            bg='#1a1a1a',
+            fg=self.colors['text_primary'],
+            relief=tk.FLAT,
+            highlightbackground=self.colors['border'],
+            highlightthickness=1,
+            padx=12,
+            pady=12
+        )
+        self.activity_text.pack(fill=tk.BOTH, expand=True)
+    
     def browse_file(self):
         file_path = filedialog.askopenfilename(
             title="Select a file to share",
@@ -1285,51 +6139,33 @@ class FileShareApp:
         if file_path:
             self.file_path_var.set(file_path)
     
+    def browse_folder(self):
+        folder_path = filedialog.askdirectory(title="Select a folder to share as a ZIP")
+        if folder_path:
+            self.file_path_var.set(folder_path)
+    
     def share_file(self):
         file_path = self.file_path_var.get()
         if not file_path or not os.path.exists(file_path):
-            messagebox.showerror("Error", "Please select a valid file.")
+            messagebox.showerror("Error", "Please select a valid file or folder.")
             return
         
-        if not self.server_running:
+        if not self.server.server_running:
             messagebox.showerror("Error", "Server is not running. Please wait...")
             return
         
-        # Generate unique file ID
-        file_id = str(uuid.uuid4())
-        file_name = os.path.basename(file_path)
-        file_size = self.format_size(os.path.getsize(file_path))
-        
-        self.shared_files[file_id] = {
-            'path': file_path,
-            'name': file_name,
-            'size': file_size,
-            'upload_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'downloads': 0
-        }
+        file_id = self.server.share_path(file_path)
+        file_name = self.server.shared_files[file_id]['name']
         
-        # Add to treeview
-        self.files_tree.insert(
-            "",
-            tk.END,
-            iid=file_id,
-            values=(
-                file_name,
-                file_size,
-                "🔥 Active",
-                "🔥 0",
-                f"{self.public_url}/download/{file_id}" if self.public_url else "⏳ Generating..."
-            )
-        )
+        # Show it in the treeview
+        self.files_pager.show(file_id)
         
         self.file_path_var.set("")
-        self.log_activity(f"File shared: {file_name}")
-        self.save_shared_files()  # Persist changes
         
-        if self.public_url:
+        if self.server.public_url:
             messagebox.showinfo(
                 "File Shared!",
-                f"File '{file_name}' is now available at:\n{self.public_url}/download/{file_id}\n\nDouble-click the file in the list to copy the link."
+                f"File '{file_name}' is now available at:\n{self.server.file_link(file_id)}\n\nDouble-click the file in the list to copy the link."
             )
     
     def remove_file(self):
@@ -1339,47 +6175,31 @@ class FileShareApp:
             return
         
         file_id = selection[0]
-        if file_id in self.shared_files:
-            file_name = self.shared_files[file_id]['name']
-            del self.shared_files[file_id]
-            self.files_tree.delete(file_id)
-            self.log_activity(f"File removed: {file_name}")
-            self.save_shared_files()  # Persist changes
+        if self.server.remove_shared_file(file_id) is not None:
+            self.files_pager.refresh()
     
     def copy_file_link(self, event):
         selection = self.files_tree.selection()
         if selection:
             file_id = selection[0]
-            if file_id in self.shared_files and self.public_url:
-                link = f"{self.public_url}/download/{file_id}"
+            link = self.server.file_link(file_id)
+            if file_id in self.server.shared_files and link:
                 self.root.clipboard_clear()
                 self.root.clipboard_append(link)
                 messagebox.showinfo("Link Copied", f"Download link copied to clipboard:\n{link}")
     
-    def is_valid_url(self, url):
-        """Validate that URL is properly formatted"""
-        if not url:
-            return False
-        url = url.strip()
-        # Check if it's a valid HTTPS URL with proper domain
-        if url.startswith('https://') and ('.trycloudflare.com' in url or '.cloudflared.net' in url):
-            # Basic validation - check it doesn't have spaces or invalid chars
-            if ' ' not in url and len(url) > 20:
-                return True
-        return False
-    
     def open_url(self):
         """Open the URL in the default browser"""
-        if not self.server_running:
+        if not self.server.server_running:
             messagebox.showwarning("Server Not Ready", "Server is not running yet. Please wait...")
             return
         
         url_to_open = None
-        if self.public_url and self.is_valid_url(self.public_url):
+        if self.server.public_url and self.server.is_valid_url(self.server.public_url):
             # Use public URL as-is (cloudflared handles routing)
-            url_to_open = self.public_url.strip()
-        elif self.server_running:
-            url_to_open = f"http://127.0.0.1:{self.local_port}"
+            url_to_open = self.server.public_url.strip()
+        elif self.server.server_running:
+            url_to_open = self.server.local_url()
         
         if url_to_open:
             import webbrowser
@@ -1405,8 +6225,8 @@ class FileShareApp:
             return
         
         file_id = selection[0]
-        if file_id in self.uploaded_files:
-            file_info = self.uploaded_files[file_id]
+        if file_id in self.server.uploaded_files:
+            file_info = self.server.uploaded_files[file_id]
             file_path = file_info['path']
             
             if not os.path.exists(file_path):
@@ -1423,7 +6243,7 @@ class FileShareApp:
             if save_path:
                 import shutil
                 shutil.copy2(file_path, save_path)
-                self.log_activity(f"Downloaded uploaded file: {file_info['name']}")
+                self.server.log_activity(f"Downloaded uploaded file: {file_info['name']}")
                 messagebox.showinfo("Success", f"File saved to:\n{save_path}")
     
     def download_selected_upload(self):
@@ -1438,59 +6258,33 @@ class FileShareApp:
             return
         
         upload_file_id = selection[0]
-        if upload_file_id not in self.uploaded_files:
+        if upload_file_id not in self.server.uploaded_files:
             messagebox.showerror("Error", "File not found.")
             return
         
-        if not self.server_running:
+        if not self.server.server_running:
             messagebox.showerror("Error", "Server is not running. Please wait...")
             return
         
-        file_info = self.uploaded_files[upload_file_id]
-        file_path = file_info['path']
+        file_info = self.server.uploaded_files[upload_file_id]
         file_name = file_info['name']
         
-        if not os.path.exists(file_path):
+        if not os.path.exists(file_info['path']):
             messagebox.showerror("Error", "File not found on disk.")
             return
         
-        # Generate new unique file ID for sharing
-        share_file_id = str(uuid.uuid4())
-        file_size = self.format_size(os.path.getsize(file_path))
-        
-        # Add to shared files
-        self.shared_files[share_file_id] = {
-            'path': file_path,
-            'name': file_name,
-            'size': file_size,
-            'upload_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'downloads': 0
-        }
-        
-        # Add to treeview
-        self.files_tree.insert(
-            "",
-            tk.END,
-            iid=share_file_id,
-            values=(
-                file_name,
-                file_size,
-                "🔥 Active",
-                "🔥 0",
-                f"{self.public_url}/download/{share_file_id}" if self.public_url else "⏳ Generating..."
-            )
-        )
+        share_file_id = self.server.share_upload(upload_file_id)
         
-        self.log_activity(f"Uploaded file shared: {file_name}")
-        self.save_shared_files()  # Persist changes
+        # Show it in the treeview
+        self.files_pager.show(share_file_id)
         
         # Switch to Files tab to show the newly shared file
         self.notebook.select(1)  # Switch to Files tab (index 1)
         
-        if self.public_url:
+        if self.server.public_url:
             messagebox.showinfo(
                 "File Shared!",
-                f"File '{file_name}' is now available for download at:\n{self.public_url}/download/{share_file_id}\n\nDouble-click the file in the Files tab to copy the link."
+                f"File '{file_name}' is now available for download at:\n{self.server.file_link(share_file_id)}\n\nDouble-click the file in the Files tab to copy the link."
             )
         else:
             messagebox.showinfo(
@@ -1506,151 +6300,22 @@ class FileShareApp:
             return
         
         file_id = selection[0]
-        if file_id in self.uploaded_files:
-            file_info = self.uploaded_files[file_id]
-            file_path = file_info['path']
-            
-            # Delete file from disk
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to delete file: {str(e)}")
-                    return
-            
-            file_name = file_info['name']
-            del self.uploaded_files[file_id]
-            self.uploads_tree.delete(file_id)
-            self.log_activity(f"Uploaded file removed: {file_name}")
-    
-    def start_local_server(self):
-        def run_server():
-            self.flask_app.run(host='127.0.0.1', port=self.local_port, debug=False, use_reloader=False)
-        
-        self.server_thread = threading.Thread(target=run_server, daemon=True)
-        self.server_thread.start()
-        
-        # Wait a moment for server to start
-        time.sleep(1)
-        self.server_running = True
-        self.start_cloudflare_tunnel()
-    
-    def check_cloudflared_installed(self):
-        """Check if cloudflared is installed and available"""
-        try:
-            # Hide console window on Windows
-            creation_flags = 0
-            if sys.platform == 'win32':
-                creation_flags = subprocess.CREATE_NO_WINDOW
-            
-            result = subprocess.run(
-                ['cloudflared', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=creation_flags
-            )
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
-    
-    def start_cloudflare_tunnel(self):
-        def run_tunnel():
-            # Check if cloudflared is available
-            if not self.check_cloudflared_installed():
-                self.log_activity("Cloudflared not found. App running in local mode only.")
-                self.log_activity("Click 'Install Cloudflared' button to enable public URLs.")
-                return
-            
+        if file_id in self.server.uploaded_files:
             try:
-                # Start tunnel with a small delay to avoid rapid reconnections
-                self.log_activity("Starting Cloudflare Tunnel...")
-                time.sleep(0.5)  # Small delay to avoid rapid tunnel creation
-                
-                # Hide console window on Windows
-                creation_flags = 0
-                if sys.platform == 'win32':
-                    creation_flags = subprocess.CREATE_NO_WINDOW
-                
-                process = subprocess.Popen(
-                    ['cloudflared', 'tunnel', '--url', f'http://127.0.0.1:{self.local_port}'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    creationflags=creation_flags
-                )
-                
-                self.cloudflare_process = process
-                
-                # Read output to get public URL
-                import re
-                url_found = False
-                timeout = time.time() + 30  # 30 second timeout
-                error_messages = []
-                
-                for line in process.stdout:
-                    if time.time() > timeout:
-                        self.log_activity("Timeout waiting for tunnel URL")
-                        break
-                    
-                    # Log tunnel output for debugging
-                    line_stripped = line.strip()
-                    if line_stripped:
-                        # Check for error messages indicating rate limits or issues
-                        line_lower = line_stripped.lower()
-                        if any(keyword in line_lower for keyword in ['error', 'failed', 'limit', 'rate', 'quota', 'too many']):
-                            error_messages.append(line_stripped)
-                            self.log_activity(f"⚠️ Tunnel warning: {line_stripped}")
-                        
-                        # Only log non-error lines if verbose (to reduce spam)
-                        elif 'https://' in line_stripped or 'tunnel' in line_lower:
-                            self.log_activity(f"Tunnel: {line_stripped}")
-                    
-                    # Look for cloudflare tunnel URLs (trycloudflare.com or cloudflared.net domain)
-                    # Updated patterns to match various cloudflared output formats
-                    url_patterns = [
-                        r'https://[a-zA-Z0-9-]+\.trycloudflare\.com',
-                        r'https://[a-zA-Z0-9-]+\.cloudflared\.net',
-                        r'https://[a-zA-Z0-9-]+\.(?:trycloudflare|cloudflared)\.(?:com|net)',
-                    ]
-                    
-                    for pattern in url_patterns:
-                        match = re.search(pattern, line, re.IGNORECASE)
-                        if match:
-                            url = match.group(0).strip()
-                            # Validate URL format
-                            if url.startswith('https://') and ('.trycloudflare.com' in url or '.cloudflared.net' in url):
-                                self.public_url = url
-                                self.log_activity(f"✅ Tunnel active! Public URL: {self.public_url}")
-                                url_found = True
-                                break
-                    
-                    if url_found:
-                        break
-                    
-                    if process.poll() is not None:
-                        self.log_activity("❌ Cloudflared process ended unexpectedly")
-                        break
-                
-                if not url_found:
-                    if error_messages:
-                        error_msg = "\n".join(error_messages[-3:])  # Show last 3 errors
-                        self.log_activity(f"❌ Tunnel failed. Possible Cloudflare rate limit or error:")
-                        self.log_activity(f"   {error_msg}")
-                        self.log_activity("💡 Tip: Wait a few minutes and try again, or restart the app.")
-                    else:
-                        self.log_activity("⚠️ Warning: Could not extract tunnel URL from cloudflared output")
-                        self.log_activity("💡 Tip: Cloudflare may be rate-limiting. Wait 5-10 minutes and restart.")
-                
+                self.server.remove_uploaded_file(file_id)
             except Exception as e:
-                self.log_activity(f"Tunnel error: {str(e)}")
-        
-        tunnel_thread = threading.Thread(target=run_tunnel, daemon=True)
-        tunnel_thread.start()
+                messagebox.showerror("Error", f"Failed to delete file: {str(e)}")
+                return
+            self.uploads_pager.refresh()
     
     def install_cloudflared(self):
         """Install cloudflared using the installer script"""
+        # It may have been installed since we last looked
+        if self.server.check_cloudflared_installed(force=True):
+            self.server.log_activity("Cloudflared detected, enabling public URLs.")
+            self.server.start_cloudflare_tunnel()
+            return
+        
         installer_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "install_cloudflared.bat")
         
         if not os.path.exists(installer_path):
@@ -1686,10 +6351,9 @@ class FileShareApp:
             
             messagebox.showinfo(
                 "Installing Cloudflared",
-                "The installer is running. Please:\n\n"
-                "1. Follow the installation prompts\n"
-                "2. Restart BurnBin after installation completes\n\n"
-                "The app will work locally until cloudflared is installed."
+                "The installer is running. Please follow the installation prompts.\n\n"
+                "BurnBin starts the tunnel automatically once cloudflared is installed, "
+                "until then the app works locally."
             )
         except Exception as e:
             messagebox.showerror(
@@ -1699,23 +6363,48 @@ class FileShareApp:
             )
     
     def update_status(self):
-        cloudflared_installed = self.check_cloudflared_installed()
+        # Only touch the status panel when the server/tunnel state changed
+        status_key = (
+            self.server.server_running,
+            self.server.tunnel_state,
+            self.server.public_url,
+            self.server.cloudflared_installed
+        )
+        if status_key != self.last_status_key:
+            if self.last_status_key is None or status_key[2] != self.last_status_key[2]:
+                self.files_pager.update_all()  # Links follow the public URL
+            self.last_status_key = status_key
+            self.render_status()
         
-        if self.server_running:
-            if self.public_url and self.is_valid_url(self.public_url):
+        downloads = self.server.admission.stats()
+        downloads_text = f"⬇ {downloads['active']} downloading · {downloads['queued']} queued"
+        if downloads['refused']:
+            downloads_text += f" · {downloads['refused']} turned away"
+        if self.downloads_label.cget('text') != downloads_text:
+            self.downloads_label.config(text=downloads_text)
+        
+        profile_text = "⏹ Stop Profile" if self.server.profiler.running is not None else "⏱ Profile 30s"
+        if self.profile_btn.cget('text') != profile_text:
+            self.profile_btn.config(text=profile_text)
+        
+        self.root.after(1000, self.update_status)
+    
+    def render_status(self):
+        if self.server.server_running:
+            if self.server.public_url and self.server.is_valid_url(self.server.public_url):
                 self.status_label.config(
                     text="🔥 Server running | 🔥 Tunnel active",
                     fg=self.colors['success']
                 )
                 self.url_label.config(
-                    text=f"🔥 {self.public_url} (Click to open)",
+                    text=f"🔥 {self.server.public_url} (Click to open)",
                     fg=self.colors['accent']
                 )
                 self.url_label.pack(fill=tk.X)
                 self.install_cloudflared_btn.pack_forget()
-            elif self.public_url:
+            elif self.server.public_url:
                 # Invalid URL - reset it
-                self.public_url = None
+                self.server.public_url = None
                 self.status_label.config(
                     text="🔥 Server running | ⏳ Starting tunnel...",
                     fg=self.colors['warning']
@@ -1723,8 +6412,19 @@ class FileShareApp:
                 self.url_label.config(text="")
                 self.url_label.pack(fill=tk.X)
                 self.install_cloudflared_btn.pack_forget()
+            elif self.server.tunnel_state == 'failed':
+                self.status_label.config(
+                    text="🔥 Server running | ⚠️ Tunnel unavailable",
+                    fg=self.colors['warning']
+                )
+                self.url_label.config(
+                    text=f"🔥 Local URL: {self.server.local_url()} (Click to open)",
+                    fg=self.colors['text_secondary']
+                )
+                self.url_label.pack(fill=tk.X)
+                self.install_cloudflared_btn.pack_forget()
             else:
-                if cloudflared_installed:
+                if self.server.tunnel_state != 'missing':
                     self.status_label.config(
                         text="🔥 Server running | ⏳ Starting tunnel...",
                         fg=self.colors['warning']
@@ -1738,7 +6438,7 @@ class FileShareApp:
                         text="🔥 Server running | ⚠️ Local mode only",
                         fg=self.colors['warning']
                     )
-                    local_url = f"http://127.0.0.1:{self.local_port}"
+                    local_url = self.server.local_url()
                     self.url_label.config(
                         text=f"🔥 Local URL: {local_url} (Click to open)",
                         fg=self.colors['text_secondary']
@@ -1755,152 +6455,218 @@ class FileShareApp:
             self.url_label.config(text="")
             self.url_label.pack(fill=tk.X)
             self.install_cloudflared_btn.pack_forget()
-        
-        # Update file list status
-        for file_id in self.shared_files:
-            if file_id in self.files_tree.get_children():
-                file_info = self.shared_files[file_id]
-                values = list(self.files_tree.item(file_id, 'values'))
-                if len(values) >= 4:
-                    values[2] = "🔥 Active"
-                    values[3] = f"🔥 {file_info['downloads']}"
-                    if self.public_url:
-                        values[4] = f"{self.public_url}/download/{file_id}"
-                    self.files_tree.item(file_id, values=values)
-        
-        # Update uploaded files list
-        current_upload_ids = set(self.uploads_tree.get_children())
-        new_upload_ids = set(self.uploaded_files.keys())
-        
-        # Remove files that no longer exist
-        for file_id in current_upload_ids - new_upload_ids:
-            self.uploads_tree.delete(file_id)
-        
-        # Add new uploaded files
-        for file_id in new_upload_ids - current_upload_ids:
-            file_info = self.uploaded_files[file_id]
-            self.uploads_tree.insert(
-                "",
-                tk.END,
-                iid=file_id,
-                values=(
-                    file_info['name'],
-                    file_info['size'],
-                    file_info['upload_time'],
-                    file_info.get('uploader_ip', 'Unknown')
-                )
-            )
-        
-        self.root.after(1000, self.update_status)
     
-    def log_activity(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
-        
-        # Only log if UI is initialized
-        if hasattr(self, 'activity_text') and self.activity_text:
-            try:
-                self.activity_text.config(state=tk.NORMAL)
-                self.activity_text.insert(tk.END, log_message)
-                self.activity_text.see(tk.END)
-                self.activity_text.config(state=tk.DISABLED)
-            except (tk.TclError, AttributeError):
-                # UI widget might not be ready yet
-                pass
+    def file_row_values(self, file_id, file_info):
+        return (
+            f"📁 {file_info['name']}" if file_info.get('folder') else file_info['name'],
+            file_info['size'],
+            "🔥 Active",
+            f"🔥 {file_info.get('downloads', 0)}",
+            self.server.file_link(file_id) or "⏳ Generating..."
+        )
     
-    def format_size(self, size_bytes):
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
+    def upload_row_values(self, file_id, file_info):
+        return (
+            file_info['name'],
+            file_info['size'],
+            file_info['upload_time'],
+            file_info.get('uploader_ip', 'Unknown')
+        )
     
-    def save_shared_files(self):
-        """Save shared files to JSON file for persistence"""
+    def process_ui_events(self):
+        """Apply what other threads published since the last run (Tk thread only)"""
+        lines, dropped, latest = self.ui_events.drain()
+        if dropped:
+            lines.insert(0, f"[{datetime.now().strftime('%H:%M:%S')}] ... {dropped} more messages\n")
+        if lines:
+            self.log_activity(''.join(lines))
+        if 'files' in latest:
+            self.files_pager.refresh()
+        elif 'download' in latest:
+            self.files_pager.update_rows(latest['download'])
+        if 'uploads' in latest:
+            self.uploads_pager.refresh()
+        if 'activity_search' in latest:
+            self.show_search_results(*latest['activity_search'])
+        self.root.after(self.ui_interval, self.process_ui_events)
+    
+    def log_activity(self, log_message):
+        # Tk thread only, other threads go through ui_events. Search results
+        # stay put, the lines are in the server's ring buffer for later
+        if self.activity_searching:
+            return
         try:
-            data = {}
-            for file_id, file_info in self.shared_files.items():
-                # Only save if file still exists
-                if os.path.exists(file_info['path']):
-                    data[file_id] = {
-                        'path': file_info['path'],
-                        'name': file_info['name'],
-                        'size': file_info['size'],
-                        'upload_time': file_info['upload_time'],
-                        'downloads': file_info.get('downloads', 0)
-                    }
-            
-            with open(self.shared_files_file, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            self.log_activity(f"Error saving shared files: {str(e)}")
+            self.activity_text.config(state=tk.NORMAL)
+            self.activity_text.insert(tk.END, log_message)
+            # Keep only the newest lines in the widget, the rest is on disk
+            excess = int(self.activity_text.index('end-1c').split('.')[0]) - self.activity_view_lines
+            if excess > 0:
+                self.activity_text.delete('1.0', f'{excess + 1}.0')
+            self.activity_text.see(tk.END)
+            self.activity_text.config(state=tk.DISABLED)
+        except (tk.TclError, AttributeError):
+            # UI widget might not be ready yet
+            pass
     
-    def load_shared_files(self):
-        """Load shared files from JSON file on startup"""
-        if not os.path.exists(self.shared_files_file):
+    def show_activity(self, text):
+        self.activity_text.config(state=tk.NORMAL)
+        self.activity_text.delete('1.0', tk.END)
+        self.activity_text.insert(tk.END, text)
+        self.activity_text.see(tk.END)
+        self.activity_text.config(state=tk.DISABLED)
+    
+    def toggle_profile(self):
+        """Start a 30 second sampling profile, or end the running one early"""
+        if self.server.profiler.running is not None:
+            self.server.profiler.stop()
+        elif self.server.profiler.start('sample', 30):
+            self.server.log_activity("Profiling started: sample for 30s")
+    
+    def show_live_activity(self):
+        self.activity_searching = False
+        self.activity_search_var.set("")
+        self.show_activity(''.join(self.server.activity.lines()[-self.activity_view_lines:]))
+    
+    def search_activity(self):
+        """Search the full history off the Tk thread, results come back through ui_events"""
+        text = self.activity_search_var.get().strip()
+        if not text:
+            self.show_live_activity()
             return
+        self.activity_searching = True
+        self.show_activity(f"Searching for '{text}'...\n")
         
-        try:
-            with open(self.shared_files_file, 'r') as f:
-                data = json.load(f)
-            
-            loaded_count = 0
-            for file_id, file_info in data.items():
-                file_path = file_info['path']
-                
-                # Check if file still exists
-                if os.path.exists(file_path):
-                    # Recalculate size in case file changed
-                    file_size = self.format_size(os.path.getsize(file_path))
-                    
-                    self.shared_files[file_id] = {
-                        'path': file_path,
-                        'name': file_info['name'],
-                        'size': file_size,
-                        'upload_time': file_info.get('upload_time', datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
-                        'downloads': file_info.get('downloads', 0)
-                    }
-                    loaded_count += 1
-                else:
-                    # File no longer exists, skip it
-                    continue
-            
-            if loaded_count > 0:
-                self.log_activity(f"Loaded {loaded_count} shared file(s) from previous session")
-        except Exception as e:
-            self.log_activity(f"Error loading shared files: {str(e)}")
+        def search():
+            records = self.server.activity.search(text, limit=self.activity_view_lines)
+            self.ui_events.publish('activity_search', (text, records))
+        
+        threading.Thread(target=search, daemon=True).start()
     
-    def populate_files_treeview(self):
-        """Populate the files treeview with loaded shared files"""
-        for file_id, file_info in self.shared_files.items():
-            # Check if already in treeview
-            if file_id not in self.files_tree.get_children():
-                self.files_tree.insert(
-                    "",
-                    tk.END,
-                    iid=file_id,
-                    values=(
-                        file_info['name'],
-                        file_info['size'],
-                        "🔥 Active",
-                        f"🔥 {file_info.get('downloads', 0)}",
-                        f"{self.public_url}/download/{file_id}" if self.public_url else "⏳ Generating..."
-                    )
-                )
+    def show_search_results(self, text, records):
+        if not self.activity_searching or text != self.activity_search_var.get().strip():
+            return  # Superseded by another search or by the live view
+        lines = [f"[{record['time'].replace('T', ' ')}] {record['message']}\n" for record in records]
+        if not lines:
+            lines = [f"No activity matching '{text}'\n"]
+        self.show_activity(''.join(lines))
     
     def on_closing(self):
-        # Save shared files before closing
-        self.save_shared_files()
-        if self.cloudflare_process:
-            self.cloudflare_process.terminate()
+        self.server.stop()
         self.root.destroy()
 
-def main():
+def engine_options(args):
+    """Serving engine options given on the command line"""
+    options = {
+        'threads': args.threads,
+        'max_connections': args.max_connections,
+        'backlog': args.backlog
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+def max_upload_size(args):
+    return args.max_upload_mb * 1024 * 1024 if args.max_upload_mb else None
+
+def bandwidth_limits(args):
+    """Download rate limits in bytes/s from the KB/s options"""
+    return {
+        'rate': (args.rate_limit or 0) * 1024,
+        'client_rate': (args.client_rate_limit or 0) * 1024,
+        'share_rate': (args.share_rate_limit or 0) * 1024
+    }
+
+def download_limits(args):
+    """Concurrent download limits given on the command line"""
+    options = {
+        'max_active': args.max_downloads,
+        'per_file': args.max_downloads_per_file,
+        'max_queued': args.download_queue
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+def server_options(args):
+    """BurnBinServer keyword arguments given on the command line"""
+    return {
+        'local_port': args.port,
+        'engine': args.engine,
+        'engine_options': engine_options(args),
+        'max_upload_size': max_upload_size(args),
+        'compress_downloads': args.compress_downloads,
+        'bandwidth_limits': bandwidth_limits(args),
+        'download_limits': download_limits(args),
+        'public_metrics': args.public_metrics
+    }
+
+def run_headless(args):
+    server = BurnBinServer(**server_options(args))
+    server.log_listeners.append(lambda line: print(line, end='', flush=True))
+    
+    for file_path in args.share:
+        if os.path.exists(file_path):
+            server.share_path(os.path.abspath(file_path))
+        else:
+            server.log_activity(f"Skipping missing file: {file_path}")
+    
+    # Treat SIGTERM (service managers, docker stop) like Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
+    server.start_local_server()
+    server.log_activity(f"Serving locally at {server.local_url()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.log_activity("Shutting down...")
+    finally:
+        server.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BurnBin - Share Files Online")
+    parser.add_argument('--headless', action='store_true',
+                        help="run the server and tunnel without the GUI")
+    parser.add_argument('--port', type=int, default=5000,
+                        help="local port for the HTTP server (default: 5000)")
+    parser.add_argument('--share', action='append', default=[], metavar='PATH',
+                        help="share a file or folder at startup (headless mode, repeatable)")
+    parser.add_argument('--engine', choices=sorted(SERVER_ENGINES), default='pool',
+                        help="HTTP serving engine (default: pool)")
+    parser.add_argument('--threads', type=int,
+                        help="worker threads of the pool engine (default: 32)")
+    parser.add_argument('--max-connections', type=int,
+                        help="open connections before new clients wait in the backlog (default: 512)")
+    parser.add_argument('--backlog', type=int,
+                        help="listen backlog (default: 128)")
+    parser.add_argument('--max-upload-mb', type=int,
+                        help="largest file visitors may upload (default: no limit)")
+    parser.add_argument('--compress-downloads', action='store_true',
+                        help="send text-like files gzip/zstd compressed to clients that accept it")
+    parser.add_argument('--max-downloads', type=int,
+                        help="downloads streaming at once, more wait in a queue (default: no limit)")
+    parser.add_argument('--max-downloads-per-file', type=int,
+                        help="downloads of the same file streaming at once (default: no limit)")
+    parser.add_argument('--download-queue', type=int,
+                        help="downloads that may wait for a slot before new ones get 503 (default: 32)")
+    parser.add_argument('--rate-limit', type=int, metavar='KBPS',
+                        help="total download bandwidth in KB/s (default: no limit)")
+    parser.add_argument('--client-rate-limit', type=int, metavar='KBPS',
+                        help="download bandwidth per client IP in KB/s (default: no limit)")
+    parser.add_argument('--share-rate-limit', type=int, metavar='KBPS',
+                        help="download bandwidth per shared file in KB/s (default: no limit)")
+    parser.add_argument('--public-metrics', action='store_true',
+                        help="serve /metrics to remote clients too, not only to this machine")
+    args = parser.parse_args(argv)
+    
+    if args.headless:
+        run_headless(args)
+        return
+    
+    if tk is None:
+        parser.error("Tkinter is not available, use --headless")
+    
     root = tk.Tk()
-    app = FileShareApp(root)
+    server = BurnBinServer(**server_options(args))
+    app = FileShareApp(root, server)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,61 @@
+"""AsyncioEngine behaviour that needs a real socket"""
+import contextlib
+import io
+import os
+import socket
+import struct
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class AbortedDownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.TemporaryDirectory()
+        path = os.path.join(self.base.name, 'payload.bin')
+        with open(path, 'wb') as f:
+            f.write(os.urandom(16 * 1024 * 1024))
+        self.server = main.BurnBinServer(base_path=self.base.name, local_port=0, engine='asyncio')
+        self.file_id = self.server.share_path(path)
+        # Slices are paced, so the reset lands between two sendfile calls
+        self.server.bandwidth.configure(rate=2 * 1024 * 1024)
+        self.server.start_local_server()
+    
+    def tearDown(self):
+        self.server.stop()
+        self.base.cleanup()
+    
+    def test_client_reset_mid_body_is_quiet_and_aborts_the_session(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            client = socket.create_connection(('127.0.0.1', self.server.local_port))
+            client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            client.sendall(f'GET /download/{self.file_id} HTTP/1.1\r\nHost: test\r\nRange: bytes=100-\r\n\r\n'.encode())
+            self.assertTrue(client.recv(65536).startswith(b'HTTP/1.1 206'))
+            time.sleep(0.2)
+            # Close with RST rather than FIN
+            client.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            client.close()
+            
+            sessions = self.server.download_sessions.sessions
+            self.assertTrue(wait_for(lambda: any(s['status'] == 'aborted' for s in list(sessions.values()))))
+            time.sleep(0.5)
+        self.assertEqual(stderr.getvalue(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Per-client limits are keyed on an address clients can't choose"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class ClientIPTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.TemporaryDirectory()
+        path = os.path.join(self.base.name, 'payload.bin')
+        with open(path, 'wb') as f:
+            f.write(b'x' * 4096)
+        self.server = main.BurnBinServer(base_path=self.base.name)
+        self.file_id = self.server.share_path(path)
+        self.server.bandwidth.configure(client_rate=1024 * 1024)
+        self.client = self.server.flask_app.test_client()
+    
+    def tearDown(self):
+        self.server.stop()
+        self.base.cleanup()
+    
+    def download(self, remote_addr, headers):
+        response = self.client.get(f'/download/{self.file_id}', headers=headers,
+                                   environ_base={'REMOTE_ADDR': remote_addr})
+        response.get_data()
+        return response
+    
+    def test_spoofed_forwarding_headers_share_the_peer_bucket(self):
+        for index, header in enumerate(('X-Forwarded-For', 'X-Real-IP', 'CF-Connecting-IP')):
+            self.download('203.0.113.5', {header: f'198.51.100.{index}'})
+        self.assertEqual(list(self.server.bandwidth.clients), ['203.0.113.5'])
+    
+    def test_forwarding_headers_from_the_tunnel_are_believed(self):
+        self.download('127.0.0.1', {'CF-Connecting-IP': '198.51.100.7'})
+        self.assertEqual(list(self.server.bandwidth.clients), ['198.51.100.7'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""MetadataStore write-behind queue"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class FailedFlushTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.TemporaryDirectory()
+        self.errors = []
+        self.store = main.MetadataStore(os.path.join(self.base.name, 'metadata.db'), on_error=self.errors.append)
+        self.store.put_share('share', '/tmp/file', 'file', 1, '2024-01-01 00:00:00')
+    
+    def tearDown(self):
+        self.store.close()
+        self.base.cleanup()
+    
+    def session(self, status, bytes_sent):
+        return {'file_id': 'share', 'client_ip': '203.0.113.5', 'start_time': datetime(2024, 1, 1),
+                'end_time': None, 'bytes_sent': bytes_sent, 'status': status}
+    
+    def test_counts_and_sessions_survive_a_failed_write(self):
+        self.store.record_download('share')
+        self.store.record_download('share')
+        self.store.record_session('early', self.session('downloading', 10))
+        self.store.record_session('late', self.session('downloading', 10))
+        
+        write = self.store._write
+        
+        def fail_once(statements):
+            self.store._write = write
+            # Changes made while the write is under way are newer than the batch
+            self.store.record_download('share')
+            self.store.record_session('late', self.session('completed', 20))
+            raise sqlite3.OperationalError("database is locked")
+        
+        self.store._write = fail_once
+        self.store.flush()
+        self.assertEqual(len(self.errors), 1)
+        self.assertEqual(self.store.pending_downloads, {'share': 3})
+        self.store.flush()
+        
+        self.assertEqual(self.store.shares()[0][5], 3)
+        rows = dict(self.store._query("SELECT session_id, status FROM downloads"))
+        self.assertEqual(rows, {'early': 'downloading', 'late': 'completed'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+"""Limits on the disk space resumable uploads can reserve"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class OpenUploadLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.TemporaryDirectory()
+        self.server = main.BurnBinServer(base_path=self.base.name)
+        self.client = self.server.flask_app.test_client()
+    
+    def tearDown(self):
+        self.server.stop()
+        self.base.cleanup()
+    
+    def init(self, index, remote_addr, headers):
+        return self.client.post('/api/upload/init', json={'name': f'part-{index}.bin', 'size': 1024},
+                                headers=headers, environ_base={'REMOTE_ADDR': remote_addr}).status_code
+    
+    def test_spoofed_forwarding_headers_share_the_peer_limit(self):
+        limit = main.ResumableUploads.max_per_client
+        codes = [self.init(index, '203.0.113.5', {'X-Forwarded-For': f'198.51.100.{index}'})
+                 for index in range(limit + 1)]
+        self.assertEqual(codes, [200] * limit + [429])
+    
+    def test_tunnel_clients_have_their_own_limits(self):
+        limit = main.ResumableUploads.max_per_client
+        codes = [self.init(index, '127.0.0.1', {'CF-Connecting-IP': f'198.51.100.{index % 2}'})
+                 for index in range(2 * limit)]
+        self.assertEqual(codes, [200] * (2 * limit))
+        self.assertEqual(self.init(0, '127.0.0.1', {'CF-Connecting-IP': '198.51.100.0'}), 429)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Route behaviour through the Flask test client"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class RouteTest(unittest.TestCase):
+    public_metrics = False
+    
+    def setUp(self):
+        self.base = tempfile.TemporaryDirectory()
+        path = os.path.join(self.base.name, 'payload.bin')
+        with open(path, 'wb') as f:
+            f.write(b'x' * 4096)
+        folder = os.path.join(self.base.name, 'folder')
+        os.mkdir(folder)
+        with open(os.path.join(folder, 'inner.txt'), 'wb') as f:
+            f.write(b'y' * 100)
+        self.server = main.BurnBinServer(base_path=self.base.name, public_metrics=self.public_metrics)
+        self.file_id = self.server.share_path(path)
+        self.folder_id = self.server.share_path(folder)
+        self.client = self.server.flask_app.test_client()
+    
+    def tearDown(self):
+        self.server.stop()
+        self.base.cleanup()
+
+
+class StatsAccessTest(RouteTest):
+    def stats(self, remote_addr, headers=None):
+        return self.client.get('/api/stats', headers=headers or {},
+                               environ_base={'REMOTE_ADDR': remote_addr}).status_code
+    
+    def test_stats_are_local_only(self):
+        self.assertEqual(self.stats('127.0.0.1'), 200)
+        self.assertEqual(self.stats('127.0.0.1', {'CF-Connecting-IP': '198.51.100.7'}), 404)
+        self.assertEqual(self.stats('203.0.113.5'), 404)
+
+
+class PublicStatsTest(RouteTest):
+    public_metrics = True
+    
+    def test_public_metrics_opens_stats(self):
+        response = self.client.get('/api/stats', headers={'CF-Connecting-IP': '198.51.100.7'})
+        self.assertEqual(response.status_code, 200)
+
+
+class HeadDownloadTest(RouteTest):
+    def test_head_leaves_no_session_or_count(self):
+        response = self.client.head(f'/download/{self.file_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Length'], '4096')
+        response = self.client.head(f'/download/{self.folder_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Session-Id', response.headers)
+        self.assertEqual(len(self.server.download_sessions), 0)
+        self.assertEqual(self.server.shared_files[self.file_id]['downloads'], 0)
+        self.assertEqual(self.server.shared_files[self.folder_id]['downloads'], 0)
+    
+    def test_get_still_tracks_the_download(self):
+        response = self.client.get(f'/download/{self.file_id}')
+        self.assertEqual(len(response.get_data()), 4096)
+        session = self.server.download_sessions.get(response.headers['X-Session-Id'])
+        self.assertEqual(session['status'], 'completed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Cloudflare tunnel start-up"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TunnelStartTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.TemporaryDirectory()
+        self.server = main.BurnBinServer(base_path=self.base.name)
+        self.release = threading.Event()
+        self.checks = []
+        
+        def check_cloudflared_installed(force=False):
+            self.checks.append(force)
+            self.release.wait(5)
+            return False
+        
+        self.server.check_cloudflared_installed = check_cloudflared_installed
+        self.server.watch_for_cloudflared = lambda: None
+    
+    def tearDown(self):
+        self.release.set()
+        self.server.stop()
+        self.base.cleanup()
+    
+    def test_second_start_while_checking_is_ignored(self):
+        # The install button and the PATH watcher can both ask at once
+        starters = [threading.Thread(target=self.server.start_cloudflare_tunnel) for _ in range(8)]
+        for starter in starters:
+            starter.start()
+        for starter in starters:
+            starter.join()
+        self.assertEqual(self.server.tunnel_state, 'checking')
+        self.release.set()
+        self.assertTrue(wait_for(lambda: self.server.tunnel_state == 'missing'))
+        self.assertEqual(len(self.checks), 1)
+    
+    def test_start_again_after_missing(self):
+        self.release.set()
+        self.server.start_cloudflare_tunnel()
+        self.assertTrue(wait_for(lambda: self.server.tunnel_state == 'missing'))
+        self.server.start_cloudflare_tunnel()
+        self.assertTrue(wait_for(lambda: len(self.checks) == 2))
+
+
+if __name__ == '__main__':
+    unittest.main()